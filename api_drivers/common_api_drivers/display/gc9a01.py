@@ -1,4 +1,3 @@
-import time
 from micropython import const  # NOQA
 
 import lvgl as lv  # NOQA
@@ -40,6 +39,67 @@ _MADCTL_MV = const(0x20)  # 0=Normal, 1=Row/column exchange
 _MADCTL_MX = const(0x40)  # 0=Left to Right, 1=Right to Left
 _MADCTL_MY = const(0x80)  # 0=Top to Bottom, 1=Bottom to Top
 
+# (cmd, number of params, params, delay ms) records, see
+# DisplayDriver.set_params_sequence
+_INIT_START = (
+    b'\x00\xEF\x00\x00'  # _REG_ENA2
+    b'\x00\xEB\x01\x14\x00'  # 0xEB
+    b'\x00\xFE\x00\x00'  # _REG_ENA1
+    b'\x00\xEF\x00\x00'  # _REG_ENA2
+    b'\x00\xEB\x01\x14\x00'  # 0xEB
+    b'\x00\x84\x01\x40\x00'  # 0x84
+    b'\x00\x85\x01\xFF\x00'  # 0x85
+    b'\x00\x86\x01\xFF\x00'  # 0x86
+    b'\x00\x87\x01\xFF\x00'  # 0x87
+    b'\x00\x88\x01\x0A\x00'  # 0x88
+    b'\x00\x89\x01\x21\x00'  # 0x89
+    b'\x00\x8A\x01\x00\x00'  # 0x8A
+    b'\x00\x8B\x01\x80\x00'  # 0x8B
+    b'\x00\x8C\x01\x01\x00'  # 0x8C
+    b'\x00\x8D\x01\x01\x00'  # 0x8D
+    b'\x00\x8E\x01\xFF\x00'  # 0x8E
+    b'\x00\x8F\x01\xFF\x00'  # 0x8F
+    b'\x00\xB6\x02\x00\x20\x00'  # _DFC
+)
+
+_INIT_END = (
+    b'\x00\x90\x05\x08\x08\x08\x08\x08\x00'  # 0x90
+    b'\x00\xBD\x01\x06\x00'  # 0xBD
+    b'\x00\xBC\x01\x00\x00'  # 0xBC
+    b'\x00\xFF\x03\x60\x01\x04\x00'  # 0xFF
+    b'\x00\xC3\x01\x13\x00'  # 0xC3
+    b'\x00\xC4\x01\x13\x00'  # 0xC4
+    b'\x00\xC9\x01\x22\x00'  # 0xC9
+    b'\x00\xBE\x01\x11\x00'  # 0xBE
+    b'\x00\xE1\x02\x10\x0E\x00'  # 0xE1
+    b'\x00\xDF\x03\x21\x0C\x02\x00'  # 0xDF
+    b'\x00\xF0\x06\x45\x09\x08\x08\x26\x2A\x00'  # _SET_GAMMA1
+    b'\x00\xF1\x06\x43\x70\x72\x36\x37\x6F\x00'  # _SET_GAMMA2
+    b'\x00\xF2\x06\x45\x09\x08\x08\x26\x2A\x00'  # _SET_GAMMA3
+    b'\x00\xF3\x06\x43\x70\x72\x36\x37\x6F\x00'  # _SET_GAMMA4
+    b'\x00\xED\x02\x1B\x0B\x00'  # 0xED
+    b'\x00\xAE\x01\x77\x00'  # 0xAE
+    b'\x00\xCD\x01\x63\x00'  # 0xCD
+    b'\x00\x70\x09\x07\x07\x04\x0E\x0F\x09\x07\x08\x03'  # 0x70
+    b'\x00'
+    b'\x00\xE8\x01\x34\x00'  # _DOCA
+    b'\x00\x62\x0C\x18\x0D\x71\xED\x70\x70\x18\x0F\x71'  # 0x62
+    b'\xEF\x70\x70\x00'
+    b'\x00\x63\x0C\x18\x11\x71\xF1\x70\x70\x18\x13\x71'  # 0x63
+    b'\xF3\x70\x70\x00'
+    b'\x00\x64\x07\x28\x29\xF1\x01\xF1\x00\x07\x00'  # 0x64
+    b'\x00\x66\x0A\x3C\x00\xCD\x67\x45\x45\x10\x00\x00'  # 0x66
+    b'\x00\x00'
+    b'\x00\x67\x0A\x00\x3C\x00\x00\x00\x01\x54\x10\x32'  # 0x67
+    b'\x98\x00'
+    b'\x00\x74\x07\x10\x85\x80\x00\x00\x4E\x00\x00'  # 0x74
+    b'\x00\x98\x02\x3E\x07\x00'  # 0x98
+    b'\x00\x35\x00\x00'  # _TEON
+    b'\x00\x21\x00\x00'  # _INVON
+    b'\x00\x11\x00\x78'  # _SLPOUT, 120ms
+    b'\x00\x29\x00\x14'  # _DISPON, 20ms
+)
+
 
 class GC9A01(display_driver_framework.DisplayDriver):
 
@@ -51,51 +111,10 @@ class GC9A01(display_driver_framework.DisplayDriver):
     )
 
     def init(self):
-        param_buf = bytearray(12)
+        param_buf = bytearray(1)
         param_mv = memoryview(param_buf)
 
-        self.set_params(_REG_ENA2)
-
-        param_buf[0] = 0x14
-        self.set_params(0xEB, param_mv[:1])
-
-        self.set_params(_REG_ENA1)
-        self.set_params(_REG_ENA2)
-
-        param_buf[0] = 0x14
-        self.set_params(0xEB, param_mv[:1])
-
-        param_buf[0] = 0x40
-        self.set_params(0x84, param_mv[:1])
-
-        param_buf[0] = 0xFF
-        self.set_params(0x85, param_mv[:1])
-        self.set_params(0x86, param_mv[:1])
-        self.set_params(0x87, param_mv[:1])
-
-        param_buf[0] = 0x0A
-        self.set_params(0x88, param_mv[:1])
-
-        param_buf[0] = 0x21
-        self.set_params(0x89, param_mv[:1])
-
-        param_buf[0] = 0x00
-        self.set_params(0x8A, param_mv[:1])
-
-        param_buf[0] = 0x80
-        self.set_params(0x8B, param_mv[:1])
-
-        param_buf[0] = 0x01
-        self.set_params(0x8C, param_mv[:1])
-        self.set_params(0x8D, param_mv[:1])
-
-        param_buf[0] = 0xFF
-        self.set_params(0x8E, param_mv[:1])
-        self.set_params(0x8F, param_mv[:1])
-
-        param_buf[0] = 0x00
-        param_buf[1] = 0x20
-        self.set_params(_DFC, param_mv[:2])
+        self.set_params_sequence(_INIT_START)
 
         color_size = lv.color_format_get_size(self._color_space)
         if color_size == 2:  # NOQA
@@ -119,171 +138,6 @@ class GC9A01(display_driver_framework.DisplayDriver):
         )
         self.set_params(_MADCTL, param_mv[:1])
 
-        param_buf[0] = 0x08
-        param_buf[1] = 0x08
-        param_buf[2] = 0x08
-        param_buf[3] = 0x08
-        param_buf[4] = 0x08
-        self.set_params(0x90, param_mv[:5])
-
-        param_buf[0] = 0x06
-        self.set_params(0xBD, param_mv[:1])
-
-        param_buf[0] = 0x00
-        self.set_params(0xBC, param_mv[:1])
-
-        param_buf[0] = 0x60
-        param_buf[1] = 0x01
-        param_buf[2] = 0x04
-        self.set_params(0xFF, param_mv[:3])
-
-        param_buf[0] = 0x13
-        self.set_params(_VREG1ACTL, param_mv[:1])
-        self.set_params(_VREG1BCTL, param_mv[:1])
-
-        param_buf[0] = 0x22
-        self.set_params(_VREG2ACTL, param_mv[:1])
-
-        param_buf[0] = 0x11
-        self.set_params(0xBE, param_mv[:1])
-
-        param_buf[0] = 0x10
-        param_buf[1] = 0x0E
-        self.set_params(0xE1, param_mv[:2])
-
-        param_buf[0] = 0x21
-        param_buf[1] = 0x0c
-        param_buf[2] = 0x02
-        self.set_params(0xDF, param_mv[:3])
-
-        param_buf[0] = 0x45
-        param_buf[1] = 0x09
-        param_buf[2] = 0x08
-        param_buf[3] = 0x08
-        param_buf[4] = 0x26
-        param_buf[5] = 0x2A
-        self.set_params(_SET_GAMMA1, param_mv[:6])
-
-        param_buf[0] = 0x43
-        param_buf[1] = 0x70
-        param_buf[2] = 0x72
-        param_buf[3] = 0x36
-        param_buf[4] = 0x37
-        param_buf[5] = 0x6F
-        self.set_params(_SET_GAMMA2, param_mv[:6])
-
-        param_buf[0] = 0x45
-        param_buf[1] = 0x09
-        param_buf[2] = 0x08
-        param_buf[3] = 0x08
-        param_buf[4] = 0x26
-        param_buf[5] = 0x2A
-        self.set_params(_SET_GAMMA3, param_mv[:6])
-
-        param_buf[0] = 0x43
-        param_buf[1] = 0x70
-        param_buf[2] = 0x72
-        param_buf[3] = 0x36
-        param_buf[4] = 0x37
-        param_buf[5] = 0x6F
-        self.set_params(_SET_GAMMA4, param_mv[:6])
-
-        param_buf[0] = 0x1B
-        param_buf[1] = 0x0B
-        self.set_params(0xED, param_mv[:2])
-
-        param_buf[0] = 0x77
-        self.set_params(0xAE, param_mv[:1])
-
-        param_buf[0] = 0x63
-        self.set_params(0xCD, param_mv[:1])
-
-        param_buf[0] = 0x07
-        param_buf[1] = 0x07
-        param_buf[2] = 0x04
-        param_buf[3] = 0x0E
-        param_buf[4] = 0x0F
-        param_buf[5] = 0x09
-        param_buf[6] = 0x07
-        param_buf[7] = 0x08
-        param_buf[8] = 0x03
-        self.set_params(0x70, param_mv[:9])
-
-        param_buf[0] = 0x34
-        self.set_params(_DOCA, param_mv[:1])
-
-        param_buf[0] = 0x18
-        param_buf[1] = 0x0D
-        param_buf[2] = 0x71
-        param_buf[3] = 0xED
-        param_buf[4] = 0x70
-        param_buf[5] = 0x70
-        param_buf[6] = 0x18
-        param_buf[7] = 0x0F
-        param_buf[8] = 0x71
-        param_buf[9] = 0xEF
-        param_buf[10] = 0x70
-        param_buf[11] = 0x70
-        self.set_params(0x62, param_mv[:12])
-
-        param_buf[1] = 0x11
-        param_buf[3] = 0xF1
-        param_buf[7] = 0x13
-        param_buf[9] = 0xF3
-        self.set_params(0x63, param_mv[:12])
-
-        param_buf[0] = 0x28
-        param_buf[1] = 0x29
-        param_buf[2] = 0xF1
-        param_buf[3] = 0x01
-        param_buf[4] = 0xF1
-        param_buf[5] = 0x00
-        param_buf[6] = 0x07
-        self.set_params(0x64, param_mv[:7])
-
-        param_buf[0] = 0x3C
-        param_buf[1] = 0x00
-        param_buf[2] = 0xCD
-        param_buf[3] = 0x67
-        param_buf[4] = 0x45
-        param_buf[5] = 0x45
-        param_buf[6] = 0x10
-        param_buf[7] = 0x00
-        param_buf[8] = 0x00
-        param_buf[9] = 0x00
-        self.set_params(0x66, param_mv[:10])
-
-        param_buf[0] = 0x00
-        param_buf[1] = 0x3C
-        param_buf[2] = 0x00
-        param_buf[3] = 0x00
-        param_buf[4] = 0x00
-        param_buf[5] = 0x01
-        param_buf[6] = 0x54
-        param_buf[7] = 0x10
-        param_buf[8] = 0x32
-        param_buf[9] = 0x98
-        self.set_params(0x67, param_mv[:10])
-
-        param_buf[0] = 0x10
-        param_buf[1] = 0x85
-        param_buf[2] = 0x80
-        param_buf[3] = 0x00
-        param_buf[4] = 0x00
-        param_buf[5] = 0x4E
-        param_buf[6] = 0x00
-        self.set_params(0x74, param_mv[:7])
-
-        param_buf[0] = 0x3e
-        param_buf[1] = 0x07
-        self.set_params(0x98, param_mv[:2])
-
-        self.set_params(_TEON)
-        self.set_params(_INVON)
-
-        self.set_params(_SLPOUT)
-        time.sleep_ms(120)  # NOQA
-        self.set_params(_DISPON)
-        time.sleep_ms(20)  # NOQA
+        self.set_params_sequence(_INIT_END)
 
         display_driver_framework.DisplayDriver.init(self)
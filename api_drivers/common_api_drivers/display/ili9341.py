@@ -1,4 +1,3 @@
-import time
 from micropython import const  # NOQA
 
 import lvgl as lv  # NOQA
@@ -37,76 +36,75 @@ STATE_PWM = display_driver_framework.STATE_PWM
 BYTE_ORDER_RGB = display_driver_framework.BYTE_ORDER_RGB
 BYTE_ORDER_BGR = display_driver_framework.BYTE_ORDER_BGR
 
+# (cmd, number of params, params, delay ms) records, see
+# DisplayDriver.set_params_sequence
+_INIT_1_START = (
+    b'\x00\xEF\x03\x03\x80\x02\x00'  # 0xEF
+    b'\x00\xCF\x03\x00\xC1\x30\x00'  # _PWRCTRLB
+    b'\x00\xED\x04\x64\x03\x12\x81\x00'  # _PWRONSQCTRL
+    b'\x00\xE8\x03\x85\x00\x78\x00'  # _DRVTIMCTRLA1
+    b'\x00\xCB\x05\x39\x2C\x00\x34\x02\x00'  # _PWRCTRLA
+    b'\x00\xF7\x01\x20\x00'  # _PUMPRATIOCTRL
+    b'\x00\xEA\x02\x00\x00\x00'  # _DRVTIMCTRLB
+    b'\x00\xC0\x01\x23\x00'  # _PWR1
+    b'\x00\xC1\x01\x10\x00'  # _PWR2
+    b'\x00\xC5\x02\x3E\x28\x00'  # _VCOMCTL1
+    b'\x00\xC7\x01\x86\x00'  # _VCOMCTL2
+)
+
+_INIT_1_END = (
+    b'\x00\xB1\x02\x00\x13\x00'  # _FRMCTR1
+    b'\x00\xB6\x03\x08\x82\x27\x00'  # _DFUNCTRL
+    b'\x00\xF2\x01\x00\x00'  # _ENA3GAMMA
+    b'\x00\x26\x01\x01\x00'  # _GAMSET
+    b'\x00\xE0\x0F\x0F\x31\x2B\x0C\x0E\x08\x4E\xF1\x37'  # _PGC
+    b'\x07\x10\x03\x0E\x09\x00\x00'
+    b'\x00\xE1\x0F\x00\x0E\x14\x03\x11\x07\x31\xC1\x48'  # _NGC
+    b'\x08\x0F\x0C\x31\x36\x0F\x00'
+    b'\x00\x11\x00\x78'  # _SLPOUT, 120ms
+    b'\x00\x29\x00\x14'  # _DISPON, 20ms
+)
+
+_INIT_2_START = (
+    b'\x00\xCF\x03\x00\xC1\x30\x00'  # _PWRCTRLB
+    b'\x00\xED\x04\x64\x03\x12\x81\x00'  # _PWRONSQCTRL
+    b'\x00\xE8\x03\x85\x00\x78\x00'  # _DRVTIMCTRLA1
+    b'\x00\xCB\x05\x39\x2C\x00\x34\x02\x00'  # _PWRCTRLA
+    b'\x00\xF7\x01\x20\x00'  # _PUMPRATIOCTRL
+    b'\x00\xEA\x02\x00\x00\x00'  # _DRVTIMCTRLB
+    b'\x00\xC0\x01\x10\x00'  # _PWR1
+    b'\x00\xC1\x01\x00\x00'  # _PWR2
+    b'\x00\xC5\x02\x30\x30\x00'  # _VCOMCTL1
+    b'\x00\xC7\x01\xB7\x00'  # _VCOMCTL2
+)
+
+_INIT_2_END = (
+    b'\x00\xB1\x02\x00\x1A\x00'  # _FRMCTR1
+    b'\x00\xB6\x03\x08\x82\x27\x00'  # _DFUNCTRL
+    b'\x00\xF2\x01\x00\x00'  # _ENA3GAMMA
+    b'\x00\x26\x01\x01\x00'  # _GAMSET
+    b'\x00\xE0\x0F\x0F\x2A\x28\x08\x0E\x08\x54\xA9\x43'  # _PGC
+    b'\x0A\x0F\x00\x00\x00\x00\x00'
+    b'\x00\xE1\x0F\x00\x15\x17\x07\x11\x06\x2B\x56\x3C'  # _NGC
+    b'\x05\x10\x0F\x3F\x3F\x0F\x00'
+    b'\x00\x2B\x04\x00\x00\x01\x3F\x00'  # _RASET
+    b'\x00\x2A\x04\x00\x00\x00\xEF\x00'  # _CASET
+    b'\x00\x11\x00\x78'  # _SLPOUT, 120ms
+    b'\x00\x29\x00\x14'  # _DISPON, 20ms
+)
+
 
 class ILI9341(display_driver_framework.DisplayDriver):
+    _RAMWRC = 0x3C
 
     def init(self, sequence=1):
-        param_buf = bytearray(15)
+        param_buf = bytearray(1)
         param_mv = memoryview(param_buf)
 
         if sequence == 1:
-            param_buf[0] = 0x03
-            param_buf[1] = 0x80
-            param_buf[2] = 0x02
-            self.set_params(0xEF, param_mv[:3])
-
-        param_buf[0] = 0x00
-        param_buf[1] = 0XC1
-        param_buf[2] = 0X30
-        self.set_params(_PWRCTRLB, param_mv[:3])
-
-        param_buf[0] = 0x64
-        param_buf[1] = 0x03
-        param_buf[2] = 0X12
-        param_buf[3] = 0X81
-        self.set_params(_PWRONSQCTRL, param_mv[:4])
-
-        param_buf[0] = 0x85
-        param_buf[1] = 0x00
-        param_buf[2] = 0x78
-        self.set_params(_DRVTIMCTRLA1, param_mv[:3])
-
-        param_buf[0] = 0x39
-        param_buf[1] = 0x2C
-        param_buf[2] = 0x00
-        param_buf[3] = 0x34
-        param_buf[4] = 0x02
-        self.set_params(_PWRCTRLA, param_mv[:5])
-
-        param_buf[0] = 0x20
-        self.set_params(_PUMPRATIOCTRL, param_mv[:1])
-
-        param_buf[0] = 0x00
-        param_buf[1] = 0x00
-        self.set_params(_DRVTIMCTRLB, param_mv[:2])
-
-        if sequence == 1:
-            param_buf[0] = 0x23
+            self.set_params_sequence(_INIT_1_START)
         else:
-            param_buf[0] = 0x10
-        self.set_params(_PWR1, param_mv[:1])
-
-        if sequence == 1:
-            param_buf[0] = 0x10
-        else:
-            param_buf[0] = 0x00
-
-        self.set_params(_PWR2, param_mv[:1])
-
-        if sequence == 1:
-            param_buf[0] = 0x3e
-            param_buf[1] = 0x28
-        else:
-            param_buf[0] = 0x30
-            param_buf[1] = 0x30
-
-        self.set_params(_VCOMCTL1, param_mv[:2])
-
-        if sequence == 1:
-            param_buf[0] = 0x86
-        else:
-            param_buf[0] = 0xB7
-        self.set_params(_VCOMCTL2, param_mv[:1])
+            self.set_params_sequence(_INIT_2_START)
 
         param_buf[0] = (
             self._madctl(
@@ -128,106 +126,9 @@ class ILI9341(display_driver_framework.DisplayDriver):
         param_buf[0] = pixel_format
         self.set_params(_COLMOD, param_mv[:1])
 
-        param_buf[0] = 0x00
-
-        if sequence == 1:
-            param_buf[1] = 0x13  # 0x18 ??
-        else:
-            param_buf[1] = 0x1A
-        self.set_params(_FRMCTR1, param_mv[:2])
-
-        param_buf[0] = 0x08
-        param_buf[1] = 0x82
-        param_buf[2] = 0x27
-        self.set_params(_DFUNCTRL, param_mv[:3])
-
-        param_buf[0] = 0x00
-        self.set_params(_ENA3GAMMA, param_mv[:1])
-
-        param_buf[0] = 0x01
-        self.set_params(_GAMSET, param_mv[:1])
-
-        param_buf[0] = 0x0F
-        param_buf[4] = 0x0E
-        param_buf[5] = 0x08
-        param_buf[14] = 0x00
-
-        if sequence == 1:
-            param_buf[1] = 0x31
-            param_buf[2] = 0x2B
-            param_buf[3] = 0x0C
-            param_buf[6] = 0x4E
-            param_buf[7] = 0xF1
-            param_buf[8] = 0x37
-            param_buf[9] = 0x07
-            param_buf[10] = 0x10
-            param_buf[11] = 0x03
-            param_buf[12] = 0x0E
-            param_buf[13] = 0x09
-        else:
-            param_buf[1] = 0x2A
-            param_buf[2] = 0x28
-            param_buf[3] = 0x08
-            param_buf[6] = 0x54
-            param_buf[7] = 0xA9
-            param_buf[8] = 0x43
-            param_buf[9] = 0x0A
-            param_buf[10] = 0x0F
-            param_buf[11] = 0x00
-            param_buf[12] = 0x00
-            param_buf[13] = 0x00
-
-        self.set_params(_PGC, param_mv[:15])
-
-        param_buf[0] = 0x00
-        param_buf[4] = 0x11
-        param_buf[14] = 0x0F
-
         if sequence == 1:
-            param_buf[1] = 0x0E
-            param_buf[2] = 0x14
-            param_buf[3] = 0x03
-            param_buf[5] = 0x07
-            param_buf[6] = 0x31
-            param_buf[7] = 0xC1
-            param_buf[8] = 0x48
-            param_buf[9] = 0x08
-            param_buf[10] = 0x0F
-            param_buf[11] = 0x0C
-            param_buf[12] = 0x31
-            param_buf[13] = 0x36
+            self.set_params_sequence(_INIT_1_END)
         else:
-            param_buf[1] = 0x15
-            param_buf[2] = 0x17
-            param_buf[3] = 0x07
-            param_buf[5] = 0x06
-            param_buf[6] = 0x2B
-            param_buf[7] = 0x56
-            param_buf[8] = 0x3C
-            param_buf[9] = 0x05
-            param_buf[10] = 0x10
-            param_buf[11] = 0x0F
-            param_buf[12] = 0x3F
-            param_buf[13] = 0x3F
-
-        self.set_params(_NGC, param_mv[:15])
-
-        if sequence != 1:
-            param_buf[0] = 0x00
-            param_buf[1] = 0x00
-            param_buf[2] = 0x01
-            param_buf[3] = 0x3f
-            self.set_params(_RASET, param_mv[:4])
-
-            param_buf[0] = 0x00
-            param_buf[1] = 0x00
-            param_buf[2] = 0x00
-            param_buf[3] = 0xef
-            self.set_params(_CASET, param_mv[:4])
-
-        self.set_params(_SLPOUT)
-        time.sleep_ms(120)  # NOQA
-        self.set_params(_DISPON)
-        time.sleep_ms(20)  # NOQA
+            self.set_params_sequence(_INIT_2_END)
 
         display_driver_framework.DisplayDriver.init(self)
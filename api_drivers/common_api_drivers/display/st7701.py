@@ -130,6 +130,53 @@ _CABCCTRL = const(0xEE00)
 _NVMEN = const(0xC800)
 _NVMSET = const(0xCA00)
 
+# (cmd, number of params, params, delay ms) records, see
+# DisplayDriver.set_params_sequence
+_INIT_SEQUENCE = (
+    b'\x00\xFF\x05\x77\x01\x00\x00\x13\x00'  # _CND2BKxSEL
+    b'\x00\xEF\x01\x08\x00'  # 0xEF
+    b'\x00\xFF\x05\x77\x01\x00\x00\x10\x00'  # _CND2BKxSEL
+    b'\xC0\x00\x02\x3B\x00\x00'  # _LNESET
+    b'\xC1\x00\x02\x10\x02\x00'  # _PORCTRL
+    b'\xC2\x00\x02\x20\x06\x00'  # _INVSET
+    b'\xCC\x00\x01\x10\x00'  # _PROMACT
+    b'\xB0\x00\x10\x00\x13\x5A\x0F\x12\x07\x09\x08\x08'  # _PVGAMCTRL
+    b'\x24\x07\x13\x12\x6B\x73\xFF\x00'
+    b'\xB1\x00\x10\x00\x13\x5A\x0F\x12\x07\x09\x08\x08'  # _NVGAMCTRL
+    b'\x24\x07\x13\x12\x6B\x73\xFF\x00'
+    b'\x00\xFF\x05\x77\x01\x00\x00\x11\x00'  # _CND2BKxSEL
+    b'\xB0\x00\x01\x8D\x00'  # _PVGAMCTRL
+    b'\xB1\x00\x01\x48\x00'  # _NVGAMCTRL
+    b'\xB2\x00\x01\x89\x00'  # _VGHSS
+    b'\xB3\x00\x01\x80\x00'  # _TESTCMD
+    b'\xB5\x00\x01\x49\x00'  # _VGLS
+    b'\xB7\x00\x01\x85\x00'  # _PWCTRL1
+    b'\xB8\x00\x01\x32\x00'  # _DGMEN
+    b'\xC1\x00\x01\x78\x00'  # _PORCTRL
+    b'\xC2\x00\x01\x78\x00'  # _INVSET
+    b'\xD0\x00\x01\x88\x64'  # _MIPISET1, 100ms
+    b'\xE0\x00\x03\x00\x00\x02\x00'  # _SRCTRL
+    b'\xE1\x00\x0B\x05\xC0\x07\xC0\x04\xC0\x06\xC0\x00'  # _NRCTRL
+    b'\x44\x44\x00'
+    b'\xE2\x00\x0D\x00\x00\x33\x33\x01\xC0\x00\x00\x01'  # _SECTRL
+    b'\xC0\x00\x00\x00\x00'
+    b'\xE3\x00\x04\x00\x00\x11\x11\x00'  # _CCCTRL
+    b'\xE4\x00\x02\x44\x44\x00'  # _SKCTRL
+    b'\x00\xE5\x10\x0D\xF1\x10\x98\x0F\xF3\x10\x98\x09'  # 0xE5
+    b'\xED\x10\x98\x0B\xEF\x10\x98\x00'
+    b'\x00\xE6\x04\x00\x00\x11\x11\x00'  # 0xE6
+    b'\x00\xE7\x02\x44\x44\x00'  # 0xE7
+    b'\x00\xE8\x10\x0C\xF0\x10\x98\x0E\xF2\x10\x98\x08'  # 0xE8
+    b'\xEC\x10\x98\x0A\xEE\x10\x98\x00'
+    b'\x00\xEB\x07\x00\x01\xE4\xE4\x44\x88\x00\x00'  # 0xEB
+    b'\x00\xED\x10\xFF\x04\x56\x7F\xBA\x2F\xFF\xFF\xFF'  # 0xED
+    b'\xFF\xF2\xAB\xF7\x65\x40\xFF\x00'
+    b'\x00\xEF\x06\x10\x0D\x04\x08\x3F\x1F\x00'  # 0xEF
+    b'\x00\xFF\x05\x77\x01\x00\x00\x00\x00'  # _CND2BKxSEL
+    b'\x00\x11\x00\x78'  # _SLPOUT, 120ms
+    b'\x00\x29\x00\x00'  # _DISPON
+)
+
 
 class ST7701(display_driver_framework.DisplayDriver):
     _INVON = 0x21
@@ -194,6 +241,9 @@ class ST7701(display_driver_framework.DisplayDriver):
     def set_params(self, cmd, params=None):
         self._spi_3wire.tx_param(cmd, params)
 
+    def set_params_sequence(self, sequence):
+        self._spi_3wire.tx_param_sequence(sequence)
+
     def get_params(self, cmd, params):
         pass
 
@@ -204,7 +254,7 @@ class ST7701(display_driver_framework.DisplayDriver):
         display_driver_framework.DisplayDriver.init(self)
 
     def init(self):
-        param_buf = bytearray(16)
+        param_buf = bytearray(1)
         param_mv = memoryview(param_buf)
 
         color_size = lv.color_format_get_size(self._color_space)
@@ -231,130 +281,4 @@ class ST7701(display_driver_framework.DisplayDriver):
         )
         self.set_params(_MADCTL, param_mv[:1])
 
-        # Command2_BK3
-        param_buf[:5] = bytearray([0x77, 0x01, 0x00, 0x00, 0x13])
-        self.set_params(_CND2BKxSEL, param_mv[:5])
-
-        param_buf[0] = 0x08
-        self.set_params(0xEF, param_mv[:1])
-
-        # Command2_BK0
-        param_buf[:5] = bytearray([0x77, 0x01, 0x00, 0x00, 0x10])
-        self.set_params(_CND2BKxSEL, param_mv[:5])
-
-        param_buf[0] = 0x3B
-        param_buf[1] = 0x00
-        self.set_params(_LNESET, param_mv[:2])
-
-        param_buf[0] = 0x10
-        param_buf[1] = 0x02
-        self.set_params(_PORCTRL, param_mv[:2])
-
-        param_buf[0] = 0x20
-        param_buf[1] = 0x06
-        self.set_params(_INVSET, param_mv[:2])
-
-        param_buf[0] = 0x10
-        self.set_params(_PROMACT, param_mv[:1])
-
-        param_buf[:16] = bytearray([
-            0x00, 0x13, 0x5A, 0x0F, 0x12, 0x07, 0x09, 0x08,
-            0x08, 0x24, 0x07, 0x13, 0x12, 0x6B, 0x73, 0xFF])
-        self.set_params(_PVGAMCTRL, param_mv)
-
-        param_buf[:16] = bytearray([
-            0x00, 0x13, 0x5A, 0x0F, 0x12, 0x07, 0x09, 0x08,
-            0x08, 0x24, 0x07, 0x13, 0x12, 0x6B, 0x73, 0xFF])
-        self.set_params(_NVGAMCTRL, param_mv)
-
-        # Command2_BK1
-        param_buf[:5] = bytearray([0x77, 0x01, 0x00, 0x00, 0x11])
-        self.set_params(_CND2BKxSEL, param_mv[:5])
-
-        param_buf[0] = 0x8D
-        self.set_params(_VRHS, param_mv[:1])
-
-        param_buf[0] = 0x48
-        self.set_params(_VCOMS, param_mv[:1])
-
-        param_buf[0] = 0x89
-        self.set_params(_VGHSS, param_mv[:1])
-
-        param_buf[0] = 0x80
-        self.set_params(_TESTCMD, param_mv[:1])
-
-        param_buf[0] = 0x49
-        self.set_params(_VGLS, param_mv[:1])
-
-        param_buf[0] = 0x85
-        self.set_params(_PWCTRL1, param_mv[:1])
-
-        param_buf[0] = 0x32
-        self.set_params(_PWCTRL2, param_mv[:1])
-
-        param_buf[0] = 0x78
-        self.set_params(_PDR1, param_mv[:1])
-
-        param_buf[0] = 0x78
-        self.set_params(_PDR2, param_mv[:1])
-
-        param_buf[0] = 0x88
-        self.set_params(_MIPISET1, param_mv[:1])
-        time.sleep_ms(100)  # NOQA
-
-        param_buf[:3] = bytearray([0x00, 0x00, 0x02])
-        self.set_params(_SRCTRL, param_mv[:3])
-
-        param_buf[:11] = bytearray([
-            0x05, 0xC0, 0x07, 0xC0, 0x04, 0xC0,
-            0x06, 0xC0, 0x00, 0x44, 0x44])
-        self.set_params(_NRCTRL, param_mv[:11])
-
-        param_buf[:13] = bytearray([
-            0x00, 0x00, 0x33, 0x33, 0x01, 0xC0, 0x00,
-            0x00, 0x01, 0xC0, 0x00, 0x00, 0x00])
-        self.set_params(_SECTRL, param_mv[:13])
-
-        param_buf[:4] = bytearray([0x00, 0x00, 0x11, 0x11])
-        self.set_params(_CCCTRL, param_mv[:4])
-
-        param_buf[0] = 0x44
-        param_buf[1] = 0x44
-        self.set_params(_SKCTRL, param_mv[:2])
-
-        param_buf[:16] = bytearray([
-            0x0D, 0xF1, 0x10, 0x98, 0x0F, 0xF3, 0x10, 0x98,
-            0x09, 0xED, 0x10, 0x98, 0x0B, 0xEF, 0x10, 0x98])
-        self.set_params(0xE5, param_mv)
-
-        param_buf[:4] = bytearray([0x00, 0x00, 0x11, 0x11])
-        self.set_params(0xE6, param_mv[:4])
-
-        param_buf[0] = 0x44
-        param_buf[1] = 0x44
-        self.set_params(0xE7, param_mv[:2])
-
-        param_buf[:16] = bytearray([
-            0x0C, 0xF0, 0x10, 0x98, 0x0E, 0xF2, 0x10, 0x98,
-            0x08, 0xEC, 0x10, 0x98, 0x0A, 0xEE, 0x10, 0x98])
-        self.set_params(0xE8, param_mv)
-
-        param_buf[:7] = bytearray([0x00, 0x01, 0xE4, 0xE4, 0x44, 0x88, 0x00])
-        self.set_params(0xEB, param_mv[:7])
-
-        param_buf[:16] = bytearray([
-            0xFF, 0x04, 0x56, 0x7F, 0xBA, 0x2F, 0xFF, 0xFF,
-            0xFF, 0xFF, 0xF2, 0xAB, 0xF7, 0x65, 0x40, 0xFF])
-        self.set_params(0xED, param_mv)
-
-        param_buf[:6] = bytearray([0x10, 0x0D, 0x04, 0x08, 0x3F, 0x1F])
-        self.set_params(0xEF, param_mv[:6])
-
-        # Command2 OFF
-        param_buf[:5] = bytearray([0x77, 0x01, 0x00, 0x00, 0x00])
-        self.set_params(_CND2BKxSEL, param_mv[:5])
-
-        self.set_params(_SLPOUT)
-        time.sleep_ms(120)  # NOQA
-
-        self.set_params(_DISPON)
+        self.set_params_sequence(_INIT_SEQUENCE)
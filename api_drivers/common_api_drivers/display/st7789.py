@@ -42,12 +42,39 @@ _MADCTL_MV = const(0x20)  # 0=Normal, 1=Row/column exchange
 _MADCTL_MX = const(0x40)  # 0=Left to Right, 1=Right to Left
 _MADCTL_MY = const(0x80)  # 0=Top to Bottom, 1=Bottom to Top
 
-
-
-
+# (cmd, number of params, params, delay ms) records, see
+# DisplayDriver.set_params_sequence
+_INIT_START = (
+    b'\x00\x01\x00\x78'  # _SWRESET, 120ms
+    b'\x00\x11\x00\x78'  # _SLPOUT, 120ms
+    b'\x00\x13\x00\x00'  # _NORON
+)
+
+_INIT_MIDDLE = (
+    b'\x00\xB2\x05\x0C\x0C\x00\x33\x33\x00'  # _PORCTRL
+    b'\x00\xB7\x01\x35\x00'  # _GCTRL
+    b'\x00\xBB\x01\x28\x00'  # _VCOMS
+    b'\x00\xC0\x01\x0C\x00'  # _LCMCTRL
+    b'\x00\xC2\x01\x01\x00'  # _VDVVRHEN
+    b'\x00\xC3\x01\x13\x00'  # _VRHS
+    b'\x00\xC4\x01\x20\x00'  # _VDVSET
+    b'\x00\xC6\x01\x0F\x00'  # _FRCTR2
+    b'\x00\xD0\x02\xA4\xA1\x00'  # _PWCTRL1
+    b'\x00\xE0\x0E\xD0\x00\x02\x07\x0A\x28\x32\x44\x42'  # _PGC
+    b'\x06\x0E\x12\x14\x17\x00'
+    b'\x00\xE1\x0E\xD0\x00\x02\x07\x0A\x28\x31\x54\x47'  # _NGC
+    b'\x0E\x1C\x17\x1B\x1E\x00'
+    b'\x00\x21\x00\x00'  # _INVON
+)
+
+_INIT_END = (
+    b'\x00\x29\x00\x78'  # _DISPON, 120ms
+    b'\x00\x11\x00\x78'  # _SLPOUT, 120ms
+)
 
 
 class ST7789(display_driver_framework.DisplayDriver):
+    _RAMWRC = 0x3C
     _ORIENTATION_TABLE = (
         0x0,
         _MADCTL_MV | _MADCTL_MY,
@@ -56,18 +83,10 @@ class ST7789(display_driver_framework.DisplayDriver):
     )
 
     def init(self):
-        param_buf = bytearray(14)
+        param_buf = bytearray(4)
         param_mv = memoryview(param_buf)
 
-        self.set_params(_SWRESET)
-
-        time.sleep_ms(120)  # NOQA
-
-        self.set_params(_SLPOUT)
-
-        time.sleep_ms(120)  # NOQA
-
-        self.set_params(_NORON)
+        self.set_params_sequence(_INIT_START)
 
         param_buf[0] = (
             self._madctl(
@@ -101,71 +120,7 @@ class ST7789(display_driver_framework.DisplayDriver):
 
         time.sleep_ms(10)  # NOQA
 
-        param_buf[0] = 0x0C
-        param_buf[1] = 0x0C
-        param_buf[2] = 0x00
-        param_buf[3] = 0x33
-        param_buf[4] = 0x33
-        self.set_params(_PORCTRL, param_mv[:5])
-
-        param_buf[0] = 0x35
-        self.set_params(_GCTRL, param_mv[:1])
-
-        param_buf[0] = 0x28
-        self.set_params(_VCOMS, param_mv[:1])
-
-        param_buf[0] = 0x0C
-        self.set_params(_LCMCTRL, param_mv[:1])
-
-        param_buf[0] = 0x01
-        self.set_params(_VDVVRHEN, param_mv[:1])
-
-        param_buf[0] = 0x13
-        self.set_params(_VRHS, param_mv[:1])
-
-        param_buf[0] = 0x20
-        self.set_params(_VDVSET, param_mv[:1])
-
-        param_buf[0] = 0x0F
-        self.set_params(_FRCTR2, param_mv[:1])
-
-        param_buf[0] = 0xA4
-        param_buf[1] = 0xA1
-        self.set_params(_PWCTRL1, param_mv[:2])
-
-        param_buf[0] = 0xD0
-        param_buf[1] = 0x00
-        param_buf[2] = 0x02
-        param_buf[3] = 0x07
-        param_buf[4] = 0x0A
-        param_buf[5] = 0x28
-        param_buf[6] = 0x32
-        param_buf[7] = 0x44
-        param_buf[8] = 0x42
-        param_buf[9] = 0x06
-        param_buf[10] = 0x0E
-        param_buf[11] = 0x12
-        param_buf[12] = 0x14
-        param_buf[13] = 0x17
-        self.set_params(_PGC, param_mv[:14])
-
-        param_buf[0] = 0xD0
-        param_buf[1] = 0x00
-        param_buf[2] = 0x02
-        param_buf[3] = 0x07
-        param_buf[4] = 0x0A
-        param_buf[5] = 0x28
-        param_buf[6] = 0x31
-        param_buf[7] = 0x54
-        param_buf[8] = 0x47
-        param_buf[9] = 0x0E
-        param_buf[10] = 0x1C
-        param_buf[11] = 0x17
-        param_buf[12] = 0x1B
-        param_buf[13] = 0x1E
-        self.set_params(_NGC, param_mv[:14])
-
-        self.set_params(_INVON)
+        self.set_params_sequence(_INIT_MIDDLE)
 
         param_buf[0] = 0x00
         param_buf[1] = 0x00
@@ -182,10 +137,6 @@ class ST7789(display_driver_framework.DisplayDriver):
 
         self.set_params(_RASET, param_mv[:4])
 
-        self.set_params(_DISPON)
-        time.sleep_ms(120)  # NOQA
-
-        self.set_params(_SLPOUT)
-        time.sleep_ms(120)  # NOQA
+        self.set_params_sequence(_INIT_END)
 
         display_driver_framework.DisplayDriver.init(self)
@@ -1,5 +1,4 @@
 
-import time
 from micropython import const  # NOQA
 
 import lvgl as lv  # NOQA
@@ -45,7 +44,35 @@ _ORIENTATION_TABLE = (
     _MADCTL_MY | _MADCTL_MX | _MADCTL_MV
 )
 
+# (cmd, number of params, params, delay ms) records, see
+# DisplayDriver.set_params_sequence
+_INIT_START = (
+    b'\x00\x01\x00\x78'  # _SWRESET, 120ms
+    b'\x00\x11\x00\x78'  # _SLPOUT, 120ms
+    b'\x00\xF0\x01\xC3\x00'  # _CSCON
+    b'\x00\xF0\x01\x96\x00'  # _CSCON
+)
+
+_INIT_END = (
+    b'\x00\xB7\x01\xC6\x00'  # _EM
+    b'\x00\xB4\x01\x01\x00'  # _DIC
+    b'\x00\xB6\x03\x80\x02\x3B\x00'  # _DFC
+    b'\x00\xE8\x08\x40\x8A\x00\x00\x29\x19\xA5\x33\x00'  # _DOCA
+    b'\x00\xC1\x01\x06\x00'  # _PWR2
+    b'\x00\xC2\x01\xA7\x00'  # _PWR3
+    b'\x00\xC5\x01\x18\x78'  # _VCMPCTL, 120ms
+    b'\x00\xE0\x0E\xF0\x09\x0B\x06\x04\x15\x2F\x54\x42'  # _PGC
+    b'\x3C\x17\x14\x18\x1B\x00'
+    b'\x00\xE1\x0E\xF0\x09\x0B\x06\x04\x03\x2D\x43\x42'  # _NGC, 120ms
+    b'\x3B\x16\x14\x17\x1B\x78'
+    b'\x00\xF0\x01\x3C\x00'  # _CSCON
+    b'\x00\xF0\x01\x69\x78'  # _CSCON, 120ms
+    b'\x00\x29\x00\x78'  # _DISPON, 120ms
+)
+
+
 class ST7796(display_driver_framework.DisplayDriver):
+    _RAMWRC = 0x3C
     # The st7795 display controller has an internal framebuffer
     # arranged in 320 x 480
     # configuration. Physical displays with pixel sizes less than
@@ -75,22 +102,10 @@ class ST7796(display_driver_framework.DisplayDriver):
     )
 
     def init(self):
-        param_buf = bytearray(14)
+        param_buf = bytearray(1)
         param_mv = memoryview(param_buf)
 
-        self.set_params(_SWRESET)
-
-        time.sleep_ms(120)
-
-        self.set_params(_SLPOUT)
-
-        time.sleep_ms(120)
-
-        param_buf[0] = 0xC3
-        self.set_params(_CSCON, param_mv[:1])
-
-        param_buf[0] = 0x96
-        self.set_params(_CSCON, param_mv[:1])
+        self.set_params_sequence(_INIT_START)
 
         param_buf[0] = (
             self._madctl(
@@ -114,57 +129,6 @@ class ST7796(display_driver_framework.DisplayDriver):
         param_buf[0] = pixel_format
         self.set_params(_COLMOD, param_mv[:1])
 
-        param_buf[0] = 0xC6
-        self.set_params(_EM, param_mv[:1])
-
-        param_buf[0] = 0x01
-        self.set_params(_DIC, param_mv[:1])
-
-        param_buf[0] = 0x80
-        param_buf[1] = 0x02
-        param_buf[2] = 0x3B
-        self.set_params(_DFC, param_mv[:3])
-
-        param_buf[:8] = bytearray([
-            0x40, 0x8A, 0x00, 0x00, 0x29, 0x19, 0xA5, 0x33
-        ])
-        self._data_bus.tx_param(_DOCA, param_mv[:8])
-
-        param_buf[0] = 0x06
-        self.set_params(_PWR2, param_mv[:1])
-
-        param_buf[0] = 0xA7
-        self.set_params(_PWR3, param_mv[:1])
-
-        param_buf[0] = 0x18
-        self.set_params(_VCMPCTL, param_mv[:1])
-
-        time.sleep_ms(120)
-
-        param_buf[:14] = bytearray([
-            0xF0, 0x09, 0x0b, 0x06, 0x04, 0x15, 0x2F,
-            0x54, 0x42, 0x3C, 0x17, 0x14, 0x18, 0x1B
-        ])
-        self.set_params(_PGC, param_mv[:14])
-
-        param_buf[:14] = bytearray([
-            0xF0, 0x09, 0x0B, 0x06, 0x04, 0x03, 0x2D,
-            0x43, 0x42, 0x3B, 0x16, 0x14, 0x17, 0x1B
-        ])
-        self.set_params(_NGC, param_mv[:14])
-
-        time.sleep_ms(120)
-
-        param_buf[0] = 0x3C
-        self.set_params(_CSCON, param_mv[:1])
-
-        param_buf[0] = 0x69
-        self.set_params(_CSCON, param_mv[:1])
-
-        time.sleep_ms(120)
-
-        self.set_params(_DISPON)
-
-        time.sleep_ms(120)
+        self.set_params_sequence(_INIT_END)
 
         display_driver_framework.DisplayDriver.init(self)
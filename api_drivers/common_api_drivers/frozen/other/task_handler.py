@@ -1,5 +1,8 @@
 import lvgl as lv  # NOQA
+import lv_mem  # NOQA
 import micropython  # NOQA
+import array
+import gc
 import sys
 import time
 
@@ -7,9 +10,13 @@ try:
     from machine import Timer  # NOQA
 except:
     try:
-        from lv_timer import Timer  # NOQA
+        # native timers of the unix port on Linux
+        from timerfd import Timer  # NOQA
     except:
-        raise RuntimeError("Missing machine.Timer implementation!")
+        try:
+            from lv_timer import Timer  # NOQA
+        except:
+            raise RuntimeError("Missing machine.Timer implementation!")
 
 
 TASK_HANDLER_STARTED = 0x00
@@ -25,6 +32,87 @@ class _DefaultUserData(object):
     pass
 
 
+class _ProfileBuffer(object):
+    # fixed size ring buffer, nothing gets allocated when a value is added
+
+    def __init__(self, size):
+        self._buf = array.array('i', [0] * size)
+        self._size = size
+        self._index = 0
+        self._count = 0
+
+    def add(self, value):
+        self._buf[self._index] = value
+        self._index += 1
+        if self._index == self._size:
+            self._index = 0
+
+        if self._count < self._size:
+            self._count += 1
+
+    def clear(self):
+        self._index = 0
+        self._count = 0
+
+    def stats(self):
+        count = self._count
+        if not count:
+            return dict(min=0, avg=0, p95=0, max=0, count=0)
+
+        values = sorted(self._buf[:count])
+        # nearest rank
+        p95 = values[(count * 95 + 99) // 100 - 1]
+
+        return dict(
+            min=values[0],
+            avg=sum(values) // count,
+            p95=p95,
+            max=values[-1],
+            count=count
+        )
+
+
+class _Profile(object):
+
+    def __init__(self, size):
+        self.callbacks = _ProfileBuffer(size)
+        self.task_handler = _ProfileBuffer(size)
+        self.tick_drift = _ProfileBuffer(size)
+        self.latency = _ProfileBuffer(size)
+        self.reset()
+
+    def reset(self):
+        self.callbacks.clear()
+        self.task_handler.clear()
+        self.tick_drift.clear()
+        self.latency.clear()
+        self.frames = 0
+        self.overruns = 0
+        self.dropped = 0
+        self.tick_start = lv.tick_get()
+        self.ms_start = time.ticks_ms()
+
+
+class _GCPolicy(object):
+
+    def __init__(self, headroom, threshold, min_idle, policy, size):
+        self.headroom = headroom
+        self.threshold = threshold
+        self.min_idle = min_idle
+        self.policy = policy
+        self.collect_time = _ProfileBuffer(size)
+        # how long the last collection took in ms, a collection is only
+        # run when the idle gap is at least this long
+        self.estimate = 0
+        self.reset()
+
+    def reset(self):
+        self.collect_time.clear()
+        self.collections = 0
+        self.in_frame = 0
+        self.deferred = 0
+
+
 def _default_exception_hook(e):
     sys.print_exception(e)
     TaskHandler._current_instance.deinit()  # NOQA
@@ -65,6 +153,10 @@ class TaskHandler(object):
                 callback=self._timer_cb
             )
             self._scheduled = 0
+            self._profile = None
+            self._adaptive = None
+            self._last_tick = 0
+            self._gc_policy = None
 
     def add_event_cb(self, callback, event, user_data=_DefaultUserData):
         for i, (cb, evt, data) in enumerate(self._callbacks):
@@ -97,15 +189,201 @@ class TaskHandler(object):
     def enable(self):
         self._scheduled -= self.max_scheduled
 
+        # the timer is not armed again while disabled
+        if self._adaptive is not None:
+            self._arm(self._adaptive[0])
+
     @classmethod
     def is_running(cls):
         return cls._current_instance is not None
 
-    def _task_handler(self, _):
+    def enable_adaptive(self, min_period=None, max_period=500):
+        # Instead of firing every `duration` ms the timer is armed for the
+        # time until the next LVGL timer is due, clamped to min_period and
+        # max_period. min_period defaults to `duration`. An idle UI only
+        # wakes up every max_period ms, so changes made to the UI from
+        # outside of LVGL should be followed by a call to wake().
+        if min_period is None:
+            min_period = self.duration
+
+        min_period = max(1, min_period)
+        self._adaptive = (min_period, max(min_period, max_period))
+        self._last_tick = time.ticks_ms()
+        self._arm(min_period)
+
+    def disable_adaptive(self):
+        if self._adaptive is None:
+            return
+
+        self._adaptive = None
+        self._timer.init(
+            mode=Timer.PERIODIC,
+            period=self.duration,
+            callback=self._timer_cb
+        )
+
+    @classmethod
+    def wake(cls):
+        # runs the task handler now instead of when the timer is due. This
+        # is safe to call from an interrupt handler. It does nothing unless
+        # adaptive scheduling is enabled.
+        self = cls._current_instance
+        if self is not None and self._adaptive is not None:
+            self._timer_cb(None)
+
+    def _arm(self, period):
+        self._timer.init(
+            mode=Timer.ONE_SHOT,
+            period=period,
+            callback=self._timer_cb
+        )
+
+    def _tick_inc(self, ms):
+        lv.tick_inc(ms)
+        # in adaptive mode the next timer fire only adds the time that has
+        # not been accounted for here
+        self._last_tick = time.ticks_add(self._last_tick, ms)
+
+    def enable_profiling(self, size=64):
+        # statistics are kept for the last `size` frames
+        self._profile = _Profile(size)
+
+    def disable_profiling(self):
+        self._profile = None
+
+    def reset_profile(self):
+        if self._profile is not None:
+            self._profile.reset()
+
+    def get_profile(self):
+        # callbacks, task_handler and latency are in microseconds,
+        # tick_drift (lvgl tick - wall clock) is in milliseconds.
+        # overruns are timer fires skipped because max_scheduled runs were
+        # pending, dropped are fires micropython.schedule refused.
+        profile = self._profile
+        if profile is None:
+            return None
+
+        return dict(
+            callbacks=profile.callbacks.stats(),
+            task_handler=profile.task_handler.stats(),
+            tick_drift=profile.tick_drift.stats(),
+            latency=profile.latency.stats(),
+            frames=profile.frames,
+            overruns=profile.overruns,
+            dropped=profile.dropped
+        )
+
+    def enable_gc_policy(
+        self,
+        headroom=None,
+        min_idle=5,
+        policy=None,
+        size=64
+    ):
+        # Runs gc.collect() in the idle time after a frame so collections
+        # do not happen in the middle of rendering or an event callback.
+        # A collection is run when less than `headroom` bytes of the heap
+        # are free (defaults to a quarter of the heap) or when the
+        # allocations since the last collection get close to gc.threshold(),
+        # and only if the time until the next frame is at least `min_idle`
+        # ms and at least as long as the last collection took.
+        #
+        # `policy` replaces that decision, it is called after every frame as
+        # policy(free, allocated, idle) with the free heap in bytes, the
+        # bytes allocated since the last collection (None if unknown) and
+        # the idle time in ms, and returns True to collect.
+        if headroom is None:
+            headroom = (gc.mem_free() + gc.mem_alloc()) // 4
+
+        # ports built without MICROPY_GC_ALLOC_THRESHOLD have no
+        # gc.threshold(), only the headroom is used on those
+        threshold = gc.threshold() if hasattr(gc, 'threshold') else 0
+        if threshold > 0:
+            # collect before the automatic collection would kick in
+            threshold = threshold * 3 // 4
+
+        self._gc_policy = _GCPolicy(
+            headroom, threshold, min_idle, policy, size)
+
+    def disable_gc_policy(self):
+        self._gc_policy = None
+
+    def get_gc_stats(self):
+        # collect_time is in microseconds. in_frame are frames a collection
+        # ran in, deferred are collections put off because the idle time
+        # was too short.
+        gc_policy = self._gc_policy
+        if gc_policy is None:
+            return None
+
+        return dict(
+            collect_time=gc_policy.collect_time.stats(),
+            collections=gc_policy.collections,
+            in_frame=gc_policy.in_frame,
+            deferred=gc_policy.deferred,
+            free=gc.mem_free()
+        )
+
+    def reset_gc_stats(self):
+        if self._gc_policy is not None:
+            self._gc_policy.reset()
+
+    def _collect_idle(self, gc_policy, idle):
+        free = gc.mem_free()
+        allocated = lv_mem.gc_allocated()
+
+        if gc_policy.policy is not None:
+            collect = gc_policy.policy(free, allocated, idle)
+        else:
+            collect = free < gc_policy.headroom or (
+                gc_policy.threshold > 0 and
+                allocated is not None and
+                allocated >= gc_policy.threshold
+            )
+
+            if collect and idle < max(gc_policy.min_idle, gc_policy.estimate):
+                gc_policy.deferred += 1
+                collect = False
+
+        if collect:
+            start = time.ticks_us()
+            gc.collect()
+            collect_time = time.ticks_diff(time.ticks_us(), start)
+
+            gc_policy.collect_time.add(collect_time)
+            gc_policy.estimate = (collect_time + 999) // 1000
+            gc_policy.collections += 1
+
+    def _task_handler(self, fire_time):
+        profile = self._profile
+        gc_policy = self._gc_policy
+        # time until the next LVGL timer is due
+        next_due = 0
+        # a frame ran, the idle time after it can be used to collect
+        frame_start = None
         try:
             self._scheduled -= 1
 
             if lv._nesting.value == 0:
+                if gc_policy is not None:
+                    frame_start = time.ticks_ms()
+                    # a collection resets the count, a lower count at the
+                    # end of the frame means one ran during it
+                    allocated = lv_mem.gc_allocated()
+                if profile is not None:
+                    us_start = time.ticks_us()
+                    # 0 when the timer was armed before profiling started,
+                    # there is no fire time to measure from
+                    if fire_time != 0:
+                        profile.latency.add(
+                            time.ticks_diff(us_start, fire_time)
+                        )
+                    profile.tick_drift.add(
+                        ((lv.tick_get() - profile.tick_start) & 0xFFFFFFFF) -
+                        time.ticks_diff(time.ticks_ms(), profile.ms_start)
+                    )
+
                 start_time = time.ticks_ms()
 
                 run_update = True
@@ -129,12 +407,21 @@ class TaskHandler(object):
                 stop_time = time.ticks_ms()
 
                 ticks_diff = time.ticks_diff(stop_time, start_time)
-                lv.tick_inc(ticks_diff)
+                self._tick_inc(ticks_diff)
+
+                if profile is not None:
+                    us_stop = time.ticks_us()
+                    callback_time = time.ticks_diff(us_stop, us_start)
 
                 if run_update:
-                    lv.task_handler()
+                    next_due = lv.task_handler()
                     start_time = time.ticks_ms()
 
+                    if profile is not None:
+                        us_start = time.ticks_us()
+                        profile.task_handler.add(
+                            time.ticks_diff(us_start, us_stop))
+
                     for cb, evt, data in self._callbacks:
                         if not evt ^ TASK_HANDLER_FINISHED:
                             continue
@@ -152,17 +439,70 @@ class TaskHandler(object):
 
                     stop_time = time.ticks_ms()
                     ticks_diff = time.ticks_diff(stop_time, start_time)
-                    lv.tick_inc(ticks_diff)
+                    self._tick_inc(ticks_diff)
+
+                    if profile is not None:
+                        callback_time += time.ticks_diff(
+                            time.ticks_us(), us_start)
+
+                if profile is not None:
+                    profile.callbacks.add(callback_time)
+                    profile.frames += 1
+
+                if gc_policy is not None and allocated is not None:
+                    end_allocated = lv_mem.gc_allocated()
+                    if end_allocated < allocated:
+                        gc_policy.in_frame += 1
 
         except Exception as e:
             if self.exception_hook:
                 self.exception_hook(e)
 
+        # a pending run arms the timer when it finishes
+        adaptive = self._adaptive
+        idle = 0
+        if adaptive is not None and self._scheduled <= 0:
+            idle = min(max(next_due, adaptive[0]), adaptive[1])
+            self._arm(idle)
+        elif frame_start is not None:
+            # the periodic timer fires `duration` ms after the last fire
+            idle = self.duration - time.ticks_diff(
+                time.ticks_ms(), frame_start)
+
+        # nothing is idle while another run is pending
+        if frame_start is not None and self._scheduled <= 0:
+            try:
+                self._collect_idle(gc_policy, idle)
+            except Exception as e:
+                if self.exception_hook:
+                    self.exception_hook(e)
+
     def _timer_cb(self, _):
-        lv.tick_inc(self.duration)
+        if self._adaptive is None:
+            lv.tick_inc(self.duration)
+        else:
+            # the period changes from one fire to the next so the tick
+            # follows the clock
+            now = time.ticks_ms()
+            lv.tick_inc(time.ticks_diff(now, self._last_tick))
+            self._last_tick = now
+
+        profile = self._profile
         if self._scheduled < self.max_scheduled:
             try:
-                micropython.schedule(self._task_handler_ref, 0)
+                # the time the timer fired is passed to the task handler
+                # so the scheduling latency can be measured
+                micropython.schedule(
+                    self._task_handler_ref,
+                    0 if profile is None else time.ticks_us()
+                )
                 self._scheduled += 1
             except:  # NOQA
-                pass
+                if profile is not None:
+                    profile.dropped += 1
+
+                # nothing got scheduled that would arm the timer again
+                if self._adaptive is not None:
+                    self._arm(self._adaptive[0])
+        elif profile is not None:
+            profile.overruns += 1
@@ -170,7 +170,8 @@ class CST816S(pointer_framework.PointerDriver):
         reset_pin=None,
         touch_cal=None,
         startup_rotation=pointer_framework.lv.DISPLAY_ROTATION._0,
-        debug=False
+        debug=False,
+        interrupt_pin=None
     ):
         self._tx_buf = bytearray(2)
         self._tx_mv = memoryview(self._tx_buf)
@@ -207,6 +208,9 @@ class CST816S(pointer_framework.PointerDriver):
             touch_cal=touch_cal, startup_rotation=startup_rotation, debug=debug
         )
 
+        if interrupt_pin is not None:
+            self._set_interrupt(interrupt_pin)
+
     @property
     def wake_up_threshold(self):
         self._read_reg(_LpScanTH)
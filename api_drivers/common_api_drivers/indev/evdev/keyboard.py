@@ -1,11 +1,82 @@
+# LVGL indev driver for evdev keyboards
+# (for the unix micropython port)
 
-
-import struct
-import select
+from micropython import const  # NOQA
+import evdev
 import keypad_framework
 import lvgl as lv  # NOQA
 
 
+_KEY_LEFTSHIFT = const(42)
+_KEY_RIGHTSHIFT = const(54)
+
+# linux input keycodes to characters
+_CHARS = {}
+
+for _start, _chars in (
+    (2, '1234567890-='),
+    (16, 'qwertyuiop[]'),
+    (30, "asdfghjkl;'`"),
+    (43, '\\zxcvbnm,./'),
+    (57, ' ')
+):
+    for _i, _char in enumerate(_chars):
+        _CHARS[_start + _i] = ord(_char)
+
+# linux input keycodes to LVGL control keys
+_CONTROL = {
+    1: lv.KEY.ESC,
+    14: lv.KEY.BACKSPACE,
+    15: lv.KEY.NEXT,
+    28: lv.KEY.ENTER,
+    96: lv.KEY.ENTER,  # keypad enter
+    102: lv.KEY.HOME,
+    103: lv.KEY.UP,
+    105: lv.KEY.LEFT,
+    106: lv.KEY.RIGHT,
+    107: lv.KEY.END,
+    108: lv.KEY.DOWN,
+    111: lv.KEY.DEL,
+}
+
 
 class EvdevKeyboardDriver(keypad_framework.KeypadDriver):
-    pass
+
+    def __init__(self, device='/dev/input/event0', grab=False):
+        # key presses are queued in C so none are lost between two reads
+        self._device = evdev.Device(device, grab=grab)
+        self._shift = False
+        super().__init__()
+
+    def _get_key(self):
+        device = self._device
+        device.read()
+
+        while True:
+            event = device.get_key()
+            if event is None:
+                return None
+
+            code, value = event
+
+            if code in (_KEY_LEFTSHIFT, _KEY_RIGHTSHIFT):
+                self._shift = bool(value)
+                continue
+
+            if code in _CONTROL:
+                key = _CONTROL[code]
+            elif code in _CHARS:
+                key = _CHARS[code]
+                if self._shift and 97 <= key <= 122:  # a-z
+                    key -= 32
+            else:
+                continue
+
+            if value:
+                return lv.INDEV_STATE.PRESSED, key
+
+            return lv.INDEV_STATE.RELEASED, key
+
+    def delete(self):
+        self._device.close()
+        self._indev_drv.enable(False)
@@ -1,10 +1,35 @@
+# LVGL indev driver for the wheel of an evdev mouse
+# (for the unix micropython port)
 
-import struct
-import select
+import evdev
 import encoder_framework
 import lvgl as lv  # NOQA
 
 
 class EvdevMouseWheelDriver(encoder_framework.EncoderDriver):
-    pass
 
+    def __init__(self, device='/dev/input/event0'):
+        # every open of an event device gets its own copy of the events so
+        # this can share the device with an EvdevMouseDriver
+        self._device = evdev.Device(device)
+        super().__init__()
+
+    def _get_enc(self):
+        device = self._device
+        device.read()
+
+        _, wheel = device.take_wheel()
+
+        if device.buttons & evdev.Device.BUTTON_MIDDLE:
+            key = lv.KEY.ENTER
+        else:
+            key = None
+
+        if not wheel and key is None:
+            return None
+
+        return -wheel, key
+
+    def delete(self):
+        self._device.close()
+        self._indev_drv.enable(False)
@@ -45,7 +45,8 @@ class FocalTechTouch(pointer_framework.PointerDriver):
         startup_rotation,  # NOQA
         debug,
         factors,
-        *chip_ids
+        *chip_ids,
+        interrupt_pin=None
     ):  # NOQA
         self._tx_buf = bytearray(5)
         self._tx_mv = memoryview(self._tx_buf)
@@ -88,6 +89,9 @@ class FocalTechTouch(pointer_framework.PointerDriver):
             touch_cal=touch_cal, startup_rotation=startup_rotation, debug=debug
         )
 
+        if interrupt_pin is not None:
+            self._set_interrupt(interrupt_pin)
+
     def _get_coords(self):
         self._tx_buf[0] = _TD_STAT_REG
         try:
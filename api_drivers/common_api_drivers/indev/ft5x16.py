@@ -18,7 +18,8 @@ class FT5x16(focaltech_touch.FocalTechTouch):
         device,
         touch_cal=None,
         startup_rotation=pointer_framework.lv.DISPLAY_ROTATION._0,  # NOQA
-        debug=False
+        debug=False,
+        interrupt_pin=None
     ):  # NOQA
 
         super().__init__(
@@ -27,5 +28,6 @@ class FT5x16(focaltech_touch.FocalTechTouch):
             startup_rotation,
             debug,
             (2.24, 2.14),
-            _FT5x16_CHIPID
+            _FT5x16_CHIPID,
+            interrupt_pin=interrupt_pin
         )
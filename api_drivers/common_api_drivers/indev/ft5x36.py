@@ -21,7 +21,8 @@ class FT5x36(focaltech_touch.FocalTechTouch):
         device,
         touch_cal=None,
         startup_rotation=pointer_framework.lv.DISPLAY_ROTATION._0,  # NOQA
-        debug=False
+        debug=False,
+        interrupt_pin=None
     ):  # NOQA
 
         super().__init__(
@@ -32,5 +33,6 @@ class FT5x36(focaltech_touch.FocalTechTouch):
             (2.24, 2.14),
             _FT5x36_CHIPID_1,
             _FT5x36_CHIPID_2,
-            _FT5x36_CHIPID_3
+            _FT5x36_CHIPID_3,
+            interrupt_pin=interrupt_pin
         )
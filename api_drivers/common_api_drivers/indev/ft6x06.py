@@ -17,7 +17,8 @@ class FT6x06(focaltech_touch.FocalTechTouch):
         device,
         touch_cal=None,
         startup_rotation=pointer_framework.lv.DISPLAY_ROTATION._0,  # NOQA
-        debug=False
+        debug=False,
+        interrupt_pin=None
     ):  # NOQA
 
         super().__init__(
@@ -26,5 +27,6 @@ class FT6x06(focaltech_touch.FocalTechTouch):
             startup_rotation,
             debug,
             None,
-            _FT6206_CHIPID
+            _FT6206_CHIPID,
+            interrupt_pin=interrupt_pin
         )
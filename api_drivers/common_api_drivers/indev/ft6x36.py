@@ -19,7 +19,8 @@ class FT6x36(focaltech_touch.FocalTechTouch):
         device,
         touch_cal=None,
         startup_rotation=pointer_framework.lv.DISPLAY_ROTATION._0,  # NOQA
-        debug=False
+        debug=False,
+        interrupt_pin=None
     ):  # NOQA
 
         super().__init__(
@@ -29,5 +30,6 @@ class FT6x36(focaltech_touch.FocalTechTouch):
             debug,
             None,
             _FT6x36_CHIPID_1,
-            _FT6x36_CHIPID_2
+            _FT6x36_CHIPID_2,
+            interrupt_pin=interrupt_pin
         )
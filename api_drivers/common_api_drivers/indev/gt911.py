@@ -53,7 +53,8 @@ class GT911(pointer_framework.PointerDriver):
         interrupt_pin=None,
         touch_cal=None,
         startup_rotation=pointer_framework.lv.DISPLAY_ROTATION._0,  # NOQA
-        debug=False
+        debug=False,
+        use_irq=False
     ):
         self._tx_buf = bytearray(3)
         self._tx_mv = memoryview(self._tx_buf)
@@ -80,6 +81,11 @@ class GT911(pointer_framework.PointerDriver):
             touch_cal=touch_cal, startup_rotation=startup_rotation, debug=debug
         )
 
+        # the interrupt pin is also used to select the I2C address during
+        # the reset, the panel is only read on its interrupt when asked to
+        if use_irq and interrupt_pin is not None:
+            self._set_interrupt(interrupt_pin)
+
     def hw_reset(self):
         if self._interrupt_pin and self._reset_pin:
             self._interrupt_pin.init(self._interrupt_pin.OUT)
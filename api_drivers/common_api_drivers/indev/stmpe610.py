@@ -2,6 +2,7 @@ from micropython import const  # NOQA
 
 import i2c
 import pointer_framework
+import lcd_utils
 import time
 
 
@@ -43,9 +44,15 @@ _FIFO_STA_RESET = const(0x01)
 
 _TSC_I_DRIVE_50MA = const(0x01)
 
+_FILTER_SAMPLES = const(4)
+
 
 class STMPE610(pointer_framework.PointerDriver):
 
+    margin = 50
+    # weight of a new point in the IIR smoothing, 1.0 disables the smoothing
+    smoothing = 1.0
+
     def _read_reg(self, reg, num_bytes):
         self._tx_buf[0] = reg
 
@@ -74,6 +81,14 @@ class STMPE610(pointer_framework.PointerDriver):
         self._rx_buf = bytearray(4)
         self._rx_mv = memoryview(self._rx_buf)
 
+        # the FIFO holds every sample taken since the last poll, only the
+        # newest ones were taken close enough together to be compared
+        self._filter = lcd_utils.TouchFilter(
+            _FILTER_SAMPLES,
+            margin=max(min(self.margin, 100), 1),
+            alpha=self.smoothing
+        )
+
         if isinstance(device, i2c.I2C.Device):
             _TSC_FRACTION_Z_REG = 0x56
             _TSC_I_DRIVE_REG = 0x58
@@ -111,16 +126,38 @@ class STMPE610(pointer_framework.PointerDriver):
         self._read_reg(self._FIFO_SIZE_REG, 1)
         touch_count = self._rx_buf[0]
 
+        touch_filter = self._filter
+
         if not touch_count:
+            # the next press must not be smoothed towards the last one
+            touch_filter.reset()
             return None
 
+        touch_filter.clear()
+        rx_buf = self._rx_buf
+
         while touch_count:
             self._read_reg(0xD7, 4)
             touch_count -= 1
 
-        x = self._rx_buf[0] << 4 | self._rx_buf[1] >> 4
-        y = (self._rx_buf[1] & 0xF) << 8 | self._rx_buf[2]
+            # the older samples are drained without being used, the finger
+            # may have moved a long way since they were taken
+            if touch_count < _FILTER_SAMPLES:
+                touch_filter.add(
+                    rx_buf[0] << 4 | rx_buf[1] >> 4,
+                    (rx_buf[1] & 0xF) << 8 | rx_buf[2]
+                )
 
         self._write_reg(_INT_STA_REG, 0xFF)
 
-        return self.PRESSED, x, y
+        point = touch_filter.get()
+        if point is None:
+            # the samples disagree but the FIFO only fills while the panel
+            # is touched, report the newest one instead of a release
+            return (
+                self.PRESSED,
+                rx_buf[0] << 4 | rx_buf[1] >> 4,
+                (rx_buf[1] & 0xF) << 8 | rx_buf[2]
+            )
+
+        return self.PRESSED, point[0], point[1]
@@ -2,6 +2,7 @@ from micropython import const  # NOQA
 import micropython  # NOQA
 import machine  # NOQA
 import pointer_framework
+import lcd_utils
 import time
 
 
@@ -18,6 +19,8 @@ class XPT2046(pointer_framework.PointerDriver):
     touch_threshold = 400
     confidence = 5
     margin = 50
+    # weight of a new point in the IIR smoothing, 1.0 disables the smoothing
+    smoothing = 1.0
 
     def _read_reg(self, reg, num_bytes):
         self._tx_buf[0] = reg
@@ -49,10 +52,12 @@ class XPT2046(pointer_framework.PointerDriver):
         self._rx_mv = memoryview(self._rx_buf)
 
         self.__confidence = max(min(self.confidence, 25), 3)
-        self.__points = [[0, 0] for _ in range(self.__confidence)]
 
-        margin = max(min(self.margin, 100), 1)
-        self.__margin = margin * margin
+        self.__filter = lcd_utils.TouchFilter(
+            self.__confidence,
+            margin=max(min(self.margin, 100), 1),
+            alpha=self.smoothing
+        )
 
         super().__init__(
             touch_cal=touch_cal, startup_rotation=startup_rotation, debug=debug
@@ -63,10 +68,14 @@ class XPT2046(pointer_framework.PointerDriver):
         z2 = self._read_reg(_CMD_Z2_READ, 3)
         z = z1 + ((_MAX_RAW_COORD + 6) - z2)
 
+        touch_filter = self.__filter
+
         if z < self.touch_threshold:
+            # the next press must not be smoothed towards the last one
+            touch_filter.reset()
             return None
 
-        points = self.__points
+        touch_filter.clear()
         count = 0
         timeout = 5000
         start_time = time.ticks_us()  # NOQA
@@ -76,26 +85,20 @@ class XPT2046(pointer_framework.PointerDriver):
 
             sample = self._get_raw()  # get a touch
             if sample is not None:
-                points[count][0], points[count][1] = sample  # put in buff
-                count += 1
+                count = touch_filter.add(*sample)  # put in buff
 
             end_time = time.ticks_us()  # NOQA
             timeout -= time.ticks_diff(end_time, start_time)  # NOQA
             start_time = end_time
 
-        if count:
-            meanx = sum([points[i][0] for i in range(count)]) // count
-            meany = sum([points[i][1] for i in range(count)]) // count
-            dev = sum([
-                (points[i][0] - meanx) ** 2 + (points[i][1] - meany) ** 2
-                for i in range(count)
-            ]) / count
-
-            if dev <= self.__margin:
-                x, y = self._normalize(meanx, meany)
-                if self._debug:
-                    print(f'{self.__class__.__name__}_TP_DATA(x={meanx}, y={meany}, z={z})')  # NOQA
-                return self.PRESSED, x, y
+        # median of the samples with the ones outside of the margin dropped
+        point = touch_filter.get()
+
+        if point is not None:
+            x, y = self._normalize(*point)
+            if self._debug:
+                print(f'{self.__class__.__name__}_TP_DATA(x={point[0]}, y={point[1]}, z={z})')  # NOQA
+            return self.PRESSED, x, y
 
         return None
 
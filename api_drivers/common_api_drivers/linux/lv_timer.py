@@ -137,16 +137,22 @@ class Timer:
     def __init__(self, id):
         self.id = id
         self._valid = False
+        self.tid = None
 
     def init(self, mode=PERIODIC, period=-1, callback=None):
-        self.tid = timer_create(self.id)
+        # calling init again re-arms the same POSIX timer. TaskHandler does
+        # that after every run when it follows LVGL's timer deadlines, so
+        # the timer and the signal handler are only created once.
+        if self.tid is None:
+            self.tid = timer_create(self.id)
+            self.handler_ref = self.handler
+            # print("Sig %d: %s" % (SIGRTMIN + self.id, self.org_sig))
+            self.action = sigaction(SIGRTMIN + self.id, self.handler_ref)
+
         self.mode = mode
         self.period = period
         self.cb = callback
         timer_settime(self.tid, self.period, self.mode == Timer.PERIODIC)
-        self.handler_ref = self.handler
-        # print("Sig %d: %s" % (SIGRTMIN + self.id, self.org_sig))
-        self.action = sigaction(SIGRTMIN + self.id, self.handler_ref)
         self._valid = True
 
     def deinit(self):
@@ -1,16 +1,36 @@
 import lvgl as lv  # NOQA
 import _indev_base
+import micropython  # NOQA
+import machine  # NOQA
+import task_handler
+import lcd_utils
+from array import array
 
 
 def _remap(value, old_min, old_max, new_min, new_max):
     return int((((value - old_min) * (new_max - new_min)) / (old_max - old_min)) + new_min)
 
 
+def _axis(old_min, old_max, new_max):
+    # the scale and offset of _remap(value, old_min, old_max, 0, new_max)
+    scale = new_max / (old_max - old_min)
+    return scale, -old_min * scale
+
+
+def _to_fixed(matrix):
+    return array('i', [int(round(v * 65536)) for v in matrix])
+
+
 class PointerDriver(_indev_base.IndevBase):
 
     def __init__(self, touch_cal=None):  # NOQA
         self._last_x = -1
         self._last_y = -1
+
+        self._irq_pin = None
+        self._data_ready = False
+        self._polling = True
+
         super().__init__()
 
         if touch_cal is None:
@@ -19,12 +39,84 @@ class PointerDriver(_indev_base.IndevBase):
             touch_cal = TouchCalData(f'{self.__class__.__name__}_{self.id}')
 
         self._config = touch_cal
+        self._matrix = None
+        self._matrix_rotation = None
 
         self._set_type(lv.INDEV_TYPE_POINTER)
 
+    def _set_interrupt(self, pin, trigger=None):
+        # Puts the driver into interrupt mode. The indev read timer is
+        # paused while the panel is idle and the touch controller pulling
+        # the interrupt pin is what triggers a read. Once a press is seen
+        # the read timer is resumed so the press keeps getting polled
+        # until it is released.
+        if isinstance(pin, int):
+            pin = machine.Pin(pin, machine.Pin.IN)
+        else:
+            pin.init(pin.IN)
+
+        if trigger is None:
+            trigger = pin.IRQ_FALLING
+
+        # bound methods allocate, so keep a reference for the irq handler
+        self._irq_read_ref = self._irq_read
+        self._irq_pin = pin
+
+        pin.irq(handler=self._irq_handler, trigger=trigger)
+        self._pause_polling()
+
+    def _irq_handler(self, _):
+        if self._polling or self._data_ready:
+            return
+
+        self._data_ready = True
+        try:
+            micropython.schedule(self._irq_read_ref, None)
+        except RuntimeError:
+            # the schedule queue is full, the next edge will retry.
+            self._data_ready = False
+
+    def _irq_read(self, _):
+        if lv._nesting.value:
+            # scheduled while LVGL is running a Python callback, reading
+            # now would re-enter LVGL. The read timer picks the touch up
+            # and pauses itself again once it is released.
+            self._resume_polling()
+            return
+
+        lv.indev_read(self._indev_drv)
+        # the touch may have changed the UI, don't wait for the task handler
+        # timer when it is following LVGL's timer deadlines
+        task_handler.TaskHandler.wake()
+
+    def _pause_polling(self):
+        self._polling = False
+        lv.timer_pause(lv.indev_get_read_timer(self._indev_drv))
+
+    def _resume_polling(self):
+        self._polling = True
+        lv.timer_resume(lv.indev_get_read_timer(self._indev_drv))
+
+    def _update_polling(self):
+        if self._irq_pin is None:
+            return
+
+        self._data_ready = False
+
+        if self._current_state == self.PRESSED:
+            if not self._polling:
+                self._resume_polling()
+        elif self._polling:
+            self._pause_polling()
+
     def calibrate(self):
         import touch_calibrate
 
+        self._invalidate_transform()
+
+        if self._irq_pin is not None and not self._polling:
+            self._resume_polling()
+
         self._py_disp_drv.set_default()
         touch_calibrate.run()
 
@@ -37,6 +129,58 @@ class PointerDriver(_indev_base.IndevBase):
 
         return None not in (left, top, right, bottom)
 
+    def _invalidate_transform(self):
+        # must be called after the calibration data has been changed so the
+        # next read rebuilds the transform
+        self._matrix = None
+
+    def _update_transform(self, rotation):
+        # Calibration and rotation are both linear so they collapse into a
+        # single affine transform. It only gets rebuilt when the rotation or
+        # the calibration changes and every read is then a single call into
+        # lcd_utils.transform.
+        config = self._config
+        left = config.left
+        right = config.right
+        top = config.top
+        bottom = config.bottom
+
+        if left is None:
+            left = 0
+        if right is None:
+            right = self._width
+        if top is None:
+            top = 0
+        if bottom is None:
+            bottom = self._height
+
+        width = self._width
+        height = self._height
+
+        # matrix layout is (a, b, c, d, e, f) where
+        # x' = a * x + b * y + c and y' = d * x + e * y + f
+        if rotation == lv.DISPLAY_ROTATION._0:  # NOQA
+            sx, ox = _axis(left, right, width)
+            sy, oy = _axis(top, bottom, height)
+            matrix = (sx, 0, ox, 0, sy, oy)
+        elif rotation == lv.DISPLAY_ROTATION._90:  # NOQA
+            sx, ox = _axis(top, bottom, width)
+            sy, oy = _axis(right, left, height)
+            matrix = (0, sx, ox, sy, 0, oy)
+        elif rotation == lv.DISPLAY_ROTATION._270:  # NOQA
+            sx, ox = _axis(right, left, width)
+            sy, oy = _axis(bottom, top, height)
+            matrix = (sx, 0, ox, 0, sy, oy)
+        elif rotation == lv.DISPLAY_ROTATION._180:  # NOQA
+            sx, ox = _axis(bottom, top, width)
+            sy, oy = _axis(left, right, height)
+            matrix = (0, sx, ox, sy, 0, oy)
+        else:
+            raise RuntimeError
+
+        self._matrix = _to_fixed(matrix)
+        self._matrix_rotation = rotation
+
     def _get_coords(self):
         # this method needs to be overridden.
         # the returned value from this method is going to be a tuple
@@ -58,41 +202,17 @@ class PointerDriver(_indev_base.IndevBase):
             data.state = self._current_state
             # print("raw(x={0}, y={1}) point(x={2} y={3})".format(-1, -1, data.point.x, data.point.y))  # NOQA
             data.continue_reading = False
+            self._update_polling()
             return res
 
         state, x, y = coords
 
         if None not in (x, y):
-            config = self._config
-            orientation = self.get_rotation()
-            left = config.left
-            right = config.right
-            top = config.top
-            bottom = config.bottom
-
-            if left is None:
-                left = 0
-            if right is None:
-                right = self._width
-            if top is None:
-                top = 0
-            if bottom is None:
-                bottom = self._height
-
-            if orientation == lv.DISPLAY_ROTATION._0:  # NOQA
-                xpos = _remap(x, left, right, 0, self._width)
-                ypos = _remap(y, top, bottom, 0, self._height)
-            elif orientation == lv.DISPLAY_ROTATION._90:  # NOQA
-                xpos = _remap(y, top, bottom, 0, self._width)
-                ypos = _remap(x, right, left, 0, self._height)
-            elif orientation == lv.DISPLAY_ROTATION._270:  # NOQA
-                xpos = _remap(x, right, left, 0, self._width)
-                ypos = _remap(y, bottom, top, 0, self._height)
-            elif orientation == lv.DISPLAY_ROTATION._180:  # NOQA
-                xpos = _remap(y, bottom, top, 0, self._width)
-                ypos = _remap(x, left, right, 0, self._height)
-            else:
-                raise RuntimeError
+            rotation = self.get_rotation()
+            if self._matrix is None or rotation != self._matrix_rotation:
+                self._update_transform(rotation)
+
+            xpos, ypos = lcd_utils.transform(self._matrix, x, y)
 
             self._last_x = xpos
             self._last_y = ypos
@@ -118,6 +238,7 @@ class PointerDriver(_indev_base.IndevBase):
         data.point.x = self._last_x
         data.point.y = self._last_y
 
+        self._update_polling()
         return res
 
     def get_vect(self, point):
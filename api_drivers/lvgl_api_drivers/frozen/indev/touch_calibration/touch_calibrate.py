@@ -170,6 +170,7 @@ class Tpcal(object):
             self.config.right = right
             self.config.bottom = bottom
             self.config.save()
+            self.touch._invalidate_transform()  # NOQA
 
             self.finished = True
             self.cur_point = 0
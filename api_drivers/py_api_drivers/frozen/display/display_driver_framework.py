@@ -20,6 +20,9 @@ BYTE_ORDER_BGR = const(0x08)
 _RASET = const(0x2B)
 _CASET = const(0x2A)
 _RAMWR = const(0x2C)
+
+# a window command is the command byte and 4 bytes of parameters
+_WINDOW_CMD_SIZE = const(5)
 _MADCTL = const(0x36)
 
 
@@ -36,6 +39,30 @@ STATE_LOW = 0
 STATE_PWM = -1
 
 
+def pack_params_sequence(commands):
+    # Packs (cmd, params, delay_ms) tuples into the format the data bus
+    # sends with tx_param_sequence. Every command becomes a record of
+    # cmd (2 bytes, big endian), number of params, the params and then the
+    # delay in milliseconds that is waited after the command is sent.
+    # params can be None.
+    buf = bytearray()
+
+    for cmd, params, delay_ms in commands:
+        if params is None:
+            params = b''
+
+        if len(params) > 255 or not 0 <= delay_ms <= 255:
+            raise ValueError('params and delay_ms are limited to 255')
+
+        buf.append((cmd >> 8) & 0xFF)
+        buf.append(cmd & 0xFF)
+        buf.append(len(params))
+        buf.extend(params)
+        buf.append(delay_ms)
+
+    return bytes(buf)
+
+
 def _DEBUG_PRINT(cls, *args):
     if lcd_bus.DEBUG_ENABLED:
         args = ' '.join(str(arg) for arg in args)
@@ -45,6 +72,12 @@ def _DEBUG_PRINT(cls, *args):
 class DisplayDriver:
     _INVON = 0x21
     _INVOFF = 0x20
+
+    # write memory continue command of the panel. When it is set an area that
+    # starts on the row after the last flushed area and has the same columns
+    # is sent as a continuation of that transfer without setting the window.
+    # Drivers for panels that support it set this.
+    _RAMWRC = None
     _ORIENTATION_TABLE = (
         _MADCTL_MX,
         _MADCTL_MV,
@@ -119,6 +152,16 @@ class DisplayDriver:
         self._param_buf = bytearray(4)
         self._param_mv = memoryview(self._param_buf)
 
+        # sized view of the buffer LVGL hands to the flush callback. It is
+        # pointed at the new buffer on every flush, which does not allocate
+        self._color_view = lv.C_Buffer()
+
+        # window last programmed by _set_memory_location
+        # [x1, x2, y1, y2, next row], -1 when it is not known
+        self._window = [-1, -1, -1, -1, -1]
+        # commands saved, bytes saved, continued transfers
+        self._window_stats = [0, 0, 0]
+
         self._color_byte_order = color_byte_order
         self._color_space = color_space
 
@@ -127,6 +170,8 @@ class DisplayDriver:
 
         self._initilized = False
         self._backup_set_memory_location = None
+        self._static_memory_location = False
+        self._native_flush = False
 
         self._rotation = lv.DISPLAY_ROTATION._0  # NOQA
         self._invert_colors = False
@@ -241,6 +286,7 @@ class DisplayDriver:
                     '_set_memory_location',
                     self._dummy_set_memory_location
                 )
+                self._static_memory_location = True
             else:
                 full_screen_size = (
                     display_width *
@@ -287,7 +333,8 @@ class DisplayDriver:
             self._param_buf[0] = (
                 self._madctl(self._color_byte_order, self._ORIENTATION_TABLE, ~rotation)  # NOQA
             )
-            self._data_bus.tx_param(_MADCTL, self._param_mv[:1])
+            # the resolution changed, set_params drops the cached window
+            self.set_params(_MADCTL, self._param_mv[:1])
 
     @staticmethod
     def get_displays():
@@ -314,6 +361,7 @@ class DisplayDriver:
 
     def set_offset(self, x, y):
         self._offset_x, self._offset_y = x, y
+        self._register_native_flush()
 
     def get_offset_x(self):
         rotation = self.get_rotation()
@@ -475,12 +523,69 @@ class DisplayDriver:
                 '_set_memory_location',
                 self._dummy_set_memory_location
             )
+            self._static_memory_location = True
 
         self._initilized = True
+        self._register_native_flush()
+
+    def set_native_flush(self, value):
+        # When enabled the data bus installs a flush function written in C on
+        # the display. That function sets the memory location, sends the
+        # buffer and tells LVGL the flush is finished without calling into
+        # Python. If a driver overrides _set_memory_location that method is
+        # still called from C for every flush so the driver keeps working.
+        if self._data_bus is None:
+            return
+
+        self._native_flush = bool(value)
+
+        if self._native_flush:
+            self._register_native_flush()
+        else:
+            self._data_bus.register_native_flush(None)
+            self._disp_drv.set_flush_cb(self._flush_cb)
+
+    def get_native_flush(self):
+        return self._native_flush
+
+    def _register_native_flush(self):
+        if not self._native_flush:
+            return
+
+        if self._static_memory_location:
+            set_window = False
+            set_memory_location = None
+        elif (
+            type(self)._set_memory_location is  # NOQA
+            DisplayDriver._set_memory_location
+        ):
+            set_window = True
+            set_memory_location = None
+        else:
+            set_window = False
+            set_memory_location = self._set_memory_location
+
+        self._data_bus.register_native_flush(
+            self._disp_drv,
+            self._offset_x,
+            self._offset_y,
+            set_window,
+            set_memory_location,
+            write_continue=self._RAMWRC or 0
+        )
 
     def set_params(self, cmd, params=None):
+        self._invalidate_window()
         self._data_bus.tx_param(cmd, params)
 
+    def set_params_sequence(self, sequence):
+        # sends a whole packed init sequence (see pack_params_sequence) in
+        # a single call, the data bus walks the records and does the delays
+        # in C. Drivers keep their sequences as bytes constants so they
+        # stay in flash when the driver is frozen.
+        self._invalidate_window()
+        self._data_bus.tx_param_sequence(sequence)
+
     def get_params(self, cmd, params):
         self._data_bus.rx_param(cmd, params)
 
@@ -513,6 +618,8 @@ class DisplayDriver:
         if self._reset_pin is None:
             return
 
+        self._invalidate_window()
+
         self._reset_pin.value(self._reset_state)
         time.sleep_ms(120)  # NOQA
         self._reset_pin.value(not self._reset_state)
@@ -546,24 +653,98 @@ class DisplayDriver:
     def _dummy_set_memory_location(self, *_, **__):  # NOQA
         return _RAMWR
 
+    def _invalidate_window(self):
+        # any command sent to the panel can change the window so the next
+        # flush has to set it again
+        window = self._window
+        window[0] = -1
+        window[2] = -1
+        window[4] = -1
+
+    def get_window_stats(self):
+        # how many window commands, and the bytes they would have used, were
+        # not sent because the window didn't change and how many flushes were
+        # sent as a continuation of the flush before them
+        cmds_saved, bytes_saved, continued = self._window_stats
+
+        if self._native_flush and self._data_bus is not None:
+            native = self._data_bus.get_window_stats()
+            if native is not None:
+                cmds_saved += native[0]
+                bytes_saved += native[1]
+                continued += native[2]
+
+        return dict(
+            commands_saved=cmds_saved,
+            bytes_saved=bytes_saved,
+            continued=continued
+        )
+
+    def reset_window_stats(self):
+        stats = self._window_stats
+        stats[0] = 0
+        stats[1] = 0
+        stats[2] = 0
+
+        if self._native_flush and self._data_bus is not None:
+            self._data_bus.reset_window_stats()
+
     def _set_memory_location(self, x1, y1, x2, y2):
-        # Column addresses
+        window = self._window
+        stats = self._window_stats
+        same_columns = window[0] == x1 and window[1] == x2
+
+        if (
+            same_columns and self._RAMWRC is not None and
+            y1 == window[4] and y2 <= window[3]
+        ):
+            window[4] = y2 + 1
+            stats[0] += 2
+            stats[1] += _WINDOW_CMD_SIZE * 2
+            stats[2] += 1
+            return self._RAMWRC
+
+        if self._RAMWRC is None:
+            row_end = y2
+        else:
+            # the rows stay open to the bottom of the display so the areas
+            # rendered below this one can continue the transfer
+            row_end = max(
+                y2,
+                self.get_vertical_resolution() - 1 + self._offset_y
+            )
+
         param_buf = self._param_buf  # NOQA
 
-        param_buf[0] = (x1 >> 8) & 0xFF
-        param_buf[1] = x1 & 0xFF
-        param_buf[2] = (x2 >> 8) & 0xFF
-        param_buf[3] = x2 & 0xFF
+        if same_columns:
+            stats[0] += 1
+            stats[1] += _WINDOW_CMD_SIZE
+        else:
+            # Column addresses
+            param_buf[0] = (x1 >> 8) & 0xFF
+            param_buf[1] = x1 & 0xFF
+            param_buf[2] = (x2 >> 8) & 0xFF
+            param_buf[3] = x2 & 0xFF
+
+            self._data_bus.tx_param(_CASET, self._param_mv)
 
-        self._data_bus.tx_param(_CASET, self._param_mv)
+        if window[2] == y1 and window[3] == row_end:
+            stats[0] += 1
+            stats[1] += _WINDOW_CMD_SIZE
+        else:
+            # Page addresses
+            param_buf[0] = (y1 >> 8) & 0xFF
+            param_buf[1] = y1 & 0xFF
+            param_buf[2] = (row_end >> 8) & 0xFF
+            param_buf[3] = row_end & 0xFF
 
-        # Page addresses
-        param_buf[0] = (y1 >> 8) & 0xFF
-        param_buf[1] = y1 & 0xFF
-        param_buf[2] = (y2 >> 8) & 0xFF
-        param_buf[3] = y2 & 0xFF
+            self._data_bus.tx_param(_RASET, self._param_mv)
 
-        self._data_bus.tx_param(_RASET, self._param_mv)
+        window[0] = x1
+        window[1] = x2
+        window[2] = y1
+        window[3] = row_end
+        window[4] = y2 + 1
 
         return _RAMWR
 
@@ -585,11 +766,11 @@ class DisplayDriver:
 
         cmd = self._set_memory_location(x1, y1, x2, y2)
 
-        # we have to use the __dereference__ method because this method is
-        # what converts from the C_Array object the binding passes into a
-        # memoryview object that can be passed to the bus drivers
-        data_view = color_p.__dereference__(size)
-        self._data_bus.tx_color(cmd, data_view, x1, y1, x2, y2)
+        # the C_Array object the binding passes has no size so it can't be
+        # given to the bus drivers as is. Retargeting the C_Buffer gives
+        # them a buffer without creating a memoryview on every flush
+        self._color_view.__cast_instance__(color_p, size)
+        self._data_bus.tx_color(cmd, self._color_view, x1, y1, x2, y2)
 
     # we always register this callback no matter what. This is what tells LVGL
     # that the buffer is able to be written to. If this callback doesn't get
@@ -1,6 +1,10 @@
 import lvgl as lv  # NOQA
 import _indev_base
 import micropython  # NOQA
+import machine  # NOQA
+import task_handler
+import lcd_utils
+from array import array
 from lcd_utils import remap as _remap  # NOQA
 
 remap = _remap
@@ -13,6 +17,10 @@ class PointerDriver(_indev_base.IndevBase):
         self._last_y = -1
         self._last_state = self.RELEASED
 
+        self._irq_pin = None
+        self._data_ready = False
+        self._polling = True
+
         super().__init__(debug=debug)
 
         if touch_cal is None:
@@ -26,8 +34,62 @@ class PointerDriver(_indev_base.IndevBase):
         self._set_type(lv.INDEV_TYPE.POINTER)  # NOQA
         self._cal_running = None
         self._startup_rotation = startup_rotation
+        self._matrix = None
         self._indev_drv.enable(True)
 
+    def _set_interrupt(self, pin, trigger=None):
+        # Puts the driver into interrupt mode. The indev read timer is
+        # paused while the panel is idle and the touch controller pulling
+        # the interrupt pin is what triggers a read. Once a press is seen
+        # the read timer is resumed so the press keeps getting polled
+        # until it is released.
+        if isinstance(pin, int):
+            pin = machine.Pin(pin, machine.Pin.IN)
+        else:
+            pin.init(pin.IN)
+
+        if trigger is None:
+            trigger = pin.IRQ_FALLING
+
+        # bound methods allocate, so keep a reference for the irq handler
+        self._irq_read_ref = self._irq_read
+        self._irq_pin = pin
+
+        pin.irq(handler=self._irq_handler, trigger=trigger)
+        self._pause_polling()
+
+    def _irq_handler(self, _):
+        if self._polling or self._data_ready:
+            return
+
+        self._data_ready = True
+        try:
+            micropython.schedule(self._irq_read_ref, None)
+        except RuntimeError:
+            # the schedule queue is full, the next edge will retry.
+            self._data_ready = False
+
+    def _irq_read(self, _):
+        if lv._nesting.value:
+            # scheduled while LVGL is running a Python callback, reading
+            # now would re-enter LVGL. The read timer picks the touch up
+            # and pauses itself again once it is released.
+            self._resume_polling()
+            return
+
+        self._indev_drv.read()
+        # the touch may have changed the UI, don't wait for the task handler
+        # timer when it is following LVGL's timer deadlines
+        task_handler.TaskHandler.wake()
+
+    def _pause_polling(self):
+        self._polling = False
+        self._indev_drv.get_read_timer().pause()
+
+    def _resume_polling(self):
+        self._polling = True
+        self._indev_drv.get_read_timer().resume()
+
     def __cal_callback(self, alphaX, betaX, deltaX, alphaY, betaY, deltaY):
         self._cal.alphaX = alphaX
         self._cal.betaX = betaX
@@ -37,6 +99,7 @@ class PointerDriver(_indev_base.IndevBase):
         self._cal.deltaY = deltaY
         self._cal.save()
         self._cal_running = None
+        self._invalidate_transform()
 
     def calibrate(self, update_handler=None):
         if self._cal_running:
@@ -45,6 +108,12 @@ class PointerDriver(_indev_base.IndevBase):
         import time
         import touch_calibrate
         self._cal_running = touch_calibrate.TPCal(self, self.__cal_callback)
+        # the raw coordinates are used while the calibration is running
+        self._invalidate_transform()
+
+        if self._irq_pin is not None and not self._polling:
+            self._resume_polling()
+
         while self._cal_running:
             if update_handler is not None:
                 delay = update_handler()
@@ -76,26 +145,50 @@ class PointerDriver(_indev_base.IndevBase):
         # of (state, x, y) or None if no touch even has occured
         raise NotImplementedError
 
-    def _calc_coords(self, x, y):
+    def _invalidate_transform(self):
+        # must be called after the calibration data has been changed so the
+        # next read rebuilds the transform
+        self._matrix = None
+
+    def _update_transform(self):
+        # Calibration and the startup rotation are both linear so they
+        # collapse into a single affine transform. It only gets rebuilt when
+        # the calibration changes and every read is then a single call into
+        # lcd_utils.transform.
+
+        # matrix layout is (a, b, c, d, e, f) where
+        # x' = a * x + b * y + c and y' = d * x + e * y + f
         if self.is_calibrated:
             cal = self._cal
-            x = int(round(x * cal.alphaX + y * cal.betaX + cal.deltaX))
-            y = int(round(x * cal.alphaY + y * cal.betaY + cal.deltaY))
+            a, b, c = cal.alphaX, cal.betaX, cal.deltaX
+            d, e, f = cal.alphaY, cal.betaY, cal.deltaY
+        else:
+            a, b, c = 1.0, 0.0, 0.0
+            d, e, f = 0.0, 1.0, 0.0
 
         if (
             self._startup_rotation == lv.DISPLAY_ROTATION._180 or  # NOQA
             self._startup_rotation == lv.DISPLAY_ROTATION._270  # NOQA
         ):
-            x = self._orig_width - x - 1
-            y = self._orig_height - y - 1
+            a, b, c = -a, -b, self._orig_width - c - 1
+            d, e, f = -d, -e, self._orig_height - f - 1
 
         if (
             self._startup_rotation == lv.DISPLAY_ROTATION._90 or  # NOQA
             self._startup_rotation == lv.DISPLAY_ROTATION._270  # NOQA
         ):
-            x, y = self._orig_height - y - 1, x
+            a, b, c, d, e, f = -d, -e, self._orig_height - f - 1, a, b, c
 
-        return x, y
+        self._matrix = array(
+            'i',
+            [int(round(v * 65536)) for v in (a, b, c, d, e, f)]
+        )
+
+    def _calc_coords(self, x, y):
+        if self._matrix is None:
+            self._update_transform()
+
+        return lcd_utils.transform(self._matrix, x, y)
 
     def _read(self, drv, data):  # NOQA
         coords = self._get_coords()
@@ -127,6 +220,15 @@ class PointerDriver(_indev_base.IndevBase):
         self._last_state = state
         self._last_x, self._last_y = x, y
 
+        if self._irq_pin is not None:
+            self._data_ready = False
+
+            if state == self.PRESSED:
+                if not self._polling:
+                    self._resume_polling()
+            elif self._polling:
+                self._pause_polling()
+
     def get_vect(self, point):
         self._indev_drv.get_vect(point)
 
@@ -6,88 +6,185 @@ try:
 except ImportError:
     import os
 
+    # Fallback used when esp32.NVS is not available.
+    #
+    # File layout (little endian):
+    #   header: magic (4s), entry count (H)
+    #   index:  per entry key hash (I), offset (I), key length (H),
+    #           data length (H)
+    #   data:   per entry the key followed by the data, at the offset
+    #           stored in the index
+    #
+    # The file is parsed once when the namespace is opened and reads are
+    # served from memory. Changes are only written when commit() is called,
+    # to a temporary file that is then renamed over the old one so a power
+    # loss never leaves a half written file behind.
+
+    _MAGIC = b'NVS1'
+    _HEADER = '<4sH'
+    _HEADER_SIZE = struct.calcsize(_HEADER)
+    _ENTRY = '<IIHH'
+    _ENTRY_SIZE = struct.calcsize(_ENTRY)
+
+    def _hash(key):
+        # 32 bit FNV-1a
+        h = 0x811C9DC5
+        for c in key:
+            h = ((h ^ c) * 0x01000193) & 0xFFFFFFFF
+        return h
+
+    def _split_legacy(data, pos):
+        # The old format is the key, a length byte and the data, one entry
+        # after the other. Nothing marks where a key ends and the length
+        # byte can look like part of the key, so every place the key could
+        # end is tried, longest first, until the entries account for the
+        # whole file. Returns None when they never do.
+        data_len = len(data)
+        if pos == data_len:
+            return []
+
+        end = pos
+        while end < data_len and 0x21 <= data[end] <= 0x7E:
+            end += 1
+
+        for key_end in range(min(end, data_len - 1), pos, -1):
+            value_end = key_end + 1 + data[key_end]
+            if value_end > data_len:
+                continue
+
+            entries = _split_legacy(data, value_end)
+            if entries is not None:
+                entries.insert(
+                    0, (data[pos:key_end], data[key_end + 1:value_end])
+                )
+                return entries
+
+        return None
+
     class NVS:
 
         def __init__(self, name):
             self.name = name
+            self._data = {}
+            self._legacy = None
+            self._is_dirty = False
+
             try:
-                self._file = open(name, 'rb')
+                with open(name, 'rb') as f:
+                    data = f.read()
             except OSError:
-                open(name, 'w').close()
-                self._file = open(name, 'rb')
+                return
 
-            self._data_to_commit = None
+            if data[:4] == _MAGIC:
+                self._load(data)
+            elif data:
+                # written by the older key/length/data format, the entries
+                # are moved to the new format on the next commit
+                entries = _split_legacy(data, 0)
+                if entries is None:
+                    # not something the old format could have written,
+                    # look the keys up in it as they are asked for
+                    self._legacy = data
+                else:
+                    for key, value in entries:
+                        self._data[key] = value
+
+        def _load(self, data):
+            _, count = struct.unpack_from(_HEADER, data, 0)
+            data_len = len(data)
+
+            for i in range(count):
+                key_hash, offset, key_len, value_len = struct.unpack_from(
+                    _ENTRY, data, _HEADER_SIZE + i * _ENTRY_SIZE
+                )
+                end = offset + key_len + value_len
+                if end > data_len:
+                    continue
 
-        def get_blob(self, key, buf):
-            key = key.encode('utf-8')
+                key = data[offset:offset + key_len]
+                if _hash(key) != key_hash:
+                    continue
 
-            buf_len = len(buf)
-            self._file.seek(0)
-            data = self._file.read()
-            if key not in data:
-                raise OSError
+                self._data[key] = data[offset + key_len:end]
 
-            data = data.split(key)[1]
-            data_len = int(data[0])
-            if data_len < buf_len:
-                raise OSError
+        def _get_legacy(self, key):
+            data = self._legacy
+            if data is None or key not in data:
+                return None
 
-            for i in range(buf_len):
-                buf[i] = data[i + 1]
+            data = data.split(key)[1]
+            value = data[1:data[0] + 1]
+            self._data[key] = value
+            return value
 
-        def set_blob(self, key, buf):
+        def get_blob(self, key, buf):
             key = key.encode('utf-8')
 
-            self._file.seek(0)
-            data = self._file.read()
+            value = self._data.get(key, None)
+            if value is None:
+                value = self._get_legacy(key)
+                if value is None:
+                    raise OSError
 
-            if key in data:
-                start_data, end_data = data.split(key)
-                data_len = int(end_data[0])
-                end_data = end_data[data_len + 1:]
+            buf_len = len(buf)
+            if len(value) < buf_len:
+                raise OSError
 
-                data = (
-                    start_data +
-                    key +
-                    bytes(bytearray([len(buf)])) +
-                    bytes(buf) +
-                    end_data
-                )
-            else:
-                data += (
-                    key +
-                    bytes(bytearray([len(buf)])) +
-                    bytes(buf)
-                )
+            buf[:] = value[:buf_len]
+            return buf_len
 
-            self._data_to_commit = data
+        def set_blob(self, key, buf):
+            self._data[key.encode('utf-8')] = bytes(buf)
+            self._is_dirty = True
 
         def erase(self, key):
             key = key.encode('utf-8')
 
-            self._file.seek(0)
-            data = self._file.read()
-
-            if key not in data:
+            if key not in self._data and self._get_legacy(key) is None:
                 raise OSError
 
-            start_data, end_data = data.split(key)
-            data_len = int(end_data[0])
-            end_data = end_data[data_len + 1:]
-
-            self._data_to_commit = start_data + end_data
+            del self._data[key]
+            self._is_dirty = True
 
         def commit(self):
-            if self._data_to_commit is None:
+            if not self._is_dirty:
                 return
 
-            self._file.close()
-            with open(self.name, 'wb') as f:
-                f.write(self._data_to_commit)
+            count = len(self._data)
+            offset = _HEADER_SIZE + count * _ENTRY_SIZE
+
+            index = bytearray(offset)
+            struct.pack_into(_HEADER, index, 0, _MAGIC, count)
+
+            for i, (key, value) in enumerate(self._data.items()):
+                struct.pack_into(
+                    _ENTRY,
+                    index,
+                    _HEADER_SIZE + i * _ENTRY_SIZE,
+                    _hash(key),
+                    offset,
+                    len(key),
+                    len(value)
+                )
+                offset += len(key) + len(value)
+
+            tmp_name = self.name + '.tmp'
+            with open(tmp_name, 'wb') as f:
+                f.write(index)
 
-            self._file = open(self.name, 'rb')
+                for key, value in self._data.items():
+                    f.write(key)
+                    f.write(value)
+
+            try:
+                os.rename(tmp_name, self.name)
+            except OSError:
+                # some filesystems (FAT) do not replace an existing file
+                os.remove(self.name)
+                os.rename(tmp_name, self.name)
 
-            self._data_to_commit = None
+            self._legacy = None
+            self._is_dirty = False
 
 
 class TouchCalData(object):
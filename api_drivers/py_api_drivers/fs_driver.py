@@ -3,8 +3,145 @@ Original author: mhepp(https://forum.lvgl.io/u/mhepp/summary)
 '''
 
 import lvgl as lv
+import os
 import struct
 
+
+class _BlockCache(object):
+    # Blocks of `block_size` bytes are read from the file at aligned offsets
+    # and kept until they are the least recently used block of the cache.
+    # Blocks are shared by every file opened on the drive so opening the same
+    # file again (fonts, images) does not read it from the storage again.
+    # The size and modification time of the file are checked every time it
+    # is opened so a file changed outside of this drive isn't served from
+    # stale blocks. Filesystems that don't keep a modification time can't
+    # be checked, there the blocks are dropped when the file is closed.
+
+    def __init__(self, block_size, block_count):
+        self.block_size = block_size
+        self.block_count = block_count
+        self.hits = 0
+        self.misses = 0
+
+        self._files = {}  # path -> {block index: [last use, data]}
+        self._stamps = {}  # path -> (size, mtime) when the blocks were read
+        self._used = 0
+        self._clock = 0
+
+    def _get_block(self, path, f, index):
+        self._clock += 1
+
+        blocks = self._files.get(path, None)
+        if blocks is not None:
+            block = blocks.get(index, None)
+            if block is not None:
+                self.hits += 1
+                block[0] = self._clock
+                return block[1]
+
+        self.misses += 1
+
+        f.seek(index * self.block_size)
+        data = f.read(self.block_size)
+
+        if self._used >= self.block_count:
+            self._evict()
+        else:
+            self._used += 1
+
+        self._files.setdefault(path, {})[index] = [self._clock, data]
+        return data
+
+    def _evict(self):
+        lru_path = None
+        lru_index = None
+        lru_time = self._clock
+
+        for path, blocks in self._files.items():
+            for index, block in blocks.items():
+                if block[0] < lru_time:
+                    lru_path = path
+                    lru_index = index
+                    lru_time = block[0]
+
+        blocks = self._files[lru_path]
+        del blocks[lru_index]
+        if not blocks:
+            del self._files[lru_path]
+            self._stamps.pop(lru_path, None)
+
+    def read(self, fs_data, buf, btr):
+        f = fs_data['file']
+        path = fs_data['path']
+        pos = fs_data['pos']
+        block_size = self.block_size
+
+        count = 0
+        while count < btr:
+            offset = pos % block_size
+            remaining = btr - count
+
+            if not offset and remaining >= block_size:
+                # whole blocks are copied straight into the buffer, caching
+                # them would only push out the small blocks decoders reuse
+                size = remaining - (remaining % block_size)
+                f.seek(pos)
+                size = f.readinto(buf[count:count + size])
+                if not size:
+                    break
+            else:
+                data = self._get_block(path, f, pos // block_size)
+                size = min(len(data) - offset, remaining)
+                if size <= 0:
+                    break
+
+                buf[count:count + size] = memoryview(data)[offset:offset + size]
+
+            count += size
+            pos += size
+
+        fs_data['pos'] = pos
+        return count
+
+    def validate(self, path):
+        # called when the file is opened, returns the size of the file
+        st = os.stat(path)
+        stamp = (st[6], st[8])
+
+        if self._stamps.get(path, None) != stamp:
+            # changed since the blocks were read
+            self.invalidate(path)
+            self._stamps[path] = stamp
+
+        return st[6]
+
+    def release(self, path):
+        # called when the file is closed
+        stamp = self._stamps.get(path, None)
+        if stamp is not None and not stamp[1]:
+            # no modification time, a change could not be seen on next open
+            self.invalidate(path)
+
+    def invalidate(self, path):
+        self._stamps.pop(path, None)
+        blocks = self._files.pop(path, None)
+        if blocks is not None:
+            self._used -= len(blocks)
+
+    def clear(self):
+        self._files.clear()
+        self._stamps.clear()
+        self._used = 0
+
+
+_caches = {}
+
+# sized views of the buffers LVGL passes to the callbacks. They are pointed
+# at the new buffer on every call, which does not allocate
+_buf_view = lv.C_Buffer()
+_u32_view = lv.C_Buffer()
+
+
 def _fs_open_cb(drv, path, mode):
 
     if mode == lv.FS_MODE.WR:
@@ -16,18 +153,34 @@ def _fs_open_cb(drv, path, mode):
     else:
         raise RuntimeError("fs_open_callback() - open mode error, %s is invalid mode" % mode)
 
+    cache = _caches.get(drv.letter, None)
+
     try:
         f = open(path, p_mode)
 
+        if cache is not None and p_mode != 'rb':
+            # the file is going to change, anything read from it is stale
+            cache.invalidate(path)
+            cache = None
+
+        if cache is not None:
+            size = cache.validate(path)
+        else:
+            size = 0
+
     except OSError as e:
         raise RuntimeError("fs_open_callback(%s) exception: %s" % (path, e))
 
-    return {'file' : f, 'path': path}
+    return {'file' : f, 'path': path, 'cache': cache, 'pos': 0, 'size': size}
 
 
 def _fs_close_cb(drv, fs_file):
     try:
-        fs_file.__cast__()['file'].close()
+        fs_data = fs_file.__cast__()
+        fs_data['file'].close()
+
+        if fs_data['cache'] is not None:
+            fs_data['cache'].release(fs_data['path'])
     except OSError as e:
         raise RuntimeError("fs_close_callback(%s) exception: %s" % (fs_file.__cast__()['path'], e))
 
@@ -35,46 +188,70 @@ def _fs_close_cb(drv, fs_file):
 
 
 def _fs_read_cb(drv, fs_file, buf, btr, br):
+    fs_data = fs_file.__cast__()
     try:
-        tmp_data = fs_file.__cast__()['file'].read(btr)
-        buf.__dereference__(btr)[0:len(tmp_data)] = tmp_data
-        br.__dereference__(4)[0:4] = struct.pack("<L", len(tmp_data))
+        cache = fs_data['cache']
+        if cache is None:
+            _buf_view.__cast_instance__(buf, btr)
+            read = fs_data['file'].readinto(_buf_view) or 0
+        else:
+            # the cache slices the buffer so it needs a memoryview
+            read = cache.read(fs_data, buf.__dereference__(btr), btr)
+
+        _u32_view.__cast_instance__(br, 4)
+        struct.pack_into("<L", _u32_view, 0, read)
     except OSError as e:
-        raise RuntimeError("fs_read_callback(%s) exception %s" % (fs_file.__cast__()['path'], e))
+        raise RuntimeError("fs_read_callback(%s) exception %s" % (fs_data['path'], e))
 
     return lv.FS_RES.OK
 
 
 def _fs_seek_cb(drv, fs_file, pos, whence):
+    fs_data = fs_file.__cast__()
     try:
-        fs_file.__cast__()['file'].seek(pos, whence)
+        if fs_data['cache'] is None:
+            fs_data['file'].seek(pos, whence)
+        elif whence == lv.FS_SEEK.SET:
+            fs_data['pos'] = pos
+        elif whence == lv.FS_SEEK.CUR:
+            fs_data['pos'] += pos
+        else:
+            fs_data['pos'] = fs_data['size'] + pos
     except OSError as e:
-        raise RuntimeError("fs_seek_callback(%s) exception %s" % (fs_file.__cast__()['path'], e))
+        raise RuntimeError("fs_seek_callback(%s) exception %s" % (fs_data['path'], e))
 
     return lv.FS_RES.OK
 
 
 def _fs_tell_cb(drv, fs_file, pos):
+    fs_data = fs_file.__cast__()
     try:
-        tpos = fs_file.__cast__()['file'].tell()
-        pos.__dereference__(4)[0:4] = struct.pack("<L", tpos)
+        if fs_data['cache'] is None:
+            tpos = fs_data['file'].tell()
+        else:
+            tpos = fs_data['pos']
+
+        _u32_view.__cast_instance__(pos, 4)
+        struct.pack_into("<L", _u32_view, 0, tpos)
     except OSError as e:
-        raise RuntimeError("fs_tell_callback(%s) exception %s" % (fs_file.__cast__()['path'], e))
+        raise RuntimeError("fs_tell_callback(%s) exception %s" % (fs_data['path'], e))
 
     return lv.FS_RES.OK
 
 
 def _fs_write_cb(drv, fs_file, buf, btw, bw):
     try:
-        wr = fs_file.__cast__()['file'].write(buf.__dereference__(btw)[0:btw])
-        bw.__dereference__(4)[0:4] = struct.pack("<L", wr)
+        _buf_view.__cast_instance__(buf, btw)
+        wr = fs_file.__cast__()['file'].write(_buf_view)
+        _u32_view.__cast_instance__(bw, 4)
+        struct.pack_into("<L", _u32_view, 0, wr)
     except OSError as e:
         raise RuntimeError("fs_write_callback(%s) exception %s" % (fs_file.__cast__()['path'], e))
 
     return lv.FS_RES.OK
 
 
-def fs_register(fs_drv, letter, cache_size=500):
+def fs_register(fs_drv, letter, cache_size=500, block_size=512, block_count=8):
 
     fs_drv.init()
     fs_drv.letter = ord(letter)
@@ -88,5 +265,35 @@ def fs_register(fs_drv, letter, cache_size=500):
     if cache_size >= 0:
         fs_drv.cache_size = cache_size
 
+    # block_size or block_count of 0 disables the block cache
+    if block_size > 0 and block_count > 0:
+        _caches[ord(letter)] = _BlockCache(block_size, block_count)
+    else:
+        _caches.pop(ord(letter), None)
+
     fs_drv.register()
 
+
+def fs_cache_stats(letter):
+    cache = _caches.get(ord(letter), None)
+    if cache is None:
+        return None
+
+    return dict(
+        hits=cache.hits,
+        misses=cache.misses,
+        blocks=cache._used,
+        block_size=cache.block_size,
+        block_count=cache.block_count
+    )
+
+
+def fs_cache_clear(letter, reset_stats=False):
+    cache = _caches.get(ord(letter), None)
+    if cache is None:
+        return
+
+    cache.clear()
+    if reset_stats:
+        cache.hits = 0
+        cache.misses = 0
@@ -1,11 +1,22 @@
 import sys
 import os
+import shutil
 import subprocess
+import selectors
 import threading
 import random
 import queue
 
 _windows_env = None
+_jobs = os.cpu_count()
+_ccache = False
+
+# compiler names that get routed through ccache, ccache finds the real
+# compiler by skipping its own directory in PATH
+_CCACHE_COMPILERS = (
+    'cc', 'c++', 'gcc', 'g++', 'clang', 'clang++',
+    'arm-none-eabi-gcc', 'arm-none-eabi-g++'
+)
 
 
 def setup_windows_build():
@@ -93,6 +104,71 @@ def update_mphalport(target):
             f.write(data.encode('utf-8'))
 
 
+def set_jobs(jobs):
+    """
+    Sets the number of parallel jobs used by every build step.
+
+    The top level make gets `-j`, sub-makes and makes started by CMake get
+    it through MAKEFLAGS and `cmake --build` through
+    CMAKE_BUILD_PARALLEL_LEVEL.
+    """
+    global _jobs
+
+    _jobs = max(int(jobs), 1)
+    cmd[2] = f'-j {_jobs}'
+
+    makeflags = os.environ.get('MAKEFLAGS', '')
+    makeflags = ' '.join(
+        flag for flag in makeflags.split()
+        if not flag.startswith('-j') and not flag.startswith('--jobs')
+    )
+    os.environ['MAKEFLAGS'] = f'-j{_jobs} {makeflags}'.strip()
+    os.environ['CMAKE_BUILD_PARALLEL_LEVEL'] = str(_jobs)
+
+
+def get_jobs():
+    return _jobs
+
+
+def setup_ccache(script_dir):
+    """
+    Routes the C compilers through ccache if it is installed.
+
+    A directory with links named after the compilers that point to ccache
+    is put at the front of PATH, this covers the make based ports as well
+    as the CMake based ones without having to touch their build files.
+    """
+    global _ccache
+
+    ccache_path = shutil.which('ccache')
+    if ccache_path is None:
+        print('ccache was not found, building without it')
+        return False
+
+    bin_dir = os.path.join(script_dir, 'build', 'ccache')
+    if not os.path.exists(bin_dir):
+        os.makedirs(bin_dir)
+
+    for name in _CCACHE_COMPILERS:
+        link = os.path.join(bin_dir, name)
+        if not os.path.lexists(link):
+            os.symlink(ccache_path, link)
+
+    os.environ['PATH'] = bin_dir + os.pathsep + os.environ.get('PATH', '')
+
+    # hits across different checkouts of the repo
+    os.environ.setdefault('CCACHE_BASEDIR', script_dir)
+    # MicroPython puts the build date in the banner
+    os.environ.setdefault('CCACHE_SLOPPINESS', 'time_macros')
+
+    _ccache = True
+    return True
+
+
+def use_ccache():
+    return _ccache
+
+
 def generate_manifest(
     script_dir, lvgl_api, manifest_path, displays,
     indevs, frozen_manifest, *addl_manifest_files
@@ -338,14 +414,7 @@ def _convert_line(lne):
 
 
 def process_output(myproc, out_to_screen, spinner, cmpl, out_queue):
-    line = b''
-    err_line = b''
     last_line_len = -1
-    line_updated = False
-    err_updated = False
-
-    os.set_blocking(myproc.stdout.fileno(), False)
-    os.set_blocking(myproc.stderr.fileno(), False)
 
     event = threading.Event()
     spinner_lock = threading.Lock()
@@ -356,106 +425,144 @@ def process_output(myproc, out_to_screen, spinner, cmpl, out_queue):
     else:
         t = None
 
-    while True:
-        # --- extract line using read(1)
-        out = myproc.stdout.read(1)
-        while out:
-            line_updated = True
-            line += out
-            if out == b'\n':
-                line = _convert_line(line.strip())
-                if not line:
-                    line = b''
-                    break
+    def _stdout_line(lne):
+        nonlocal last_line_len
+
+        out_queue.put(lne)
 
-                out_queue.put(line)
-
-                if out_to_screen:
-                    if (
-                        cmpl and (
-                            line.startswith('[') or
-                            line.startswith('CC ') or
-                            line.startswith('MPY ') or
-                            (
-                                line.startswith('--') and
-                                len(line) <= 80
-                            )
-                        )
-                    ):
-                        if last_line_len != -1:
-                            sys.stdout.write('\r')
-                            sys.stdout.flush()
-
-                        if len(line) < last_line_len:
-                            padding = ' ' * (last_line_len - len(line))
-                        else:
-                            padding = ''
-
-                        sys.stdout.write(line + padding)
-                        sys.stdout.flush()
-
-                        last_line_len = len(line)
-                    else:
-                        if last_line_len == -1:
-                            if spinner:
-                                with spinner_lock:
-                                    sys.stdout.write('\r' + line + '\n')
-                                    sys.stdout.flush()
-                            else:
-                                sys.stdout.write(line + '\n')
-                                sys.stdout.flush()
-                        else:
-                            if spinner:
-                                with spinner_lock:
-                                    sys.stdout.write('\r' + line + '\n')
-                                    sys.stdout.flush()
-                            else:
-                                sys.stdout.write('\n' + line + '\n')
-                                sys.stdout.flush()
-
-                            last_line_len = -1
-
-                line = b''
-
-            out = myproc.stdout.read(1)
-
-        out = myproc.stderr.read(1)
-
-        while out:
-            err_updated = True
-            if not spinner and out_to_screen and cmpl and last_line_len != -1:
-                sys.stdout.write('\n')
+        if not out_to_screen:
+            return
+
+        if (
+            cmpl and (
+                lne.startswith('[') or
+                lne.startswith('CC ') or
+                lne.startswith('MPY ') or
+                (
+                    lne.startswith('--') and
+                    len(lne) <= 80
+                )
+            )
+        ):
+            if last_line_len != -1:
+                sys.stdout.write('\r')
+                sys.stdout.flush()
+
+            if len(lne) < last_line_len:
+                padding = ' ' * (last_line_len - len(lne))
+            else:
+                padding = ''
+
+            sys.stdout.write(lne + padding)
+            sys.stdout.flush()
+
+            last_line_len = len(lne)
+        elif spinner:
+            with spinner_lock:
+                sys.stdout.write('\r' + lne + '\n')
                 sys.stdout.flush()
-                last_line_len = -1
 
-            err_line += out
-            if out == b'\n':
-                err_line = _convert_line(err_line.strip())
-                if not err_line:
-                    err_line = b''
+            last_line_len = -1
+        elif last_line_len == -1:
+            sys.stdout.write(lne + '\n')
+            sys.stdout.flush()
+        else:
+            sys.stdout.write('\n' + lne + '\n')
+            sys.stdout.flush()
+            last_line_len = -1
+
+    def _stderr_line(lne):
+        nonlocal last_line_len
+
+        if not spinner and out_to_screen and cmpl and last_line_len != -1:
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+            last_line_len = -1
+
+        out_queue.put(lne)
+
+        if out_to_screen:
+            if spinner:
+                with spinner_lock:
+                    sys.stderr.write('\r' + lne + '\n')
+                    sys.stdout.flush()
+            else:
+                sys.stderr.write(lne + '\n')
+                sys.stderr.flush()
+
+    def _feed(state, data):
+        # state is [the unfinished line, handler], an empty chunk means
+        # the pipe was closed
+        pending, handler = state
+
+        if not data:
+            lines = [pending] if pending else []
+            state[0] = b''
+        else:
+            lines = (pending + data).split(b'\n')
+            state[0] = lines.pop()
+
+        for lne in lines:
+            lne = _convert_line(lne.strip())
+            if lne:
+                handler(lne)
+
+    # the output is read in whatever sized chunks the pipe has available
+    # and split into lines here, the process is only waited on when neither
+    # pipe has anything to read.
+    if sys.platform == 'win32':
+        # select() only takes sockets on Windows, a thread reads each pipe
+        # and the lines are still handled here so the output isn't mixed
+        chunks = queue.Queue()
+
+        def _reader(pipe, state):
+            while True:
+                data = os.read(pipe.fileno(), 65536)
+                chunks.put((state, data))
+                if not data:
                     break
 
-                out_queue.put(err_line)
-                if out_to_screen:
-                    if spinner:
-                        with spinner_lock:
-                            sys.stderr.write('\r' + err_line + '\n')
-                            sys.stdout.flush()
-                    else:
-                        sys.stderr.write(err_line + '\n')
-                        sys.stderr.flush()
+        readers = [
+            threading.Thread(target=_reader, args=(pipe, [b'', handler]))
+            for pipe, handler in (
+                (myproc.stdout, _stdout_line),
+                (myproc.stderr, _stderr_line)
+            )
+        ]
+
+        for reader in readers:
+            reader.daemon = True
+            reader.start()
 
-                err_line = b''
+        open_pipes = len(readers)
+        while open_pipes:
+            state, data = chunks.get()
+            _feed(state, data)
+            if not data:
+                open_pipes -= 1
 
-            out = myproc.stderr.read(1)
+        for reader in readers:
+            reader.join()
+    else:
+        sel = selectors.DefaultSelector()
+        sel.register(myproc.stdout, selectors.EVENT_READ, [b'', _stdout_line])
+        sel.register(myproc.stderr, selectors.EVENT_READ, [b'', _stderr_line])
 
-        if not err_updated and not line_updated:
-            if myproc.poll() is not None:
-                break
-            event.wait(0.1)
+        while sel.get_map():
+            for key, _ in sel.select():
+                try:
+                    data = os.read(key.fd, 65536)
+                except BlockingIOError:
+                    continue
+
+                if not data:
+                    sel.unregister(key.fileobj)
+
+                _feed(key.data, data)
+
+        sel.close()
 
-        err_updated = False
-        line_updated = False
+    myproc.wait()
 
     if t is not None:
         event.set()
@@ -602,7 +709,7 @@ mpy_cross_cmd = ['make', '-C', 'lib/micropython/mpy-cross']
 cmd = [
     'make',
     '',
-    f'-j {os.cpu_count()}',
+    f'-j {_jobs}',
     '-C'
 ]
 clean_cmd = []
@@ -0,0 +1,232 @@
+import os
+import struct
+
+
+# Packs asset files (fonts, LVGL .bin images, anything else) into a single
+# read-only archive for the lv_archive module. The archive is either frozen
+# into the firmware, so it is read from flash through the XIP mapping, or
+# written to a file that gets copied to the filesystem of the board. The
+# format is documented in ext_mod/lvgl/lv_archive.c.
+
+ARCHIVE_MAGIC = b'LVPK'
+ARCHIVE_VERSION = 1
+
+HEADER_FORMAT = '<4sHHII'
+ENTRY_FORMAT = '<IHHII'
+
+FROZEN_MODULE = 'lv_archive_data'
+ARCHIVE_FILE = 'assets.lvpk'
+
+
+def _collect(paths):
+    files = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    file = os.path.join(root, filename)
+                    name = os.path.relpath(file, path).replace(os.sep, '/')
+                    files.append((name, file))
+        elif os.path.exists(path):
+            files.append((os.path.split(path)[-1], path))
+        else:
+            raise RuntimeError(f'Archive file not found "{path}"')
+
+    return files
+
+
+def pack(files, align=4):
+    """
+    Builds the archive.
+
+    :param files: list of (name, path) tuples
+    :param align: alignment of the entry data in bytes, 4 keeps the data
+                  word aligned which LVGL expects for image data
+    :return: the archive as bytes
+    """
+    if align < 1 or align & (align - 1):
+        raise RuntimeError('The archive alignment must be a power of 2')
+
+    entries = []
+    for name, path in files:
+        with open(path, 'rb') as f:
+            entries.append((name.encode('utf-8'), f.read()))
+
+    # the runtime does a binary search of the index
+    entries.sort(key=lambda item: item[0])
+
+    for i in range(1, len(entries)):
+        if entries[i][0] == entries[i - 1][0]:
+            raise RuntimeError(
+                f'More than one archive file is named '
+                f'"{entries[i][0].decode("utf-8")}"'
+            )
+
+    if len(entries) > 0xFFFF:
+        raise RuntimeError('Too many files for one archive')
+
+    header_size = struct.calcsize(HEADER_FORMAT)
+    index_size = struct.calcsize(ENTRY_FORMAT) * len(entries)
+
+    names = bytearray()
+    name_offsets = []
+    for name, _ in entries:
+        if len(name) > 0xFFFF:
+            raise RuntimeError(f'Archive file name is too long "{name}"')
+        name_offsets.append(header_size + index_size + len(names))
+        names += name
+
+    data = bytearray()
+    data_start = header_size + index_size + len(names)
+    data_offsets = []
+
+    for _, contents in entries:
+        padding = (align - (data_start + len(data)) % align) % align
+        data += b'\x00' * padding
+        data_offsets.append(data_start + len(data))
+        data += contents
+
+    archive = bytearray(
+        struct.pack(
+            HEADER_FORMAT,
+            ARCHIVE_MAGIC,
+            ARCHIVE_VERSION,
+            len(entries),
+            header_size,
+            align
+        )
+    )
+
+    for i, (name, contents) in enumerate(entries):
+        archive += struct.pack(
+            ENTRY_FORMAT,
+            name_offsets[i],
+            len(name),
+            0,
+            data_offsets[i],
+            len(contents)
+        )
+
+    archive += names
+    archive += data
+
+    return bytes(archive)
+
+
+def unpack(archive):
+    # reads an archive back into a {name: data} dict, used to check
+    # archives on the host
+    magic, version, count, index_offset, _ = (
+        struct.unpack_from(HEADER_FORMAT, archive, 0)
+    )
+
+    if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+        raise RuntimeError('Not an asset archive')
+
+    entry_size = struct.calcsize(ENTRY_FORMAT)
+    entries = {}
+
+    for i in range(count):
+        name_offset, name_len, _, data_offset, data_size = struct.unpack_from(
+            ENTRY_FORMAT, archive, index_offset + i * entry_size
+        )
+        name = archive[name_offset:name_offset + name_len].decode('utf-8')
+        entries[name] = archive[data_offset:data_offset + data_size]
+
+    return entries
+
+
+def write_module(archive, output_dir):
+    path = os.path.join(output_dir, FROZEN_MODULE + '.py')
+
+    lines = [
+        '# Generated by make.py from the files passed using --archive, '
+        'do not edit.',
+        '# DATA is frozen into the firmware so the entries are read '
+        'straight from flash.',
+        '',
+        'import lv_archive  # NOQA',
+        'import lvgl as lv  # NOQA',
+        '',
+        f'DATA = {archive!r}',
+        '',
+        'archive = lv_archive.Archive(DATA)',
+        '',
+        '_cache = {}',
+        '',
+        '',
+        'def image(name):',
+        '    # returns an lv.image_dsc_t for an LVGL .bin image in the archive,',
+        '    # the pixel data is not copied',
+        '    dsc = _cache.get(name, None)',
+        '    if dsc is None:',
+        '        data = archive.get(name)',
+        '        if data is None:',
+        '            raise KeyError(name)',
+        '',
+        '        magic = data[0]',
+        '        cf = data[1]',
+        '        flags = data[2] | (data[3] << 8)',
+        '        w = data[4] | (data[5] << 8)',
+        '        h = data[6] | (data[7] << 8)',
+        '        stride = data[8] | (data[9] << 8)',
+        '',
+        '        dsc = lv.image_dsc_t({',
+        '            \'header\': {',
+        '                \'magic\': magic,',
+        '                \'cf\': cf,',
+        '                \'flags\': flags,',
+        '                \'w\': w,',
+        '                \'h\': h,',
+        '                \'stride\': stride',
+        '            },',
+        '            \'data_size\': len(data) - 12,',
+        '            \'data\': data[12:]',
+        '        })',
+        '        _cache[name] = dsc',
+        '',
+        '    return dsc',
+        ''
+    ]
+
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+
+    return path
+
+
+def build(paths, script_dir, output='frozen', align=4):
+    """
+    Packs the files into an archive and adds it to the build.
+
+    :param paths: files or directories, files in a directory are named by
+                  their path relative to the directory
+    :param script_dir: root of the repo
+    :param output: "frozen" to freeze the archive into the firmware as the
+                   `lv_archive_data` module or "file" to write it to
+                   build/assets.lvpk
+    :param align: alignment of the entry data in bytes
+    """
+    files = _collect(paths)
+    if not files:
+        return
+
+    print('Packing archive....')
+    archive = pack(files, align)
+
+    build_dir = os.path.join(script_dir, 'build')
+
+    if output == 'file':
+        path = os.path.join(build_dir, ARCHIVE_FILE)
+        with open(path, 'wb') as f:
+            f.write(archive)
+    else:
+        path = write_module(archive, build_dir)
+
+        with open(os.path.join(build_dir, 'manifest.py'), 'a') as f:
+            f.write(f"\nfreeze('{build_dir}', '{FROZEN_MODULE}.py')\n")
+
+    print(path)
+    print(f'  {len(files)} files, {len(archive)} bytes')
+    print()
@@ -3,6 +3,8 @@ import shutil
 import sys
 from argparse import ArgumentParser
 from . import spawn
+from . import get_jobs
+from . import use_ccache
 from . import generate_manifest
 from . import update_mphalport
 
@@ -415,7 +417,7 @@ mpy_cross_cmd = ['make', '-C', 'lib/micropython/mpy-cross']
 esp_cmd = [
     'make',
     '',
-    f'-j {os.cpu_count()}',
+    f'-j {get_jobs()}',
     '-C',
     f'lib/micropython/ports/esp32'
 ]
@@ -787,7 +789,9 @@ def compile(*args):  # NOQA
 
     env, cmds = setup_idf_environ()
 
-    if ccache:
+    # ESP-IDF has its own ccache support, export.sh puts the toolchain in
+    # front of the ccache links in PATH
+    if ccache or use_ccache():
         env['IDF_CCACHE_ENABLE'] = '1'
 
     base_config = [
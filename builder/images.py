@@ -0,0 +1,392 @@
+import os
+import sys
+import time
+import struct
+
+
+# Converts PNG/JPG/BMP (anything Pillow can open) into LVGL native image data
+# so the images do not have to be decoded on the MCU. The data is either
+# frozen into the firmware as a Python module or written as LVGL .bin files
+# that the bin decoder loads straight from the filesystem.
+
+IMAGE_HEADER_MAGIC = 0x19
+
+# lv_color_format_t
+COLOR_FORMATS = {
+    'L8': (0x06, 8),
+    'A8': (0x0E, 8),
+    'RGB888': (0x0F, 24),
+    'ARGB8888': (0x10, 32),
+    'XRGB8888': (0x11, 32),
+    'RGB565': (0x12, 16),
+    'RGB565A8': (0x14, 16),
+}
+
+IMAGE_FLAGS_COMPRESSED = 0x0008
+COMPRESS_RLE = 1
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+FROZEN_MODULE = 'lv_assets'
+
+
+def _load_pillow():
+    try:
+        from PIL import Image  # NOQA
+    except ImportError:
+        sys.stderr.write(
+            'The image compiler needs Pillow, install it using\n'
+            f'"{sys.executable} -m pip install Pillow"\n'
+        )
+        sys.exit(-1)
+
+    return Image
+
+
+def _stride(width, bpp, align):
+    stride = (width * bpp + 7) // 8
+    return (stride + align - 1) // align * align
+
+
+def _convert(image, cf_name, align):
+    width, height = image.size
+    _, bpp = COLOR_FORMATS[cf_name]
+    stride = _stride(width, bpp, align)
+
+    pixels = image.convert('RGBA').tobytes()
+    data = bytearray(stride * height)
+
+    if cf_name == 'RGB565A8':
+        # RGB565 plane followed by an A8 plane with half the stride
+        alpha_stride = stride // 2
+        alpha = bytearray(alpha_stride * height)
+    else:
+        alpha_stride = 0
+        alpha = None
+
+    for y in range(height):
+        src = y * width * 4
+        dst = y * stride
+
+        for x in range(width):
+            r, g, b, a = pixels[src:src + 4]
+            src += 4
+
+            if cf_name in ('RGB565', 'RGB565A8'):
+                color = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                data[dst] = color & 0xFF
+                data[dst + 1] = color >> 8
+                dst += 2
+                if alpha is not None:
+                    alpha[y * alpha_stride + x] = a
+            elif cf_name == 'RGB888':
+                # LVGL keeps 24 bit colors in BGR order
+                data[dst:dst + 3] = bytes((b, g, r))
+                dst += 3
+            elif cf_name == 'ARGB8888':
+                data[dst:dst + 4] = bytes((b, g, r, a))
+                dst += 4
+            elif cf_name == 'XRGB8888':
+                data[dst:dst + 4] = bytes((b, g, r, 0xFF))
+                dst += 4
+            elif cf_name == 'L8':
+                data[dst] = (r * 299 + g * 587 + b * 114) // 1000
+                dst += 1
+            elif cf_name == 'A8':
+                data[dst] = a
+                dst += 1
+
+    if alpha is not None:
+        data += alpha
+
+    return stride, bytes(data)
+
+
+def _rle_compress(data, block_size, threshold=16):
+    # same encoding as lv_rle_decompress, a control byte with the top bit
+    # set is followed by that many literal blocks, without the top bit it is
+    # followed by a single block that gets repeated that many times.
+    out = bytearray()
+    index = 0
+    length = len(data)
+
+    def repeat_count(start):
+        block = data[start:start + block_size]
+        count = 1
+        pos = start + block_size
+        while (
+            count < 127 and pos + block_size <= length and
+            data[pos:pos + block_size] == block
+        ):
+            count += 1
+            pos += block_size
+        return count
+
+    while index < length:
+        count = repeat_count(index)
+
+        if count < threshold:
+            # gather literal blocks until a long enough run starts
+            start = index
+            literal = 0
+            while index < length and literal < 127:
+                if repeat_count(index) >= threshold:
+                    break
+                index += block_size
+                literal += 1
+
+            out.append(0x80 | literal)
+            out += data[start:index]
+        else:
+            out.append(count)
+            out += data[index:index + block_size]
+            index += count * block_size
+
+    return bytes(out)
+
+
+def _decoded_size(image, path):
+    # the buffer the runtime decoder would have to allocate for the image
+    width, height = image.size
+    ext = os.path.splitext(path)[-1].lower()
+
+    if ext == '.png':
+        # lodepng decodes into ARGB8888
+        return width * height * 4
+    if ext in ('.jpg', '.jpeg'):
+        # TJPGD decodes into RGB888
+        return width * height * 3
+    # BMP is read a line at a time
+    return _stride(width, image.mode == 'RGBA' and 32 or 24, 4)
+
+
+def _collect(paths):
+    files = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            for file in sorted(os.listdir(path)):
+                if os.path.splitext(file)[-1].lower() in IMAGE_EXTENSIONS:
+                    files.append(os.path.join(path, file))
+        elif os.path.exists(path):
+            files.append(path)
+        else:
+            raise RuntimeError(f'Image not found "{path}"')
+
+    return files
+
+
+def _asset_name(path):
+    name = os.path.splitext(os.path.split(path)[-1])[0]
+    name = ''.join(c if c.isalnum() else '_' for c in name.lower())
+    if name[0].isdigit():
+        name = '_' + name
+    return name
+
+
+def compile_image(path, cf_name, align=1, rle=False):
+    Image = _load_pillow()  # NOQA
+
+    start = time.perf_counter()
+    image = Image.open(path)
+    image.load()
+    decode_time = time.perf_counter() - start
+
+    has_alpha = (
+        image.mode in ('RGBA', 'LA', 'PA') or
+        (image.mode == 'P' and 'transparency' in image.info)
+    )
+
+    # RGB565 has no alpha channel, keep the transparency of the image
+    if has_alpha and cf_name == 'RGB565':
+        cf_name = 'RGB565A8'
+
+    cf, bpp = COLOR_FORMATS[cf_name]
+    stride, data = _convert(image, cf_name, align)
+    flags = 0
+
+    block_size = (bpp + 7) // 8
+
+    if rle and len(data) % block_size == 0:
+        compressed = _rle_compress(data, block_size)
+        if len(compressed) + 12 < len(data):
+            data = struct.pack(
+                '<III', COMPRESS_RLE, len(compressed), len(data)
+            ) + compressed
+            flags |= IMAGE_FLAGS_COMPRESSED
+
+    width, height = image.size
+
+    return dict(
+        name=_asset_name(path),
+        path=path,
+        cf=cf,
+        cf_name=cf_name,
+        flags=flags,
+        width=width,
+        height=height,
+        stride=stride,
+        data=data,
+        source_size=os.path.getsize(path),
+        decoded_size=_decoded_size(image, path),
+        decode_time=decode_time
+    )
+
+
+def _header(asset):
+    return struct.pack(
+        '<BBHHHHH',
+        IMAGE_HEADER_MAGIC,
+        asset['cf'],
+        asset['flags'],
+        asset['width'],
+        asset['height'],
+        asset['stride'],
+        0
+    )
+
+
+def write_bin(asset, output_dir):
+    path = os.path.join(output_dir, asset['name'] + '.bin')
+    with open(path, 'wb') as f:
+        f.write(_header(asset))
+        f.write(asset['data'])
+
+    return path
+
+
+def write_module(assets, output_dir):
+    path = os.path.join(output_dir, FROZEN_MODULE + '.py')
+
+    lines = [
+        '# Generated by make.py from the images passed using --image, '
+        'do not edit.',
+        '# The image data is frozen into the firmware so it is read from '
+        'flash and',
+        '# never needs to be decoded.',
+        '',
+        'import lvgl as lv  # NOQA',
+        '',
+        '_ASSETS = {'
+    ]
+
+    for asset in assets:
+        lines.append(
+            f"    '{asset['name']}': ("
+            f"{asset['cf']}, {asset['flags']}, {asset['width']}, "
+            f"{asset['height']}, {asset['stride']}, {asset['data']!r}),"
+        )
+
+    lines.extend([
+        '}',
+        '',
+        '_cache = {}',
+        '',
+        '',
+        'def names():',
+        '    return list(_ASSETS.keys())',
+        '',
+        '',
+        'def get(name):',
+        '    # returns an lv.image_dsc_t that can be passed to set_src',
+        '    dsc = _cache.get(name, None)',
+        '    if dsc is None:',
+        '        cf, flags, w, h, stride, data = _ASSETS[name]',
+        '        dsc = lv.image_dsc_t({',
+        '            \'header\': {',
+        f'                \'magic\': {IMAGE_HEADER_MAGIC},',
+        '                \'cf\': cf,',
+        '                \'flags\': flags,',
+        '                \'w\': w,',
+        '                \'h\': h,',
+        '                \'stride\': stride',
+        '            },',
+        '            \'data_size\': len(data),',
+        '            \'data\': data',
+        '        })',
+        '        _cache[name] = dsc',
+        '',
+        '    return dsc',
+        ''
+    ])
+
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+
+    return path
+
+
+def _report(assets):
+    print()
+    print('Image assets:')
+    total_time = 0.0
+    total_memory = 0
+
+    for asset in assets:
+        compressed = ' RLE' if asset['flags'] & IMAGE_FLAGS_COMPRESSED else ''
+        total_time += asset['decode_time']
+        total_memory += asset['decoded_size']
+
+        print(
+            f"  {asset['name']}: {asset['width']}x{asset['height']} "
+            f"{asset['cf_name']}{compressed}, "
+            f"{asset['source_size']} -> {len(asset['data'])} bytes, "
+            f"decode buffer saved {asset['decoded_size']} bytes, "
+            f"host decode {asset['decode_time'] * 1000:.1f}ms"
+        )
+
+    print(
+        f'  total: decode buffers saved {total_memory} bytes, '
+        f'host decode {total_time * 1000:.1f}ms '
+        '(the decode on the MCU is many times slower)'
+    )
+    print()
+
+
+def build(paths, script_dir, cf_name='RGB565', align=1, rle=False,
+          output='frozen'):
+    """
+    Compiles the images and adds them to the build.
+
+    :param paths: image files or directories holding image files
+    :param script_dir: root of the repo
+    :param cf_name: LVGL color format name, images with transparency that
+                    are compiled to RGB565 use RGB565A8
+    :param align: row stride alignment in bytes (LV_DRAW_BUF_STRIDE_ALIGN)
+    :param rle: RLE compress the image data (needs LV_USE_RLE)
+    :param output: "frozen" to freeze the images into the firmware as the
+                   `lv_assets` module or "bin" to write LVGL .bin files to
+                   build/assets
+    """
+    if cf_name not in COLOR_FORMATS:
+        raise RuntimeError(f'Unsupported image color format "{cf_name}"')
+
+    files = _collect(paths)
+    if not files:
+        return
+
+    print('Compiling images....')
+    assets = [compile_image(file, cf_name, align, rle) for file in files]
+
+    names = [asset['name'] for asset in assets]
+    for name in names:
+        if names.count(name) > 1:
+            raise RuntimeError(f'More than one image is named "{name}"')
+
+    build_dir = os.path.join(script_dir, 'build')
+
+    if output == 'bin':
+        output_dir = os.path.join(build_dir, 'assets')
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        for asset in assets:
+            print(write_bin(asset, output_dir))
+    else:
+        path = write_module(assets, build_dir)
+        print(path)
+
+        with open(os.path.join(build_dir, 'manifest.py'), 'a') as f:
+            f.write(f"\nfreeze('{build_dir}', '{FROZEN_MODULE}.py')\n")
+
+    _report(assets)
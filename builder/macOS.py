@@ -2,6 +2,7 @@ import os
 import sys
 import shutil
 from . import spawn
+from . import get_jobs
 from . import generate_manifest
 from . import update_mphalport
 from argparse import ArgumentParser
@@ -12,7 +13,7 @@ clean_cmd = []
 unix_cmd = [
     'make',
     '',
-    f'-j {os.cpu_count()}',
+    f'-j {get_jobs()}',
     '-C',
 ]
 
@@ -152,7 +153,7 @@ def build_sdl():
             f'cmake -DSDL_STATIC=OFF -DSDL_SHARED=ON '
             f'-DCMAKE_BUILD_TYPE=Release {sdl_flags} {SCRIPT_PATH}/lib/SDL'
         ],
-        [f'cmake --build . --config Release --parallel {os.cpu_count()}']
+        [f'cmake --build . --config Release --parallel {get_jobs()}']
     ]
 
     res, _ = spawn(cmd_, cmpl=True)
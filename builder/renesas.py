@@ -1,6 +1,7 @@
 import os
 import sys
 from . import spawn
+from . import get_jobs
 from . import generate_manifest
 from . import update_mphalport
 
@@ -13,7 +14,7 @@ mpy_cross_cmd = ['make', '-C', 'lib/micropython/mpy-cross']
 renesas_cmd = [
     'make',
     '',
-    f'-j {os.cpu_count()}',
+    f'-j {get_jobs()}',
     '-C',
     'lib/micropython/ports/renesas-ra',
     'LV_PORT=renesas-ra'
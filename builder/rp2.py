@@ -2,6 +2,7 @@ import os
 import sys
 from argparse import ArgumentParser
 from . import spawn
+from . import get_jobs
 from . import generate_manifest
 from . import update_mphalport
 
@@ -41,7 +42,7 @@ mpy_cross_cmd = ['make', '-C', 'lib/micropython/mpy-cross']
 rp2_cmd = [
     'make',
     '',
-    f'-j {os.cpu_count()}',
+    f'-j {get_jobs()}',
     '-C',
     'lib/micropython/ports/rp2',
     'LV_PORT=rp2',
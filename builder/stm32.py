@@ -1,6 +1,7 @@
 import os
 import sys
 from . import spawn
+from . import get_jobs
 from . import generate_manifest
 from . import update_mphalport
 
@@ -19,7 +20,7 @@ mpy_cross_cmd = ['make', '-C', 'lib/micropython/mpy-cross']
 stm32_cmd = [
     'make',
     '',
-    f'-j {os.cpu_count()}',
+    f'-j {get_jobs()}',
     '-C',
     'lib/micropython/ports/stm32',
     'LV_PORT=stm32'
@@ -2,6 +2,7 @@ import sys
 import os
 from argparse import ArgumentParser
 from . import spawn
+from . import get_jobs
 from . import generate_manifest
 from . import update_mphalport
 from . import setup_windows_build
@@ -150,7 +151,7 @@ def build_sdl():
     os.chdir(dst)
     cmd_ = [
         f'cmake -DSDL_STATIC=ON -DSDL_SHARED=OFF -DCMAKE_BUILD_TYPE=Release {SCRIPT_PATH}/lib/SDL &&'
-        f'cmake --build . --config Release --parallel {os.cpu_count()}'
+        f'cmake --build . --config Release --parallel {get_jobs()}'
     ]
 
     res, _ = spawn(cmd_, cmpl=True)
@@ -25,9 +25,14 @@ _PinType = Union[machine.Pin, int, io_expander_framework.Pin]
 _DatabusType = Union[lcd_bus.I80Bus, lcd_bus.I2CBus, lcd_bus.RGBBus, lcd_bus.SPIBus, lcd_bus.SDLBus]
 
 
+def pack_params_sequence(commands: List[Tuple[int, Optional[_BufferType], int]]) -> bytes:
+    ...
+
+
 class DisplayDriver:
     _INVON: ClassVar[int] = ...
     _INVOFF: ClassVar[int] = ...
+    _RAMWRC: ClassVar[Optional[int]] = ...
 
     # MADCTL values for each of the orientation constants for non-st7789 displays.
     _ORIENTATION_TABLE: ClassVar[Tuple[int, int, int, int]] = ...
@@ -47,6 +52,7 @@ class DisplayDriver:
     _data_bus: _DatabusType = ...
     _param_buf: bytearray = ...
     _param_mv: memoryview = ...
+    _color_view: lv.C_Buffer = ...  # NOQA
     _disp_drv: lv.display_driver_t = ...  # NOQA
     _color_byte_order: int = ...
     _color_space: int = ...
@@ -56,6 +62,10 @@ class DisplayDriver:
     _frame_buffer1: Optional[_BufferType] = ...
     _frame_buffer2: Optional[_BufferType] = ...
     _backup_set_memory_location: Optional[Callable] = ...
+    _static_memory_location: bool = ...
+    _native_flush: bool = ...
+    _window: List[int] = ...
+    _window_stats: List[int] = ...
     _rotation: int = ...
     _spi_3wire: lcd_bus.SPI3Wire = None
 
@@ -241,9 +251,18 @@ class DisplayDriver:
     def init(self) -> None:
         ...
 
+    def set_native_flush(self, value: bool) -> None:
+        ...
+
+    def get_native_flush(self) -> bool:
+        ...
+
     def set_params(self, cmd: int, params: Optional[_BufferType] = None) -> None:
         ...
 
+    def set_params_sequence(self, sequence: _BufferType) -> None:
+        ...
+
     def get_params(self, cmd: int, params: _BufferType) -> None:
         ...
 
@@ -271,6 +290,22 @@ class DisplayDriver:
     def _dummy_set_memory_location(self, *_, **__) -> int:  # NOQA
         ...
 
+    def _invalidate_window(self) -> None:
+        ...
+
+    def get_window_stats(self) -> dict:
+        """
+        Window commands skipped because the window didn't change.
+
+        * commands_saved: CASET/RASET commands that were not sent
+        * bytes_saved: bytes those commands would have used
+        * continued: flushes sent as a continuation of the flush before them
+        """
+        ...
+
+    def reset_window_stats(self) -> None:
+        ...
+
     # this function is handeled in the viper code emitter. This will
     # increase the performance to near C code execution times. While this is
     # not really heavy lifting in terms of work being done every cycle counts
@@ -0,0 +1,93 @@
+from typing import ClassVar, Optional, Tuple
+
+
+class Device(object):
+    """
+    Linux evdev input device reader for the unix port.
+
+    `read` drains all of the pending events with a single read and folds
+    them into a state in C. The state is only updated when a SYN_REPORT is
+    received so it is always a complete frame. Key presses are queued, up
+    to 32 of them.
+    """
+    BUTTON_LEFT: ClassVar[int] = ...
+    BUTTON_RIGHT: ClassVar[int] = ...
+    BUTTON_MIDDLE: ClassVar[int] = ...
+    BUTTON_SIDE: ClassVar[int] = ...
+    BUTTON_EXTRA: ClassVar[int] = ...
+    BUTTON_TOUCH: ClassVar[int] = ...
+
+    ABS_X: ClassVar[int] = ...
+    ABS_Y: ClassVar[int] = ...
+    ABS_MT_POSITION_X: ClassVar[int] = ...
+    ABS_MT_POSITION_Y: ClassVar[int] = ...
+
+    MAX_SLOTS: ClassVar[int] = ...
+
+    x: int = ...
+    y: int = ...
+    buttons: int = ...
+    pressed: bool = ...
+    touch_count: int = ...
+
+    def __init__(self, path: str, /, *, grab: bool = False):
+        """
+        :param path: path to the event device, `/dev/input/eventN`
+        :param grab: get exclusive access to the device
+        """
+        ...
+
+    def read(self) -> int:
+        """
+        Reads all of the pending events without blocking
+
+        :return: the number of complete frames (SYN_REPORT) that were read
+        """
+        ...
+
+    def take_rel(self) -> Tuple[int, int]:
+        """
+        Returns the relative motion since the last call and resets it
+        """
+        ...
+
+    def take_wheel(self) -> Tuple[int, int]:
+        """
+        Returns the (horizontal, vertical) wheel motion since the last call
+        and resets it
+        """
+        ...
+
+    def get_key(self) -> Optional[Tuple[int, int]]:
+        """
+        Pops the oldest queued key event
+
+        :return: `None` if there are no key events or a tuple of
+                 (keycode, value). value is 0 for release, 1 for press and
+                 2 for repeat.
+        """
+        ...
+
+    def slot(self, index: int, /) -> Optional[Tuple[int, int]]:
+        """
+        Returns the (x, y) of a multi touch slot or `None` if it is not down
+        """
+        ...
+
+    def abs_range(self, axis: int, /) -> Tuple[int, int]:
+        """
+        Returns the (minimum, maximum) of an absolute axis
+        """
+        ...
+
+    def grab(self, grab: bool, /) -> None:
+        ...
+
+    def get_name(self) -> str:
+        ...
+
+    def fileno(self) -> int:
+        ...
+
+    def close(self) -> None:
+        ...
@@ -0,0 +1,11 @@
+################################################################################
+# evdev build rules
+
+MOD_DIR := $(USERMOD_DIR)
+
+# evdev only exists on Linux
+ifneq (,$(findstring unix, $(LV_PORT)))
+    ifeq ($(shell uname -s),Linux)
+        SRC_USERMOD_C += $(MOD_DIR)/modevdev.c
+    endif
+endif
@@ -0,0 +1,599 @@
+// Linux evdev input reader for the unix port.
+//
+// A Device drains every pending input_event from the device node with a
+// single read() into a buffer that is part of the object and folds the
+// events into a state structure in C. The state is only published when the
+// kernel sends SYN_REPORT so the drivers always see a complete frame. The
+// position, buttons, touch slots, relative motion and wheel are coalesced,
+// key presses are queued so none of them get lost between two indev reads.
+// Nothing is allocated per event.
+
+#include <errno.h>
+#include <fcntl.h>
+#include <stdint.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/ioctl.h>
+#include <linux/input.h>
+
+#include "py/obj.h"
+#include "py/runtime.h"
+#include "py/mperrno.h"
+
+
+#define EVDEV_READ_COUNT  (64)
+#define EVDEV_MAX_SLOTS   (10)
+#define EVDEV_KEY_QUEUE   (32)
+
+#define EVDEV_BUTTON_LEFT    (1 << 0)
+#define EVDEV_BUTTON_RIGHT   (1 << 1)
+#define EVDEV_BUTTON_MIDDLE  (1 << 2)
+#define EVDEV_BUTTON_SIDE    (1 << 3)
+#define EVDEV_BUTTON_EXTRA   (1 << 4)
+#define EVDEV_BUTTON_TOUCH   (1 << 5)
+
+
+typedef struct _evdev_slot_t {
+    int32_t x;
+    int32_t y;
+    bool active;
+} evdev_slot_t;
+
+
+typedef struct _evdev_state_t {
+    int32_t x;
+    int32_t y;
+    uint32_t buttons;
+    int32_t rel_x;
+    int32_t rel_y;
+    int32_t wheel_h;
+    int32_t wheel_v;
+    evdev_slot_t slots[EVDEV_MAX_SLOTS];
+} evdev_state_t;
+
+
+typedef struct _evdev_key_t {
+    uint16_t code;
+    int16_t value;
+} evdev_key_t;
+
+
+typedef struct _mp_evdev_obj_t {
+    mp_obj_base_t base;
+    int fd;
+
+    // state being built from the events of the current frame
+    evdev_state_t pending;
+    // state as of the last SYN_REPORT
+    evdev_state_t state;
+
+    uint8_t slot;
+    bool has_abs_xy;
+    // the kernel dropped events, ignore everything until the next
+    // SYN_REPORT and then resync from the device
+    bool dropped;
+
+    evdev_key_t keys[EVDEV_KEY_QUEUE];
+    uint8_t key_head;
+    uint8_t key_count;
+
+    struct input_event events[EVDEV_READ_COUNT];
+} mp_evdev_obj_t;
+
+const mp_obj_type_t mp_evdev_type;
+
+
+static mp_evdev_obj_t *evdev_get(mp_obj_t self_in)
+{
+    mp_evdev_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    if (self->fd < 0) {
+        mp_raise_OSError(MP_EBADF);
+    }
+    return self;
+}
+
+
+static void evdev_push_key(mp_evdev_obj_t *self, uint16_t code, int32_t value)
+{
+    uint8_t index = (self->key_head + self->key_count) % EVDEV_KEY_QUEUE;
+
+    self->keys[index].code = code;
+    self->keys[index].value = (int16_t)value;
+
+    if (self->key_count == EVDEV_KEY_QUEUE) {
+        // full, the oldest key gets dropped
+        self->key_head = (self->key_head + 1) % EVDEV_KEY_QUEUE;
+    } else {
+        self->key_count++;
+    }
+}
+
+
+static uint32_t evdev_button_bit(uint16_t code)
+{
+    switch (code) {
+        case BTN_LEFT: return EVDEV_BUTTON_LEFT;
+        case BTN_RIGHT: return EVDEV_BUTTON_RIGHT;
+        case BTN_MIDDLE: return EVDEV_BUTTON_MIDDLE;
+        case BTN_SIDE: return EVDEV_BUTTON_SIDE;
+        case BTN_EXTRA: return EVDEV_BUTTON_EXTRA;
+        case BTN_TOUCH: return EVDEV_BUTTON_TOUCH;
+        default: return 0;
+    }
+}
+
+
+static void evdev_resync(mp_evdev_obj_t *self)
+{
+    evdev_state_t *pending = &self->pending;
+    struct input_absinfo info;
+    uint8_t keys[KEY_MAX / 8 + 1];
+
+    if (ioctl(self->fd, EVIOCGABS(ABS_X), &info) == 0) pending->x = info.value;
+    if (ioctl(self->fd, EVIOCGABS(ABS_Y), &info) == 0) pending->y = info.value;
+
+    pending->buttons = 0;
+    memset(keys, 0, sizeof(keys));
+
+    if (ioctl(self->fd, EVIOCGKEY(sizeof(keys)), keys) >= 0) {
+        static const uint16_t codes[] = { BTN_LEFT, BTN_RIGHT, BTN_MIDDLE, BTN_SIDE, BTN_EXTRA, BTN_TOUCH };
+
+        for (uint8_t i = 0; i < MP_ARRAY_SIZE(codes); i++) {
+            if (keys[codes[i] / 8] & (1 << (codes[i] % 8))) {
+                pending->buttons |= evdev_button_bit(codes[i]);
+            }
+        }
+    }
+
+    // the tracking ids can't be queried without knowing the slot count, the
+    // next events for a slot that is still down will mark it active again
+    for (uint8_t i = 0; i < EVDEV_MAX_SLOTS; i++) pending->slots[i].active = false;
+}
+
+
+static void evdev_commit(mp_evdev_obj_t *self)
+{
+    evdev_state_t *pending = &self->pending;
+    evdev_state_t *state = &self->state;
+
+    // devices that only report multi touch slots don't send ABS_X/ABS_Y,
+    // use the first slot that is down as the pointer position
+    if (!self->has_abs_xy) {
+        for (uint8_t i = 0; i < EVDEV_MAX_SLOTS; i++) {
+            if (pending->slots[i].active) {
+                pending->x = pending->slots[i].x;
+                pending->y = pending->slots[i].y;
+                break;
+            }
+        }
+    }
+
+    // relative motion is accumulated until it is taken by the driver
+    int32_t rel_x = state->rel_x + pending->rel_x;
+    int32_t rel_y = state->rel_y + pending->rel_y;
+    int32_t wheel_h = state->wheel_h + pending->wheel_h;
+    int32_t wheel_v = state->wheel_v + pending->wheel_v;
+
+    *state = *pending;
+    state->rel_x = rel_x;
+    state->rel_y = rel_y;
+    state->wheel_h = wheel_h;
+    state->wheel_v = wheel_v;
+
+    pending->rel_x = 0;
+    pending->rel_y = 0;
+    pending->wheel_h = 0;
+    pending->wheel_v = 0;
+}
+
+
+static void evdev_handle_abs(mp_evdev_obj_t *self, uint16_t code, int32_t value)
+{
+    evdev_state_t *pending = &self->pending;
+
+    switch (code) {
+        case ABS_X:
+            self->has_abs_xy = true;
+            pending->x = value;
+            break;
+        case ABS_Y:
+            self->has_abs_xy = true;
+            pending->y = value;
+            break;
+        case ABS_MT_SLOT:
+            if (value >= 0 && value < EVDEV_MAX_SLOTS) self->slot = (uint8_t)value;
+            else self->slot = EVDEV_MAX_SLOTS;
+            break;
+        case ABS_MT_TRACKING_ID:
+            if (self->slot < EVDEV_MAX_SLOTS) pending->slots[self->slot].active = value >= 0;
+            break;
+        case ABS_MT_POSITION_X:
+            if (self->slot < EVDEV_MAX_SLOTS) pending->slots[self->slot].x = value;
+            break;
+        case ABS_MT_POSITION_Y:
+            if (self->slot < EVDEV_MAX_SLOTS) pending->slots[self->slot].y = value;
+            break;
+        default:
+            break;
+    }
+}
+
+
+static void evdev_handle_rel(mp_evdev_obj_t *self, uint16_t code, int32_t value)
+{
+    evdev_state_t *pending = &self->pending;
+
+    switch (code) {
+        case REL_X:
+            pending->rel_x += value;
+            break;
+        case REL_Y:
+            pending->rel_y += value;
+            break;
+        case REL_HWHEEL:
+            pending->wheel_h += value;
+            break;
+        case REL_WHEEL:
+            pending->wheel_v += value;
+            break;
+        default:
+            break;
+    }
+}
+
+
+static void evdev_handle_key(mp_evdev_obj_t *self, uint16_t code, int32_t value)
+{
+    uint32_t bit = evdev_button_bit(code);
+
+    if (bit) {
+        if (value) self->pending.buttons |= bit;
+        else self->pending.buttons &= ~bit;
+    } else if (code < BTN_MISC || (code >= KEY_OK && code < BTN_DPAD_UP)) {
+        // keyboard keys, repeats (value 2) are queued as well
+        evdev_push_key(self, code, value);
+    }
+}
+
+
+static mp_obj_t mp_evdev_read(mp_obj_t self_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+    mp_int_t frames = 0;
+
+    for (;;) {
+        ssize_t res = read(self->fd, self->events, sizeof(self->events));
+
+        if (res < 0) {
+            if (errno == EINTR) continue;
+            if (errno == EAGAIN) break;
+            mp_raise_OSError(errno);
+        }
+
+        size_t count = (size_t)res / sizeof(struct input_event);
+
+        for (size_t i = 0; i < count; i++) {
+            struct input_event *ev = &self->events[i];
+
+            if (ev->type == EV_SYN) {
+                if (ev->code == SYN_DROPPED) {
+                    self->dropped = true;
+                } else if (ev->code == SYN_REPORT) {
+                    if (self->dropped) {
+                        self->dropped = false;
+                        evdev_resync(self);
+                    }
+                    evdev_commit(self);
+                    frames++;
+                }
+                continue;
+            }
+
+            if (self->dropped) continue;
+
+            switch (ev->type) {
+                case EV_ABS:
+                    evdev_handle_abs(self, ev->code, ev->value);
+                    break;
+                case EV_REL:
+                    evdev_handle_rel(self, ev->code, ev->value);
+                    break;
+                case EV_KEY:
+                    evdev_handle_key(self, ev->code, ev->value);
+                    break;
+                default:
+                    break;
+            }
+        }
+
+        // a short read means the queue has been drained
+        if (count < EVDEV_READ_COUNT) break;
+    }
+
+    return mp_obj_new_int(frames);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_evdev_read_obj, mp_evdev_read);
+
+
+static mp_obj_t mp_evdev_take_rel(mp_obj_t self_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+
+    mp_obj_t items[2] = {
+        mp_obj_new_int(self->state.rel_x),
+        mp_obj_new_int(self->state.rel_y)
+    };
+
+    self->state.rel_x = 0;
+    self->state.rel_y = 0;
+
+    return mp_obj_new_tuple(2, items);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_evdev_take_rel_obj, mp_evdev_take_rel);
+
+
+static mp_obj_t mp_evdev_take_wheel(mp_obj_t self_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+
+    mp_obj_t items[2] = {
+        mp_obj_new_int(self->state.wheel_h),
+        mp_obj_new_int(self->state.wheel_v)
+    };
+
+    self->state.wheel_h = 0;
+    self->state.wheel_v = 0;
+
+    return mp_obj_new_tuple(2, items);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_evdev_take_wheel_obj, mp_evdev_take_wheel);
+
+
+static mp_obj_t mp_evdev_get_key(mp_obj_t self_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+
+    if (self->key_count == 0) return mp_const_none;
+
+    evdev_key_t *key = &self->keys[self->key_head];
+    self->key_head = (self->key_head + 1) % EVDEV_KEY_QUEUE;
+    self->key_count--;
+
+    mp_obj_t items[2] = {
+        MP_OBJ_NEW_SMALL_INT(key->code),
+        MP_OBJ_NEW_SMALL_INT(key->value)
+    };
+
+    return mp_obj_new_tuple(2, items);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_evdev_get_key_obj, mp_evdev_get_key);
+
+
+static mp_obj_t mp_evdev_slot(mp_obj_t self_in, mp_obj_t index_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+    mp_int_t index = mp_obj_get_int(index_in);
+
+    if (index < 0 || index >= EVDEV_MAX_SLOTS || !self->state.slots[index].active) {
+        return mp_const_none;
+    }
+
+    mp_obj_t items[2] = {
+        mp_obj_new_int(self->state.slots[index].x),
+        mp_obj_new_int(self->state.slots[index].y)
+    };
+
+    return mp_obj_new_tuple(2, items);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_2(mp_evdev_slot_obj, mp_evdev_slot);
+
+
+static mp_obj_t mp_evdev_abs_range(mp_obj_t self_in, mp_obj_t axis_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+    struct input_absinfo info;
+
+    if (ioctl(self->fd, EVIOCGABS(mp_obj_get_int(axis_in)), &info) < 0) {
+        mp_raise_OSError(errno);
+    }
+
+    mp_obj_t items[2] = {
+        mp_obj_new_int(info.minimum),
+        mp_obj_new_int(info.maximum)
+    };
+
+    return mp_obj_new_tuple(2, items);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_2(mp_evdev_abs_range_obj, mp_evdev_abs_range);
+
+
+static mp_obj_t mp_evdev_grab(mp_obj_t self_in, mp_obj_t grab_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+
+    if (ioctl(self->fd, EVIOCGRAB, (void *)(intptr_t)mp_obj_is_true(grab_in)) < 0) {
+        mp_raise_OSError(errno);
+    }
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_2(mp_evdev_grab_obj, mp_evdev_grab);
+
+
+static mp_obj_t mp_evdev_get_name(mp_obj_t self_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+    char name[256];
+
+    int len = ioctl(self->fd, EVIOCGNAME(sizeof(name)), name);
+    if (len < 0) {
+        mp_raise_OSError(errno);
+    }
+
+    return mp_obj_new_str(name, strnlen(name, (size_t)len));
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_evdev_get_name_obj, mp_evdev_get_name);
+
+
+static mp_obj_t mp_evdev_fileno(mp_obj_t self_in)
+{
+    mp_evdev_obj_t *self = evdev_get(self_in);
+    return MP_OBJ_NEW_SMALL_INT(self->fd);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_evdev_fileno_obj, mp_evdev_fileno);
+
+
+static mp_obj_t mp_evdev_close(mp_obj_t self_in)
+{
+    mp_evdev_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    if (self->fd >= 0) {
+        close(self->fd);
+        self->fd = -1;
+    }
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_evdev_close_obj, mp_evdev_close);
+
+
+static void mp_evdev_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest)
+{
+    if (dest[0] != MP_OBJ_NULL) return;
+
+    mp_evdev_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    evdev_state_t *state = &self->state;
+
+    switch (attr) {
+        case MP_QSTR_x:
+            dest[0] = mp_obj_new_int(state->x);
+            return;
+        case MP_QSTR_y:
+            dest[0] = mp_obj_new_int(state->y);
+            return;
+        case MP_QSTR_buttons:
+            dest[0] = MP_OBJ_NEW_SMALL_INT(state->buttons);
+            return;
+        case MP_QSTR_pressed: {
+            bool pressed = (state->buttons & (EVDEV_BUTTON_TOUCH | EVDEV_BUTTON_LEFT)) != 0;
+
+            for (uint8_t i = 0; !pressed && i < EVDEV_MAX_SLOTS; i++) {
+                pressed = state->slots[i].active;
+            }
+
+            dest[0] = mp_obj_new_bool(pressed);
+            return;
+        }
+        case MP_QSTR_touch_count: {
+            mp_int_t count = 0;
+
+            for (uint8_t i = 0; i < EVDEV_MAX_SLOTS; i++) {
+                if (state->slots[i].active) count++;
+            }
+
+            dest[0] = MP_OBJ_NEW_SMALL_INT(count);
+            return;
+        }
+        default:
+            // continue lookup in locals_dict
+            dest[1] = MP_OBJ_SENTINEL;
+            return;
+    }
+}
+
+
+static mp_obj_t mp_evdev_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *all_args)
+{
+    enum { ARG_path, ARG_grab };
+    static const mp_arg_t allowed_args[] = {
+        { MP_QSTR_path, MP_ARG_OBJ | MP_ARG_REQUIRED },
+        { MP_QSTR_grab, MP_ARG_BOOL | MP_ARG_KW_ONLY, { .u_bool = false } },
+    };
+
+    mp_arg_val_t args[MP_ARRAY_SIZE(allowed_args)];
+    mp_arg_parse_all_kw_array(n_args, n_kw, all_args, MP_ARRAY_SIZE(allowed_args), allowed_args, args);
+
+    const char *path = mp_obj_str_get_str(args[ARG_path].u_obj);
+
+    int fd = open(path, O_RDONLY | O_NONBLOCK | O_CLOEXEC);
+    if (fd < 0) {
+        mp_raise_OSError(errno);
+    }
+
+    mp_evdev_obj_t *self = m_new0(mp_evdev_obj_t, 1);
+    self->base.type = &mp_evdev_type;
+    self->fd = fd;
+
+    // start from the state the device is in right now
+    evdev_resync(self);
+    self->state = self->pending;
+
+    if (args[ARG_grab].u_bool) {
+        mp_evdev_grab(MP_OBJ_FROM_PTR(self), mp_const_true);
+    }
+
+    return MP_OBJ_FROM_PTR(self);
+}
+
+
+static const mp_rom_map_elem_t mp_evdev_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR_read),          MP_ROM_PTR(&mp_evdev_read_obj)       },
+    { MP_ROM_QSTR(MP_QSTR_take_rel),      MP_ROM_PTR(&mp_evdev_take_rel_obj)   },
+    { MP_ROM_QSTR(MP_QSTR_take_wheel),    MP_ROM_PTR(&mp_evdev_take_wheel_obj) },
+    { MP_ROM_QSTR(MP_QSTR_get_key),       MP_ROM_PTR(&mp_evdev_get_key_obj)    },
+    { MP_ROM_QSTR(MP_QSTR_slot),          MP_ROM_PTR(&mp_evdev_slot_obj)       },
+    { MP_ROM_QSTR(MP_QSTR_abs_range),     MP_ROM_PTR(&mp_evdev_abs_range_obj)  },
+    { MP_ROM_QSTR(MP_QSTR_grab),          MP_ROM_PTR(&mp_evdev_grab_obj)       },
+    { MP_ROM_QSTR(MP_QSTR_get_name),      MP_ROM_PTR(&mp_evdev_get_name_obj)   },
+    { MP_ROM_QSTR(MP_QSTR_fileno),        MP_ROM_PTR(&mp_evdev_fileno_obj)     },
+    { MP_ROM_QSTR(MP_QSTR_close),         MP_ROM_PTR(&mp_evdev_close_obj)      },
+    { MP_ROM_QSTR(MP_QSTR_BUTTON_LEFT),   MP_ROM_INT(EVDEV_BUTTON_LEFT)        },
+    { MP_ROM_QSTR(MP_QSTR_BUTTON_RIGHT),  MP_ROM_INT(EVDEV_BUTTON_RIGHT)       },
+    { MP_ROM_QSTR(MP_QSTR_BUTTON_MIDDLE), MP_ROM_INT(EVDEV_BUTTON_MIDDLE)      },
+    { MP_ROM_QSTR(MP_QSTR_BUTTON_SIDE),   MP_ROM_INT(EVDEV_BUTTON_SIDE)        },
+    { MP_ROM_QSTR(MP_QSTR_BUTTON_EXTRA),  MP_ROM_INT(EVDEV_BUTTON_EXTRA)       },
+    { MP_ROM_QSTR(MP_QSTR_BUTTON_TOUCH),  MP_ROM_INT(EVDEV_BUTTON_TOUCH)       },
+    { MP_ROM_QSTR(MP_QSTR_ABS_X),         MP_ROM_INT(ABS_X)                    },
+    { MP_ROM_QSTR(MP_QSTR_ABS_Y),         MP_ROM_INT(ABS_Y)                    },
+    { MP_ROM_QSTR(MP_QSTR_ABS_MT_POSITION_X), MP_ROM_INT(ABS_MT_POSITION_X)    },
+    { MP_ROM_QSTR(MP_QSTR_ABS_MT_POSITION_Y), MP_ROM_INT(ABS_MT_POSITION_Y)    },
+    { MP_ROM_QSTR(MP_QSTR_MAX_SLOTS),     MP_ROM_INT(EVDEV_MAX_SLOTS)          },
+};
+
+static MP_DEFINE_CONST_DICT(mp_evdev_locals_dict, mp_evdev_locals_dict_table);
+
+
+MP_DEFINE_CONST_OBJ_TYPE(
+    mp_evdev_type,
+    MP_QSTR_Device,
+    MP_TYPE_FLAG_NONE,
+    make_new, mp_evdev_make_new,
+    attr, mp_evdev_attr,
+    locals_dict, &mp_evdev_locals_dict
+);
+
+
+static const mp_rom_map_elem_t mp_module_evdev_globals_table[] = {
+    { MP_ROM_QSTR(MP_QSTR___name__), MP_OBJ_NEW_QSTR(MP_QSTR_evdev) },
+    { MP_ROM_QSTR(MP_QSTR_Device),   MP_ROM_PTR(&mp_evdev_type)     },
+};
+
+static MP_DEFINE_CONST_DICT(mp_module_evdev_globals, mp_module_evdev_globals_table);
+
+
+const mp_obj_module_t mp_module_evdev = {
+    .base    = {&mp_type_module},
+    .globals = (mp_obj_dict_t *)&mp_module_evdev_globals,
+};
+
+MP_REGISTER_MODULE(MP_QSTR_evdev, mp_module_evdev);
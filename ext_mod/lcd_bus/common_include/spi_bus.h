@@ -65,6 +65,7 @@
 
             void *buf1;
             void *buf2;
+            uint32_t buffer_flags;
 
             bool trans_done;
             bool rgb565_byte_swap;
@@ -379,7 +379,9 @@
 
         self->write_color(self, color, color_size);
 
-        if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
+        if (lcd_panel_io_native_flush_ready(obj)) {
+            // flush_ready has already been called on the display
+        } else if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
             mp_call_function_n_kw(self->callback, 0, 0, NULL);
         }
         self->trans_done = true;
@@ -374,7 +374,11 @@ static const mp_rom_map_elem_t mp_lcd_spi_bus_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_allocate_framebuffer), MP_ROM_PTR(&mp_lcd_bus_allocate_framebuffer_obj) },
     { MP_ROM_QSTR(MP_QSTR_free_framebuffer),     MP_ROM_PTR(&mp_lcd_bus_free_framebuffer_obj)     },
     { MP_ROM_QSTR(MP_QSTR_register_callback),    MP_ROM_PTR(&mp_lcd_bus_register_callback_obj)    },
+    { MP_ROM_QSTR(MP_QSTR_register_native_flush), MP_ROM_PTR(&mp_lcd_bus_register_native_flush_obj) },
+    { MP_ROM_QSTR(MP_QSTR_get_window_stats),     MP_ROM_PTR(&mp_lcd_bus_get_window_stats_obj)     },
+    { MP_ROM_QSTR(MP_QSTR_reset_window_stats),   MP_ROM_PTR(&mp_lcd_bus_reset_window_stats_obj)   },
     { MP_ROM_QSTR(MP_QSTR_tx_param),             MP_ROM_PTR(&mp_lcd_bus_tx_param_obj)             },
+    { MP_ROM_QSTR(MP_QSTR_tx_param_sequence),    MP_ROM_PTR(&mp_lcd_bus_tx_param_sequence_obj)    },
     { MP_ROM_QSTR(MP_QSTR_tx_color),             MP_ROM_PTR(&mp_lcd_bus_tx_color_obj)             },
     { MP_ROM_QSTR(MP_QSTR_rx_param),             MP_ROM_PTR(&mp_lcd_bus_rx_param_obj)             },
     { MP_ROM_QSTR(MP_QSTR_init),                 MP_ROM_PTR(&mp_lcd_bus_init_obj)                 },
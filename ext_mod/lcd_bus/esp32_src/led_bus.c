@@ -6,7 +6,9 @@ static bool led_rmt_bus_trans_done_cb(rmt_channel_handle_t tx_chan, const rmt_tx
     LCD_UNUSED(tx_chan);
     LCD_UNUSED(edata);
 
-    if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
+    if (lcd_panel_io_native_flush_ready(MP_OBJ_FROM_PTR(self))) {
+        // flush_ready has already been called on the display
+    } else if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
         cb_isr(self->callback);
     }
     self->trans_done = true;
@@ -548,7 +550,11 @@ static const mp_rom_map_elem_t mp_lcd_led_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_allocate_framebuffer), MP_ROM_PTR(&mp_lcd_bus_allocate_framebuffer_obj) },
     { MP_ROM_QSTR(MP_QSTR_free_framebuffer),     MP_ROM_PTR(&mp_lcd_bus_free_framebuffer_obj)     },
     { MP_ROM_QSTR(MP_QSTR_register_callback),    MP_ROM_PTR(&mp_lcd_bus_register_callback_obj)    },
+    { MP_ROM_QSTR(MP_QSTR_register_native_flush), MP_ROM_PTR(&mp_lcd_bus_register_native_flush_obj) },
+    { MP_ROM_QSTR(MP_QSTR_get_window_stats),     MP_ROM_PTR(&mp_lcd_bus_get_window_stats_obj)     },
+    { MP_ROM_QSTR(MP_QSTR_reset_window_stats),   MP_ROM_PTR(&mp_lcd_bus_reset_window_stats_obj)   },
     { MP_ROM_QSTR(MP_QSTR_tx_param),             MP_ROM_PTR(&mp_lcd_bus_tx_param_obj)             },
+    { MP_ROM_QSTR(MP_QSTR_tx_param_sequence),    MP_ROM_PTR(&mp_lcd_bus_tx_param_sequence_obj)    },
     { MP_ROM_QSTR(MP_QSTR_tx_color),             MP_ROM_PTR(&mp_lcd_bus_tx_color_obj)             },
     { MP_ROM_QSTR(MP_QSTR_rx_param),             MP_ROM_PTR(&mp_lcd_bus_rx_param_obj)             },
     { MP_ROM_QSTR(MP_QSTR_init),                 MP_ROM_PTR(&mp_lcd_bus_init_obj)                 },
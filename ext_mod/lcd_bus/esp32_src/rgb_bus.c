@@ -57,7 +57,9 @@
         mp_lcd_rgb_bus_obj_t *self = (mp_lcd_rgb_bus_obj_t *)user_ctx;
 
         if (!self->trans_done && rgb_panel->fbs[rgb_panel->cur_fb_index] == self->transmitting_buf) {
-           if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
+           if (lcd_panel_io_native_flush_ready(MP_OBJ_FROM_PTR(self))) {
+               // flush_ready has already been called on the display
+           } else if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
                cb_isr(self->callback);
            }
            self->trans_done = true;
@@ -163,6 +163,37 @@ mp_obj_t mp_lcd_spi_3wire_tx_param(size_t n_args, const mp_obj_t *pos_args, mp_m
 MP_DEFINE_CONST_FUN_OBJ_KW(mp_lcd_spi_3wire_tx_param_obj, 2, mp_lcd_spi_3wire_tx_param);
 
 
+static mp_lcd_err_t spi_3wire_tx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size)
+{
+    mp_lcd_spi_3wire_obj_t *self = (mp_lcd_spi_3wire_obj_t *)obj;
+
+    return esp_lcd_panel_io_tx_param(self->panel_io, lcd_cmd, param, param_size);
+}
+
+
+mp_obj_t mp_lcd_spi_3wire_tx_param_sequence(mp_obj_t self_in, mp_obj_t sequence_in)
+{
+    mp_lcd_spi_3wire_obj_t *self = (mp_lcd_spi_3wire_obj_t *)self_in;
+
+    if (self->panel_io != NULL) {
+        mp_buffer_info_t bufinfo;
+        mp_get_buffer_raise(sequence_in, &bufinfo, MP_BUFFER_READ);
+
+        mp_lcd_err_t err = lcd_tx_param_sequence(self_in, (const uint8_t *)bufinfo.buf, (size_t)bufinfo.len, spi_3wire_tx_param);
+
+        if (err == LCD_ERR_INVALID_SIZE) {
+            mp_raise_ValueError(MP_ERROR_TEXT("init sequence is truncated"));
+        } else if (err != 0) {
+            mp_raise_msg_varg(&mp_type_OSError, MP_ERROR_TEXT("%d(esp_lcd_panel_io_tx_param)"), err);
+        }
+    }
+
+    return mp_const_none;
+}
+
+MP_DEFINE_CONST_FUN_OBJ_2(mp_lcd_spi_3wire_tx_param_sequence_obj, mp_lcd_spi_3wire_tx_param_sequence);
+
+
 mp_obj_t mp_lcd_spi_3wire_deinit(mp_obj_t obj)
 {
     mp_lcd_spi_3wire_obj_t *self = (mp_lcd_spi_3wire_obj_t *)obj;
@@ -186,6 +217,7 @@ MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_spi_3wire_deinit_obj, mp_lcd_spi_3wire_deinit);
 static const mp_rom_map_elem_t mp_lcd_spi_3wire_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_init),      MP_ROM_PTR(&mp_lcd_spi_3wire_init_obj)     },
     { MP_ROM_QSTR(MP_QSTR_tx_param),  MP_ROM_PTR(&mp_lcd_spi_3wire_tx_param_obj) },
+    { MP_ROM_QSTR(MP_QSTR_tx_param_sequence), MP_ROM_PTR(&mp_lcd_spi_3wire_tx_param_sequence_obj) },
     { MP_ROM_QSTR(MP_QSTR_deinit),    MP_ROM_PTR(&mp_lcd_spi_3wire_deinit_obj)   },
     { MP_ROM_QSTR(MP_QSTR___del__),   MP_ROM_PTR(&mp_lcd_spi_3wire_deinit_obj)   }
 };
@@ -0,0 +1,484 @@
+/* Headless bus
+ *
+ * Bus that has no display attached to it. Flushed areas get copied into an
+ * in memory frame and the flush ready callback is called right away so any
+ * timing done on the unix port only measures LVGL and the driver framework.
+ * The frame can optionally be written out as raw or PPM files or copied into
+ * an mmap'd file every N frames.
+ */
+
+//local includes
+#include "headless_bus.h"
+#include "lcd_types.h"
+#include "modlcd_bus.h"
+
+// micropython includes
+#include "py/obj.h"
+#include "py/runtime.h"
+#include "py/objarray.h"
+#include "py/binary.h"
+
+#ifdef MP_PORT_UNIX
+    // lvgl includes
+    #include "../../../lib/lvgl/lvgl.h"
+
+    // stdlib includes
+    #include <stdbool.h>
+    #include <stdio.h>
+    #include <string.h>
+    #include <errno.h>
+    #include <fcntl.h>
+    #include <unistd.h>
+    #include <sys/mman.h>
+
+    #define HEADLESS_PATH_MAX  256
+
+    mp_lcd_err_t headless_tx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size);
+    mp_lcd_err_t headless_rx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size);
+    mp_lcd_err_t headless_tx_color(mp_obj_t obj, int lcd_cmd, void *color, size_t color_size, int x_start, int y_start, int x_end, int y_end);
+    mp_lcd_err_t headless_del(mp_obj_t obj);
+    mp_lcd_err_t headless_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits);
+    mp_lcd_err_t headless_get_lane_count(mp_obj_t obj, uint8_t *lane_count);
+
+    static void headless_dump(mp_lcd_headless_bus_obj_t *self);
+
+    // the dump path is allowed to contain a single integer conversion that
+    // gets filled with the frame number, "frame_%05u.ppm" for example.
+    static bool headless_check_path(const char *path)
+    {
+        const char *c = strchr(path, '%');
+
+        if (c == NULL) return true;
+
+        c++;
+        while (*c == '0' || (*c >= '1' && *c <= '9')) c++;
+        if (*c == '\0' || strchr("diuxX", *c) == NULL) return false;
+
+        return strchr(c, '%') == NULL;
+    }
+
+
+    static mp_obj_t mp_lcd_headless_bus_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *all_args)
+    {
+        enum { ARG_dump_path, ARG_dump_format, ARG_dump_every };
+        const mp_arg_t make_new_args[] = {
+            { MP_QSTR_dump_path,     MP_ARG_OBJ | MP_ARG_KW_ONLY, { .u_obj = mp_const_none     } },
+            { MP_QSTR_dump_format,   MP_ARG_INT | MP_ARG_KW_ONLY, { .u_int = HEADLESS_DUMP_RAW } },
+            { MP_QSTR_dump_every,    MP_ARG_INT | MP_ARG_KW_ONLY, { .u_int = 1                 } },
+        };
+
+        mp_arg_val_t args[MP_ARRAY_SIZE(make_new_args)];
+        mp_arg_parse_all_kw_array(
+            n_args,
+            n_kw,
+            all_args,
+            MP_ARRAY_SIZE(make_new_args),
+            make_new_args,
+            args
+        );
+
+        if (args[ARG_dump_format].u_int < HEADLESS_DUMP_RAW || args[ARG_dump_format].u_int > HEADLESS_DUMP_MMAP) {
+            mp_raise_ValueError(MP_ERROR_TEXT("invalid dump_format"));
+        }
+
+        if (args[ARG_dump_every].u_int < 0) {
+            mp_raise_ValueError(MP_ERROR_TEXT("dump_every must be >= 0"));
+        }
+
+        if (args[ARG_dump_path].u_obj != mp_const_none) {
+            const char *path = mp_obj_str_get_str(args[ARG_dump_path].u_obj);
+
+            if (args[ARG_dump_format].u_int == HEADLESS_DUMP_MMAP) {
+                if (strchr(path, '%') != NULL) {
+                    mp_raise_ValueError(MP_ERROR_TEXT("mmap dump_path can not contain a frame number"));
+                }
+            } else if (!headless_check_path(path)) {
+                mp_raise_ValueError(MP_ERROR_TEXT("dump_path can only contain a single integer conversion"));
+            }
+        }
+
+        // create new object
+        mp_lcd_headless_bus_obj_t *self = m_new_obj(mp_lcd_headless_bus_obj_t);
+        self->base.type = &mp_lcd_headless_bus_type;
+
+        self->callback = mp_const_none;
+
+        self->buf1 = NULL;
+        self->buf2 = NULL;
+        self->buffer_flags = 0;
+        self->trans_done = true;
+        self->rgb565_byte_swap = false;
+
+        self->frame = NULL;
+        self->frame_size = 0;
+        self->width = 0;
+        self->height = 0;
+        self->bytes_per_pixel = 0;
+        self->frame_count = 0;
+
+        self->dump_path = args[ARG_dump_path].u_obj;
+        self->dump_format = (uint8_t)args[ARG_dump_format].u_int;
+        self->dump_every = (uint32_t)args[ARG_dump_every].u_int;
+        self->dump_row = NULL;
+        self->dump_map = NULL;
+        self->dump_fd = -1;
+
+        self->panel_io_handle.get_lane_count = headless_get_lane_count;
+        self->panel_io_handle.init = headless_init;
+        self->panel_io_handle.rx_param = headless_rx_param;
+        self->panel_io_handle.tx_param = headless_tx_param;
+        self->panel_io_handle.tx_color = headless_tx_color;
+        self->panel_io_handle.allocate_framebuffer = NULL;
+        self->panel_io_handle.free_framebuffer = NULL;
+        self->panel_io_handle.del = headless_del;
+
+        return MP_OBJ_FROM_PTR(self);
+    }
+
+
+    mp_lcd_err_t headless_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)
+    {
+        LCD_UNUSED(buffer_size);
+        LCD_UNUSED(cmd_bits);
+        LCD_UNUSED(param_bits);
+
+        mp_lcd_headless_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
+
+        if (bpp < 8 || bpp % 8 != 0 || bpp > 32) return LCD_ERR_INVALID_ARG;
+
+        // the swap is kept so the same work gets done that a real
+        // SPI or I8080 display would need.
+        if (bpp == 16) {
+            self->rgb565_byte_swap = rgb565_byte_swap;
+        } else {
+            self->rgb565_byte_swap = false;
+        }
+
+        self->width = width;
+        self->height = height;
+        self->bytes_per_pixel = bpp / 8;
+        self->frame_size = (size_t)width * (size_t)height * (size_t)self->bytes_per_pixel;
+        self->frame_count = 0;
+
+        self->frame = LCD_FB_MALLOC(self->frame_size);
+        if (self->frame == NULL) return LCD_ERR_NO_MEM;
+
+        if (self->dump_path == mp_const_none) return LCD_OK;
+
+        if (self->dump_format == HEADLESS_DUMP_PPM) {
+            self->dump_row = m_malloc((size_t)width * 3);
+        } else if (self->dump_format == HEADLESS_DUMP_MMAP) {
+            const char *path = mp_obj_str_get_str(self->dump_path);
+
+            self->dump_fd = open(path, O_RDWR | O_CREAT | O_TRUNC, 0644);
+            if (self->dump_fd < 0) mp_raise_OSError(errno);
+
+            if (ftruncate(self->dump_fd, (off_t)self->frame_size) != 0) {
+                int err = errno;
+                close(self->dump_fd);
+                self->dump_fd = -1;
+                mp_raise_OSError(err);
+            }
+
+            void *map = mmap(NULL, self->frame_size, PROT_READ | PROT_WRITE, MAP_SHARED, self->dump_fd, 0);
+            if (map == MAP_FAILED) {
+                int err = errno;
+                close(self->dump_fd);
+                self->dump_fd = -1;
+                mp_raise_OSError(err);
+            }
+            self->dump_map = (uint8_t *)map;
+        }
+
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t headless_get_lane_count(mp_obj_t obj, uint8_t *lane_count)
+    {
+        LCD_UNUSED(obj);
+        *lane_count = 1;
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t headless_rx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size)
+    {
+        LCD_UNUSED(obj);
+        LCD_UNUSED(lcd_cmd);
+
+        if (param != NULL) memset(param, 0x00, param_size);
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t headless_tx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size)
+    {
+        LCD_UNUSED(obj);
+        LCD_UNUSED(lcd_cmd);
+        LCD_UNUSED(param);
+        LCD_UNUSED(param_size);
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t headless_tx_color(mp_obj_t obj, int lcd_cmd, void *color, size_t color_size, int x_start, int y_start, int x_end, int y_end)
+    {
+        LCD_UNUSED(lcd_cmd);
+
+        mp_lcd_headless_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
+
+        if (self->frame == NULL) return LCD_ERR_INVALID_STATE;
+
+        // the data is packed, one row of the area after another. Anything
+        // that falls outside of the frame is clipped.
+        int area_w = x_end - x_start + 1;
+        int area_h = y_end - y_start + 1;
+        int x1 = x_start < 0 ? 0 : x_start;
+        int y1 = y_start < 0 ? 0 : y_start;
+        int x2 = x_end >= self->width ? self->width - 1 : x_end;
+        int y2 = y_end >= self->height ? self->height - 1 : y_end;
+
+        if (area_w > 0 && area_h > 0 && x1 <= x2 && y1 <= y2 &&
+                color_size >= (size_t)area_w * (size_t)area_h * self->bytes_per_pixel) {
+
+            uint8_t bpp = self->bytes_per_pixel;
+            size_t src_stride = (size_t)area_w * bpp;
+            size_t dst_stride = (size_t)self->width * bpp;
+            size_t row_size = (size_t)(x2 - x1 + 1) * bpp;
+
+            uint8_t *src = (uint8_t *)color + (size_t)(y1 - y_start) * src_stride + (size_t)(x1 - x_start) * bpp;
+            uint8_t *dst = self->frame + (size_t)y1 * dst_stride + (size_t)x1 * bpp;
+
+            for (int y = y1; y <= y2; y++) {
+                memcpy(dst, src, row_size);
+                src += src_stride;
+                dst += dst_stride;
+            }
+        }
+
+        // a frame is finished on the last flush of a refresh. If tx_color is
+        // called from outside of a refresh every call counts as a frame.
+        lv_display_t *disp = lv_refr_get_disp_refreshing();
+
+        if (disp == NULL || lv_display_flush_is_last(disp)) {
+            self->frame_count++;
+
+            if (self->dump_path != mp_const_none && self->dump_every != 0 &&
+                    self->frame_count % self->dump_every == 0) {
+                headless_dump(self);
+            }
+        }
+
+        // the copy is finished, without a callback tx_color waits on this
+        // before returning.
+        self->trans_done = true;
+
+        if (lcd_panel_io_native_flush_ready(obj)) {
+            // flush_ready has already been called on the display
+        } else if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
+            mp_call_function_n_kw(self->callback, 0, 0, NULL);
+        }
+
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t headless_del(mp_obj_t obj)
+    {
+        mp_lcd_headless_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
+
+        if (self->dump_map != NULL) {
+            munmap(self->dump_map, self->frame_size);
+            self->dump_map = NULL;
+        }
+
+        if (self->dump_fd >= 0) {
+            close(self->dump_fd);
+            self->dump_fd = -1;
+        }
+
+        if (self->dump_row != NULL) {
+            m_free(self->dump_row);
+            self->dump_row = NULL;
+        }
+
+        if (self->frame != NULL) {
+            LCD_FB_FREE(self->frame);
+            self->frame = NULL;
+        }
+
+        return LCD_OK;
+    }
+
+
+    /* frame dumping */
+    static void headless_rgb_row(mp_lcd_headless_bus_obj_t *self, uint8_t *src, uint8_t *dst)
+    {
+        uint16_t px;
+
+        for (uint16_t x = 0; x < self->width; x++) {
+            switch (self->bytes_per_pixel) {
+                case 2:
+                    if (self->rgb565_byte_swap) {
+                        px = (uint16_t)((src[0] << 8) | src[1]);
+                    } else {
+                        px = (uint16_t)((src[1] << 8) | src[0]);
+                    }
+                    dst[0] = (uint8_t)(((px >> 11) & 0x1F) << 3);
+                    dst[1] = (uint8_t)(((px >> 5) & 0x3F) << 2);
+                    dst[2] = (uint8_t)((px & 0x1F) << 3);
+                    dst[0] |= dst[0] >> 5;
+                    dst[1] |= dst[1] >> 6;
+                    dst[2] |= dst[2] >> 5;
+                    break;
+                default:
+                    // LVGL stores RGB888 and (A/X)RGB8888 as B, G, R(, A)
+                    dst[0] = src[2];
+                    dst[1] = src[1];
+                    dst[2] = src[0];
+                    break;
+            }
+            src += self->bytes_per_pixel;
+            dst += 3;
+        }
+    }
+
+
+    static void headless_write_file(mp_lcd_headless_bus_obj_t *self)
+    {
+        char path[HEADLESS_PATH_MAX];
+        const char *fmt = mp_obj_str_get_str(self->dump_path);
+
+        if (strchr(fmt, '%') == NULL) {
+            snprintf(path, sizeof(path), "%s", fmt);
+        } else {
+            #pragma GCC diagnostic push
+            #pragma GCC diagnostic ignored "-Wformat-nonliteral"
+            snprintf(path, sizeof(path), fmt, (unsigned int)self->frame_count);
+            #pragma GCC diagnostic pop
+        }
+
+        int fd = open(path, O_WRONLY | O_CREAT | O_TRUNC, 0644);
+        if (fd < 0) mp_raise_OSError(errno);
+
+        bool ok = true;
+
+        if (self->dump_format == HEADLESS_DUMP_PPM) {
+            char header[32];
+            int header_len;
+            size_t src_stride = (size_t)self->width * self->bytes_per_pixel;
+
+            if (self->bytes_per_pixel == 1) {
+                header_len = snprintf(header, sizeof(header), "P5\n%u %u\n255\n", self->width, self->height);
+            } else {
+                header_len = snprintf(header, sizeof(header), "P6\n%u %u\n255\n", self->width, self->height);
+            }
+
+            ok = write(fd, header, (size_t)header_len) == header_len;
+
+            for (uint16_t y = 0; ok && y < self->height; y++) {
+                uint8_t *src = self->frame + (size_t)y * src_stride;
+
+                if (self->bytes_per_pixel == 1) {
+                    ok = write(fd, src, src_stride) == (ssize_t)src_stride;
+                } else {
+                    headless_rgb_row(self, src, self->dump_row);
+                    ok = write(fd, self->dump_row, (size_t)self->width * 3) == (ssize_t)self->width * 3;
+                }
+            }
+        } else {
+            ok = write(fd, self->frame, self->frame_size) == (ssize_t)self->frame_size;
+        }
+
+        int err = errno;
+        close(fd);
+
+        if (!ok) mp_raise_OSError(err);
+    }
+
+
+    static void headless_dump(mp_lcd_headless_bus_obj_t *self)
+    {
+        if (self->dump_format == HEADLESS_DUMP_MMAP) {
+            if (self->dump_map != NULL) memcpy(self->dump_map, self->frame, self->frame_size);
+        } else {
+            headless_write_file(self);
+        }
+    }
+
+
+    static mp_obj_t mp_lcd_headless_bus_dump(mp_obj_t self_in)
+    {
+        mp_lcd_headless_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        if (self->dump_path == mp_const_none) {
+            mp_raise_ValueError(MP_ERROR_TEXT("no dump_path was given"));
+        }
+
+        if (self->frame == NULL) {
+            mp_raise_msg(&mp_type_RuntimeError, MP_ERROR_TEXT("bus is not initialized"));
+        }
+
+        headless_dump(self);
+        return mp_const_none;
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_headless_bus_dump_obj, mp_lcd_headless_bus_dump);
+
+
+    static mp_obj_t mp_lcd_headless_bus_get_frame(mp_obj_t self_in)
+    {
+        mp_lcd_headless_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        if (self->frame == NULL) return mp_const_none;
+
+        return mp_obj_new_memoryview(BYTEARRAY_TYPECODE, self->frame_size, self->frame);
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_headless_bus_get_frame_obj, mp_lcd_headless_bus_get_frame);
+
+
+    static mp_obj_t mp_lcd_headless_bus_get_frame_count(mp_obj_t self_in)
+    {
+        mp_lcd_headless_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        return mp_obj_new_int_from_uint(self->frame_count);
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_headless_bus_get_frame_count_obj, mp_lcd_headless_bus_get_frame_count);
+
+
+    static const mp_rom_map_elem_t mp_lcd_headless_bus_locals_dict_table[] = {
+        { MP_ROM_QSTR(MP_QSTR_get_lane_count),        MP_ROM_PTR(&mp_lcd_bus_get_lane_count_obj)        },
+        { MP_ROM_QSTR(MP_QSTR_allocate_framebuffer),  MP_ROM_PTR(&mp_lcd_bus_allocate_framebuffer_obj)  },
+        { MP_ROM_QSTR(MP_QSTR_free_framebuffer),      MP_ROM_PTR(&mp_lcd_bus_free_framebuffer_obj)      },
+        { MP_ROM_QSTR(MP_QSTR_register_callback),     MP_ROM_PTR(&mp_lcd_bus_register_callback_obj)     },
+        { MP_ROM_QSTR(MP_QSTR_register_native_flush), MP_ROM_PTR(&mp_lcd_bus_register_native_flush_obj) },
+        { MP_ROM_QSTR(MP_QSTR_get_window_stats),      MP_ROM_PTR(&mp_lcd_bus_get_window_stats_obj)      },
+        { MP_ROM_QSTR(MP_QSTR_reset_window_stats),    MP_ROM_PTR(&mp_lcd_bus_reset_window_stats_obj)    },
+        { MP_ROM_QSTR(MP_QSTR_tx_param),              MP_ROM_PTR(&mp_lcd_bus_tx_param_obj)              },
+        { MP_ROM_QSTR(MP_QSTR_tx_param_sequence),     MP_ROM_PTR(&mp_lcd_bus_tx_param_sequence_obj)     },
+        { MP_ROM_QSTR(MP_QSTR_tx_color),              MP_ROM_PTR(&mp_lcd_bus_tx_color_obj)              },
+        { MP_ROM_QSTR(MP_QSTR_rx_param),              MP_ROM_PTR(&mp_lcd_bus_rx_param_obj)              },
+        { MP_ROM_QSTR(MP_QSTR_init),                  MP_ROM_PTR(&mp_lcd_bus_init_obj)                  },
+        { MP_ROM_QSTR(MP_QSTR_deinit),                MP_ROM_PTR(&mp_lcd_bus_deinit_obj)                },
+        { MP_ROM_QSTR(MP_QSTR___del__),               MP_ROM_PTR(&mp_lcd_bus_deinit_obj)                },
+        { MP_ROM_QSTR(MP_QSTR_dump),                  MP_ROM_PTR(&mp_lcd_headless_bus_dump_obj)         },
+        { MP_ROM_QSTR(MP_QSTR_get_frame),             MP_ROM_PTR(&mp_lcd_headless_bus_get_frame_obj)    },
+        { MP_ROM_QSTR(MP_QSTR_get_frame_count),       MP_ROM_PTR(&mp_lcd_headless_bus_get_frame_count_obj) },
+        { MP_ROM_QSTR(MP_QSTR_DUMP_RAW),              MP_ROM_INT(HEADLESS_DUMP_RAW)                     },
+        { MP_ROM_QSTR(MP_QSTR_DUMP_PPM),              MP_ROM_INT(HEADLESS_DUMP_PPM)                     },
+        { MP_ROM_QSTR(MP_QSTR_DUMP_MMAP),             MP_ROM_INT(HEADLESS_DUMP_MMAP)                    },
+    };
+
+    static MP_DEFINE_CONST_DICT(mp_lcd_headless_bus_locals_dict, mp_lcd_headless_bus_locals_dict_table);
+
+    MP_DEFINE_CONST_OBJ_TYPE(
+        mp_lcd_headless_bus_type,
+        MP_QSTR_HeadlessBus,
+        MP_TYPE_FLAG_NONE,
+        make_new, mp_lcd_headless_bus_make_new,
+        locals_dict, (mp_obj_dict_t *)&mp_lcd_headless_bus_locals_dict
+    );
+#endif
@@ -0,0 +1,49 @@
+#ifndef _HEADLESS_BUS_H_
+    #define _HEADLESS_BUS_H_
+
+    //local_includes
+    #include "modlcd_bus.h"
+
+    // micropython includes
+    #include "py/objarray.h"
+    #include "py/obj.h"
+
+    #define HEADLESS_DUMP_RAW   0
+    #define HEADLESS_DUMP_PPM   1
+    #define HEADLESS_DUMP_MMAP  2
+
+    #ifdef MP_PORT_UNIX
+        typedef struct _mp_lcd_headless_bus_obj_t {
+            mp_obj_base_t base;
+
+            mp_obj_t callback;
+
+            void *buf1;
+            void *buf2;
+            uint32_t buffer_flags;
+
+            bool trans_done;
+            bool rgb565_byte_swap;
+
+            lcd_panel_io_t panel_io_handle;
+
+            /* in memory copy of what would be on the display */
+            uint8_t *frame;
+            size_t frame_size;
+            uint16_t width;
+            uint16_t height;
+            uint8_t bytes_per_pixel;
+            uint32_t frame_count;
+
+            /* frame dumping, dump_path is None when dumping is disabled */
+            mp_obj_t dump_path;
+            uint8_t dump_format;
+            uint32_t dump_every;
+            uint8_t *dump_row;
+            uint8_t *dump_map;
+            int dump_fd;
+        } mp_lcd_headless_bus_obj_t;
+
+        extern const mp_obj_type_t mp_lcd_headless_bus_type;
+    #endif
+#endif /* _HEADLESS_BUS_H_ */
@@ -6,6 +6,15 @@
 #include "py/runtime.h"
 #include "py/objarray.h"
 #include "py/binary.h"
+#include "py/mpstate.h"
+#include "py/mphal.h"
+
+// lvgl includes
+#include "../../lib/lvgl/lvgl.h"
+
+// stdlib includes
+#include <string.h>
+
 
 void rgb565_byte_swap(void *buf, uint32_t buf_size_px)
 {
@@ -86,7 +95,10 @@ void rgb565_byte_swap(void *buf, uint32_t buf_size_px)
     {
         mp_lcd_bus_obj_t *self = (mp_lcd_bus_obj_t *)user_ctx;
 
-        if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
+        if (lcd_panel_io_native_flush_ready(MP_OBJ_FROM_PTR(self))) {
+            // LVGL was told the buffer is free to use, there is no need
+            // to run the Python callback from inside of the ISR
+        } else if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
             cb_isr(self->callback);
         }
         self->trans_done = true;
@@ -184,7 +196,9 @@ void rgb565_byte_swap(void *buf, uint32_t buf_size_px)
 
         mp_lcd_bus_obj_t *self = (mp_lcd_bus_obj_t *)user_ctx;
 
-        if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
+        if (lcd_panel_io_native_flush_ready(MP_OBJ_FROM_PTR(self))) {
+            // flush_ready has already been called on the display
+        } else if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
             mp_call_function_n_kw(self->callback, 0, 0, NULL);
         }
 
@@ -202,10 +216,10 @@ void rgb565_byte_swap(void *buf, uint32_t buf_size_px)
             void *buf = array_buf->items;
 
             if (buf == self->buf1) {
-                m_free(buf);
+                LCD_FB_FREE(buf);
                 self->buf1 = NULL;
             } else if (buf == self->buf2) {
-                m_free(buf);
+                LCD_FB_FREE(buf);
                 self->buf2 = NULL;
             } else {
                 mp_raise_msg(&mp_type_MemoryError, MP_ERROR_TEXT("No matching buffer found"));
@@ -247,6 +261,48 @@ void rgb565_byte_swap(void *buf, uint32_t buf_size_px)
 #endif
 
 
+mp_lcd_err_t lcd_tx_param_sequence(mp_obj_t obj, const uint8_t *seq, size_t seq_len,
+                                   mp_lcd_err_t (*tx_param)(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size))
+{
+    mp_lcd_err_t ret;
+    size_t i = 0;
+
+    // the whole sequence is checked before anything is sent so a truncated
+    // sequence doesn't leave the display half initialized.
+    while (i < seq_len) {
+        if (i + 3 > seq_len || i + 4 + seq[i + 2] > seq_len) return LCD_ERR_INVALID_SIZE;
+        i += 4 + seq[i + 2];
+    }
+
+    i = 0;
+
+    while (i < seq_len) {
+        int lcd_cmd = (int)((seq[i] << 8) | seq[i + 1]);
+        uint8_t param_size = seq[i + 2];
+        uint8_t delay_ms = seq[i + 3 + param_size];
+
+        #if CONFIG_LCD_ENABLE_DEBUG_LOG
+            printf("lcd_tx_param_sequence(self, lcd_cmd=%d, param_size=%d, delay_ms=%d)\n", lcd_cmd, param_size, delay_ms);
+        #endif
+
+        ret = tx_param(obj, lcd_cmd, param_size ? (void *)&seq[i + 3] : NULL, (size_t)param_size);
+        if (ret != LCD_OK) return ret;
+
+        if (delay_ms) mp_hal_delay_ms(delay_ms);
+
+        i += 4 + param_size;
+    }
+
+    return LCD_OK;
+}
+
+
+mp_lcd_err_t lcd_panel_io_tx_param_sequence(mp_obj_t obj, const uint8_t *seq, size_t seq_len)
+{
+    return lcd_tx_param_sequence(obj, seq, seq_len, lcd_panel_io_tx_param);
+}
+
+
 mp_obj_t lcd_panel_io_allocate_framebuffer(mp_obj_t obj, uint32_t size, uint32_t caps)
 {
     mp_lcd_bus_obj_t *self = (mp_lcd_bus_obj_t *)obj;
@@ -260,7 +316,7 @@ mp_obj_t lcd_panel_io_allocate_framebuffer(mp_obj_t obj, uint32_t size, uint32_t
         #endif
         #else
             LCD_UNUSED(caps);
-            void *buf = m_malloc(size);
+            void *buf = LCD_FB_MALLOC(size);
         #endif /* ESP_IDF_VERSION */
         
         if (buf == NULL) {
@@ -276,7 +332,7 @@ mp_obj_t lcd_panel_io_allocate_framebuffer(mp_obj_t obj, uint32_t size, uint32_t
                 #ifdef ESP_IDF_VERSION
                     heap_caps_free(buf);
                 #else
-                    m_free(buf);
+                    LCD_FB_FREE(buf);
                 #endif /* ESP_IDF_VERSION */
 
                 if (self->buf2 == NULL) {
@@ -326,3 +382,276 @@ mp_lcd_err_t lcd_panel_io_get_lane_count(mp_obj_t obj, uint8_t *lane_count)
 
     return self->panel_io_handle.get_lane_count(obj, lane_count);
 }
+
+
+/* native flush
+ *
+ * When a bus has a display registered with it the bus installs a C flush
+ * callback on that display. The callback sets the memory window, sends the
+ * frame buffer and signals LVGL that the buffer is free to use without going
+ * through the Python flush function. The only time Python gets called is if
+ * the display driver has overridden _set_memory_location.
+ *
+ * The registrations are kept in a root pointer so the set_memory_location
+ * callable is not collected while LVGL holds onto the display.
+ *
+ * The last window that was programmed is kept so CASET/RASET only get sent
+ * when the columns or rows change. If the panel supports write memory
+ * continue the rows are opened to the bottom of the display and an area
+ * that starts on the row after the last one and has the same columns is
+ * sent as a continuation of the last transfer without any window commands.
+ * That is what LVGL does when it renders a large area in strips in partial
+ * mode.
+ */
+#define LCD_WINDOW_CMD_SIZE  5  // command + 4 params
+
+typedef struct _lcd_native_flush_t {
+    mp_obj_t bus;
+    lv_display_t *disp;
+    mp_obj_t set_memory_location;
+    int32_t offset_x;
+    int32_t offset_y;
+    bool set_window;
+    bool window_valid;
+    int write_continue;
+    int32_t window[4];  // x1, x2, y1, y2 of the programmed window
+    int32_t next_row;
+    uint32_t cmds_saved;
+    uint32_t bytes_saved;
+    uint32_t continued;
+    uint8_t param_buf[4];
+} lcd_native_flush_t;
+
+MP_REGISTER_ROOT_POINTER(void *lcd_native_flush[LCD_NATIVE_FLUSH_MAX]);
+
+
+static lcd_native_flush_t *native_flush_from_disp(lv_display_t *disp)
+{
+    lcd_native_flush_t *flush;
+
+    for (uint8_t i = 0; i < LCD_NATIVE_FLUSH_MAX; i++) {
+        flush = (lcd_native_flush_t *)MP_STATE_PORT(lcd_native_flush)[i];
+        if (flush != NULL && flush->disp == disp) return flush;
+    }
+    return NULL;
+}
+
+
+static lcd_native_flush_t *native_flush_from_bus(mp_obj_t obj)
+{
+    lcd_native_flush_t *flush;
+
+    for (uint8_t i = 0; i < LCD_NATIVE_FLUSH_MAX; i++) {
+        flush = (lcd_native_flush_t *)MP_STATE_PORT(lcd_native_flush)[i];
+        if (flush != NULL && flush->bus == obj) return flush;
+    }
+    return NULL;
+}
+
+
+static void native_flush_set_window(lcd_native_flush_t *flush, int lcd_cmd, int32_t start, int32_t end)
+{
+    flush->param_buf[0] = (uint8_t)((start >> 8) & 0xFF);
+    flush->param_buf[1] = (uint8_t)(start & 0xFF);
+    flush->param_buf[2] = (uint8_t)((end >> 8) & 0xFF);
+    flush->param_buf[3] = (uint8_t)(end & 0xFF);
+
+    mp_lcd_err_t ret = lcd_panel_io_tx_param(flush->bus, lcd_cmd, flush->param_buf, 4);
+    if (ret != LCD_OK) {
+        mp_raise_msg_varg(&mp_type_OSError, MP_ERROR_TEXT("%d(lcd_panel_io_tx_param)"), ret);
+    }
+}
+
+
+static int native_flush_window(lcd_native_flush_t *flush, int32_t x1, int32_t y1, int32_t x2, int32_t y2)
+{
+    bool same_columns = flush->window_valid && flush->window[0] == x1 && flush->window[1] == x2;
+
+    if (same_columns && flush->write_continue && y1 == flush->next_row && y2 <= flush->window[3]) {
+        flush->next_row = y2 + 1;
+        flush->cmds_saved += 2;
+        flush->bytes_saved += LCD_WINDOW_CMD_SIZE * 2;
+        flush->continued++;
+        return flush->write_continue;
+    }
+
+    // with write continue the rows stay open to the bottom of the display
+    // so the areas rendered below this one can continue the transfer
+    int32_t row_end = y2;
+    if (flush->write_continue) {
+        row_end = lv_display_get_vertical_resolution(flush->disp) - 1 + flush->offset_y;
+        if (row_end < y2) row_end = y2;
+    }
+
+    if (same_columns) {
+        flush->cmds_saved++;
+        flush->bytes_saved += LCD_WINDOW_CMD_SIZE;
+    } else {
+        native_flush_set_window(flush, LCD_CMD_CASET, x1, x2);
+    }
+
+    if (flush->window_valid && flush->window[2] == y1 && flush->window[3] == row_end) {
+        flush->cmds_saved++;
+        flush->bytes_saved += LCD_WINDOW_CMD_SIZE;
+    } else {
+        native_flush_set_window(flush, LCD_CMD_RASET, y1, row_end);
+    }
+
+    flush->window[0] = x1;
+    flush->window[1] = x2;
+    flush->window[2] = y1;
+    flush->window[3] = row_end;
+    flush->window_valid = true;
+    flush->next_row = y2 + 1;
+
+    return LCD_CMD_RAMWR;
+}
+
+
+static void native_flush_cb(lv_display_t *disp, const lv_area_t *area, uint8_t *px_map)
+{
+    lcd_native_flush_t *flush = native_flush_from_disp(disp);
+
+    if (flush == NULL) {
+        lv_display_flush_ready(disp);
+        return;
+    }
+
+    int32_t x1 = area->x1 + flush->offset_x;
+    int32_t x2 = area->x2 + flush->offset_x;
+    int32_t y1 = area->y1 + flush->offset_y;
+    int32_t y2 = area->y2 + flush->offset_y;
+
+    size_t size = (size_t)((x2 - x1 + 1) * (y2 - y1 + 1)) * lv_color_format_get_size(lv_display_get_color_format(disp));
+
+    int lcd_cmd = LCD_CMD_RAMWR;
+
+    if (flush->set_memory_location != mp_const_none) {
+        mp_obj_t args[4] = {
+            mp_obj_new_int(x1),
+            mp_obj_new_int(y1),
+            mp_obj_new_int(x2),
+            mp_obj_new_int(y2)
+        };
+        lcd_cmd = (int)mp_obj_get_int(mp_call_function_n_kw(flush->set_memory_location, 4, 0, args));
+    } else if (flush->set_window) {
+        lcd_cmd = native_flush_window(flush, x1, y1, x2, y2);
+    }
+
+    mp_lcd_err_t ret = lcd_panel_io_tx_color(flush->bus, lcd_cmd, px_map, size, (int)x1, (int)y1, (int)x2, (int)y2);
+
+    if (ret != LCD_OK) {
+        lv_display_flush_ready(disp);
+        mp_raise_msg_varg(&mp_type_OSError, MP_ERROR_TEXT("%d(lcd_panel_io_tx_color)"), ret);
+    }
+}
+
+
+void lcd_panel_io_register_native_flush(mp_obj_t obj, mp_obj_t disp, int32_t offset_x, int32_t offset_y, bool set_window, mp_obj_t set_memory_location, int write_continue)
+{
+    lcd_native_flush_t *flush = native_flush_from_bus(obj);
+
+    if (disp == mp_const_none) {
+        if (flush == NULL) return;
+
+        for (uint8_t i = 0; i < LCD_NATIVE_FLUSH_MAX; i++) {
+            if (MP_STATE_PORT(lcd_native_flush)[i] == flush) {
+                MP_STATE_PORT(lcd_native_flush)[i] = NULL;
+                break;
+            }
+        }
+        m_del_obj(lcd_native_flush_t, flush);
+        return;
+    }
+
+    // the display object passed from Python is a wrapper around the
+    // lv_display_t pointer. The buffer protocol of the wrapper gives
+    // us the pointer.
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(disp, &bufinfo, MP_BUFFER_READ);
+
+    if (bufinfo.len != sizeof(lv_display_t *)) {
+        mp_raise_msg(&mp_type_ValueError, MP_ERROR_TEXT("display object does not represent a pointer"));
+    }
+
+    lv_display_t *lv_disp;
+    memcpy(&lv_disp, bufinfo.buf, sizeof(lv_display_t *));
+
+    if (lv_disp == NULL) {
+        mp_raise_msg(&mp_type_ValueError, MP_ERROR_TEXT("display has been deleted"));
+    }
+
+    if (flush == NULL) {
+        for (uint8_t i = 0; i < LCD_NATIVE_FLUSH_MAX; i++) {
+            if (MP_STATE_PORT(lcd_native_flush)[i] == NULL) {
+                flush = m_new_obj(lcd_native_flush_t);
+                flush->cmds_saved = 0;
+                flush->bytes_saved = 0;
+                flush->continued = 0;
+                MP_STATE_PORT(lcd_native_flush)[i] = flush;
+                break;
+            }
+        }
+
+        if (flush == NULL) {
+            mp_raise_msg_varg(&mp_type_RuntimeError, MP_ERROR_TEXT("Only %d displays can use a native flush"), LCD_NATIVE_FLUSH_MAX);
+        }
+    }
+
+    flush->bus = obj;
+    flush->disp = lv_disp;
+    flush->offset_x = offset_x;
+    flush->offset_y = offset_y;
+    flush->set_window = set_window;
+    flush->set_memory_location = set_memory_location;
+    flush->write_continue = write_continue;
+    flush->window_valid = false;
+
+    lv_display_set_flush_cb(lv_disp, native_flush_cb);
+}
+
+
+// Called when the bus has finished sending a buffer. This can be called from
+// inside of an ISR so no memory is allocated in here.
+bool lcd_panel_io_native_flush_ready(mp_obj_t obj)
+{
+    lcd_native_flush_t *flush = native_flush_from_bus(obj);
+
+    if (flush == NULL) return false;
+
+    lv_display_flush_ready(flush->disp);
+    return true;
+}
+
+
+void lcd_panel_io_invalidate_window(mp_obj_t obj)
+{
+    lcd_native_flush_t *flush = native_flush_from_bus(obj);
+
+    if (flush != NULL) flush->window_valid = false;
+}
+
+
+bool lcd_panel_io_get_window_stats(mp_obj_t obj, uint32_t *cmds_saved, uint32_t *bytes_saved, uint32_t *continued)
+{
+    lcd_native_flush_t *flush = native_flush_from_bus(obj);
+
+    if (flush == NULL) return false;
+
+    *cmds_saved = flush->cmds_saved;
+    *bytes_saved = flush->bytes_saved;
+    *continued = flush->continued;
+    return true;
+}
+
+
+void lcd_panel_io_reset_window_stats(mp_obj_t obj)
+{
+    lcd_native_flush_t *flush = native_flush_from_bus(obj);
+
+    if (flush == NULL) return;
+
+    flush->cmds_saved = 0;
+    flush->bytes_saved = 0;
+    flush->continued = 0;
+}
@@ -40,6 +40,22 @@
         } mp_lcd_err_t;
 
         bool bus_trans_done_cb(lcd_panel_io_t *panel_io, void *edata, void *user_ctx);
+
+        #ifdef MP_PORT_UNIX
+            #include <stdlib.h>
+
+            // frame buffers are kept in the C heap and not the MicroPython heap.
+            // The garbage collector scans every block it can reach for pointers
+            // and scanning the pixel data of a frame buffer is what makes
+            // gc.collect() slow when large buffers are used.
+            #define LCD_FB_MALLOC(size)        calloc(1, (size))
+            #define LCD_FB_REALLOC(buf, size)  realloc((buf), (size))
+            #define LCD_FB_FREE(buf)           free(buf)
+        #else
+            #define LCD_FB_MALLOC(size)        m_malloc(size)
+            #define LCD_FB_REALLOC(buf, size)  m_realloc((buf), (size))
+            #define LCD_FB_FREE(buf)           m_free(buf)
+        #endif
     #endif
 
     struct _lcd_panel_io_t {
@@ -69,6 +85,30 @@
 
     mp_lcd_err_t lcd_panel_io_del(mp_obj_t obj);
 
+    // init sequences are a packed run of records, one for each command
+    //   cmd (2 bytes, big endian), param count (1 byte), params (param count bytes), delay in ms (1 byte)
+    mp_lcd_err_t lcd_panel_io_tx_param_sequence(mp_obj_t obj, const uint8_t *seq, size_t seq_len);
+    mp_lcd_err_t lcd_tx_param_sequence(mp_obj_t obj, const uint8_t *seq, size_t seq_len,
+                                       mp_lcd_err_t (*tx_param)(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size));
+
+    // native flush, the bus writes the frame buffer to the display without
+    // calling into Python for every flush. See lcd_panel_io_register_native_flush
+    #define LCD_NATIVE_FLUSH_MAX  4
+
+    #define LCD_CMD_CASET  0x2A
+    #define LCD_CMD_RASET  0x2B
+    #define LCD_CMD_RAMWR  0x2C
+
+    void lcd_panel_io_register_native_flush(mp_obj_t obj, mp_obj_t disp, int32_t offset_x, int32_t offset_y, bool set_window, mp_obj_t set_memory_location, int write_continue);
+    bool lcd_panel_io_native_flush_ready(mp_obj_t obj);
+
+    // the native flush remembers the last window it programmed and skips the
+    // CASET/RASET commands that would not change it. Any command sent from
+    // Python can change the panel state so it forgets the window.
+    void lcd_panel_io_invalidate_window(mp_obj_t obj);
+    bool lcd_panel_io_get_window_stats(mp_obj_t obj, uint32_t *cmds_saved, uint32_t *bytes_saved, uint32_t *continued);
+    void lcd_panel_io_reset_window_stats(mp_obj_t obj);
+
     typedef struct _mp_lcd_bus_obj_t {
         mp_obj_base_t base;
 
@@ -8,6 +8,7 @@ LVGL_BINDING_DIR = $(subst /ext_mod/lcd_bus,,$(MOD_DIR))
 CFLAGS_USERMOD += -I$(MOD_DIR)
 CFLAGS_USERMOD += -I$(MOD_DIR)/common_include
 CFLAGS_USERMOD += -I$(MOD_DIR)/sdl_bus
+CFLAGS_USERMOD += -I$(MOD_DIR)/headless_bus
 
 ifneq (,$(findstring -Wno-missing-field-initializers, $(CFLAGS_USERMOD)))
     CFLAGS_USERMOD += -Wno-missing-field-initializers
@@ -20,6 +21,7 @@ SRC_USERMOD_C += $(MOD_DIR)/common_src/i80_bus.c
 SRC_USERMOD_C += $(MOD_DIR)/common_src/spi_bus.c
 SRC_USERMOD_C += $(MOD_DIR)/common_src/rgb_bus.c
 SRC_USERMOD_C += $(MOD_DIR)/sdl_bus/sdl_bus.c
+SRC_USERMOD_C += $(MOD_DIR)/headless_bus/headless_bus.c
 
 ifneq (,$(findstring unix, $(LV_PORT)))
     CFLAGS_USERMOD += -DMP_PORT_UNIX=1
@@ -7,6 +7,7 @@
 
 #ifdef MP_PORT_UNIX
     #include "sdl_bus.h"
+    #include "headless_bus.h"
 #endif
 
 // micropython includes
@@ -130,6 +131,8 @@ mp_obj_t mp_lcd_bus_tx_param(size_t n_args, const mp_obj_t *pos_args, mp_map_t *
 
     mp_lcd_err_t ret;
 
+    lcd_panel_io_invalidate_window(args[ARG_self].u_obj);
+
     if (args[ARG_params].u_obj != mp_const_none) {
         mp_buffer_info_t bufinfo;
         mp_get_buffer_raise(args[ARG_params].u_obj, &bufinfo, MP_BUFFER_READ);
@@ -148,6 +151,27 @@ mp_obj_t mp_lcd_bus_tx_param(size_t n_args, const mp_obj_t *pos_args, mp_map_t *
 MP_DEFINE_CONST_FUN_OBJ_KW(mp_lcd_bus_tx_param_obj, 2, mp_lcd_bus_tx_param);
 
 
+mp_obj_t mp_lcd_bus_tx_param_sequence(mp_obj_t self_in, mp_obj_t sequence_in)
+{
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(sequence_in, &bufinfo, MP_BUFFER_READ);
+
+    lcd_panel_io_invalidate_window(self_in);
+
+    mp_lcd_err_t ret = lcd_panel_io_tx_param_sequence(self_in, (const uint8_t *)bufinfo.buf, (size_t)bufinfo.len);
+
+    if (ret == LCD_ERR_INVALID_SIZE) {
+        mp_raise_ValueError(MP_ERROR_TEXT("init sequence is truncated"));
+    } else if (ret != 0) {
+        mp_raise_msg_varg(&mp_type_OSError, MP_ERROR_TEXT("%d(lcd_panel_io_tx_param_sequence)"), ret);
+    }
+
+    return mp_const_none;
+}
+
+MP_DEFINE_CONST_FUN_OBJ_2(mp_lcd_bus_tx_param_sequence_obj, mp_lcd_bus_tx_param_sequence);
+
+
 mp_obj_t mp_lcd_bus_tx_color(size_t n_args, const mp_obj_t *pos_args, mp_map_t *kw_args)
 {
     enum { ARG_self, ARG_cmd, ARG_data, ARG_x_start, ARG_y_start, ARG_x_end, ARG_y_end };
@@ -196,6 +220,8 @@ MP_DEFINE_CONST_FUN_OBJ_KW(mp_lcd_bus_tx_color_obj, 7, mp_lcd_bus_tx_color);
 
 mp_obj_t mp_lcd_bus_deinit(mp_obj_t obj)
 {
+    lcd_panel_io_register_native_flush(obj, mp_const_none, 0, 0, false, mp_const_none, 0);
+
     mp_lcd_err_t ret = lcd_panel_io_del(obj);
     if (ret != 0) {
         mp_raise_msg_varg(&mp_type_ValueError, MP_ERROR_TEXT("%d(lcd_panel_io_del)"), ret);
@@ -253,12 +279,83 @@ mp_obj_t mp_lcd_bus_register_callback(size_t n_args, const mp_obj_t *pos_args, m
 MP_DEFINE_CONST_FUN_OBJ_KW(mp_lcd_bus_register_callback_obj, 2, mp_lcd_bus_register_callback);
 
 
+mp_obj_t mp_lcd_bus_register_native_flush(size_t n_args, const mp_obj_t *pos_args, mp_map_t *kw_args)
+{
+    enum { ARG_self, ARG_disp, ARG_offset_x, ARG_offset_y, ARG_set_window, ARG_set_memory_location, ARG_write_continue };
+    static const mp_arg_t allowed_args[] = {
+        { MP_QSTR_self,                MP_ARG_OBJ  | MP_ARG_REQUIRED, { .u_obj = mp_const_none } },
+        { MP_QSTR_disp,                MP_ARG_OBJ  | MP_ARG_REQUIRED, { .u_obj = mp_const_none } },
+        { MP_QSTR_offset_x,            MP_ARG_INT,                    { .u_int = 0             } },
+        { MP_QSTR_offset_y,            MP_ARG_INT,                    { .u_int = 0             } },
+        { MP_QSTR_set_window,          MP_ARG_BOOL,                   { .u_bool = true         } },
+        { MP_QSTR_set_memory_location, MP_ARG_OBJ,                    { .u_obj = mp_const_none } },
+        { MP_QSTR_write_continue,      MP_ARG_INT,                    { .u_int = 0             } },
+    };
+    mp_arg_val_t args[MP_ARRAY_SIZE(allowed_args)];
+    mp_arg_parse_all(n_args, pos_args, kw_args, MP_ARRAY_SIZE(allowed_args), allowed_args, args);
+
+    if (args[ARG_set_memory_location].u_obj != mp_const_none && !mp_obj_is_callable(args[ARG_set_memory_location].u_obj)) {
+        mp_raise_TypeError(MP_ERROR_TEXT("set_memory_location must be callable"));
+    }
+
+    lcd_panel_io_register_native_flush(
+        args[ARG_self].u_obj,
+        args[ARG_disp].u_obj,
+        (int32_t)args[ARG_offset_x].u_int,
+        (int32_t)args[ARG_offset_y].u_int,
+        (bool)args[ARG_set_window].u_bool,
+        args[ARG_set_memory_location].u_obj,
+        (int)args[ARG_write_continue].u_int
+    );
+
+    return mp_const_none;
+}
+
+MP_DEFINE_CONST_FUN_OBJ_KW(mp_lcd_bus_register_native_flush_obj, 2, mp_lcd_bus_register_native_flush);
+
+
+// (commands saved, bytes saved, continued transfers) of the native flush,
+// None when no display is using a native flush on this bus.
+mp_obj_t mp_lcd_bus_get_window_stats(mp_obj_t self_in)
+{
+    uint32_t cmds_saved;
+    uint32_t bytes_saved;
+    uint32_t continued;
+
+    if (!lcd_panel_io_get_window_stats(self_in, &cmds_saved, &bytes_saved, &continued)) {
+        return mp_const_none;
+    }
+
+    mp_obj_t stats[3] = {
+        mp_obj_new_int_from_uint(cmds_saved),
+        mp_obj_new_int_from_uint(bytes_saved),
+        mp_obj_new_int_from_uint(continued)
+    };
+    return mp_obj_new_tuple(3, stats);
+}
+
+MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_bus_get_window_stats_obj, mp_lcd_bus_get_window_stats);
+
+
+mp_obj_t mp_lcd_bus_reset_window_stats(mp_obj_t self_in)
+{
+    lcd_panel_io_reset_window_stats(self_in);
+    return mp_const_none;
+}
+
+MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_bus_reset_window_stats_obj, mp_lcd_bus_reset_window_stats);
+
+
 static const mp_rom_map_elem_t mp_lcd_bus_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_get_lane_count),       MP_ROM_PTR(&mp_lcd_bus_get_lane_count_obj)       },
     { MP_ROM_QSTR(MP_QSTR_allocate_framebuffer), MP_ROM_PTR(&mp_lcd_bus_allocate_framebuffer_obj) },
     { MP_ROM_QSTR(MP_QSTR_free_framebuffer),     MP_ROM_PTR(&mp_lcd_bus_free_framebuffer_obj)     },
     { MP_ROM_QSTR(MP_QSTR_register_callback),    MP_ROM_PTR(&mp_lcd_bus_register_callback_obj)    },
+    { MP_ROM_QSTR(MP_QSTR_register_native_flush), MP_ROM_PTR(&mp_lcd_bus_register_native_flush_obj) },
+    { MP_ROM_QSTR(MP_QSTR_get_window_stats),     MP_ROM_PTR(&mp_lcd_bus_get_window_stats_obj)     },
+    { MP_ROM_QSTR(MP_QSTR_reset_window_stats),   MP_ROM_PTR(&mp_lcd_bus_reset_window_stats_obj)   },
     { MP_ROM_QSTR(MP_QSTR_tx_param),             MP_ROM_PTR(&mp_lcd_bus_tx_param_obj)             },
+    { MP_ROM_QSTR(MP_QSTR_tx_param_sequence),    MP_ROM_PTR(&mp_lcd_bus_tx_param_sequence_obj)    },
     { MP_ROM_QSTR(MP_QSTR_tx_color),             MP_ROM_PTR(&mp_lcd_bus_tx_color_obj)             },
     { MP_ROM_QSTR(MP_QSTR_rx_param),             MP_ROM_PTR(&mp_lcd_bus_rx_param_obj)             },
     { MP_ROM_QSTR(MP_QSTR_init),                 MP_ROM_PTR(&mp_lcd_bus_init_obj)                 },
@@ -278,6 +375,7 @@ static const mp_map_elem_t mp_module_lcd_bus_globals_table[] = {
 
     #ifdef MP_PORT_UNIX
         { MP_ROM_QSTR(MP_QSTR_SDLBus),         (mp_obj_t)&mp_lcd_sdl_bus_type        },
+        { MP_ROM_QSTR(MP_QSTR_HeadlessBus),    (mp_obj_t)&mp_lcd_headless_bus_type   },
     #endif
     { MP_ROM_QSTR(MP_QSTR_DEBUG_ENABLED),    MP_ROM_INT(LCD_DEBUG) },
 
@@ -11,10 +11,14 @@
     extern const mp_obj_fun_builtin_var_t mp_lcd_bus_init_obj;
     extern const mp_obj_fun_builtin_var_t mp_lcd_bus_get_lane_count_obj;
     extern const mp_obj_fun_builtin_var_t mp_lcd_bus_tx_param_obj;
+    extern const mp_obj_fun_builtin_fixed_t mp_lcd_bus_tx_param_sequence_obj;
     extern const mp_obj_fun_builtin_var_t mp_lcd_bus_tx_color_obj;
     extern const mp_obj_fun_builtin_fixed_t mp_lcd_bus_deinit_obj;
     extern const mp_obj_fun_builtin_var_t mp_lcd_bus_rx_param_obj;
     extern const mp_obj_fun_builtin_var_t mp_lcd_bus_register_callback_obj;
+    extern const mp_obj_fun_builtin_var_t mp_lcd_bus_register_native_flush_obj;
+    extern const mp_obj_fun_builtin_fixed_t mp_lcd_bus_get_window_stats_obj;
+    extern const mp_obj_fun_builtin_fixed_t mp_lcd_bus_reset_window_stats_obj;
     extern const mp_obj_fun_builtin_var_t mp_lcd_bus_free_framebuffer_obj;
     extern const mp_obj_fun_builtin_var_t mp_lcd_bus_allocate_framebuffer_obj;
 
@@ -11,6 +11,7 @@
 #include "py/obj.h"
 #include "modlcd_bus.h"
 #include <stdbool.h>
+#include <string.h>
 #include "sdl_bus.h"
 #include "py/objarray.h"
 #include "py/binary.h"
@@ -105,19 +106,71 @@
 
     mp_lcd_err_t sdl_tx_color(mp_obj_t obj, int lcd_cmd, void *color, size_t color_size, int x_start, int y_start, int x_end, int y_end)
     {
-        LCD_UNUSED(x_start);
-        LCD_UNUSED(y_start);
-        LCD_UNUSED(x_end);
-        LCD_UNUSED(y_end);
-        LCD_UNUSED(color_size);
+        LCD_UNUSED(lcd_cmd);
 
         mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
-        while (!self->trans_done) {}
-        self->trans_done = false;
-        self->panel_io_config.buf_to_flush = color;
-        SDL_UnlockMutex(self->panel_io_config.mutex);
+        panel_io_config_t *config = &self->panel_io_config;
+
+        SDL_Rect area = {
+            .x=x_start,
+            .y=y_start,
+            .w=x_end - x_start + 1,
+            .h=y_end - y_start + 1
+        };
+        SDL_Rect bounds = {
+            .x=0,
+            .y=0,
+            .w=(int)config->width,
+            .h=(int)config->height
+        };
+        SDL_Rect rect;
+
+        SDL_LockMutex(config->mutex);
+
+        // the data is packed, one row of the area after another. It is
+        // copied into the frame at its place on the screen so LVGL can
+        // reuse the buffer as soon as this returns. Anything that falls
+        // outside of the screen is clipped.
+        if (SDL_IntersectRect(&area, &bounds, &rect) &&
+                color_size >= (size_t)area.w * (size_t)area.h * config->bytes_per_pixel) {
+
+            uint8_t bpp = config->bytes_per_pixel;
+            size_t src_stride = (size_t)area.w * bpp;
+            size_t dst_stride = (size_t)config->width * bpp;
+            size_t row_size = (size_t)rect.w * bpp;
+
+            uint8_t *src = (uint8_t *)color + (size_t)(rect.y - y_start) * src_stride + (size_t)(rect.x - x_start) * bpp;
+            uint8_t *dst = config->frame + (size_t)rect.y * dst_stride + (size_t)rect.x * bpp;
 
-        if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
+            for (int y = 0; y < rect.h; y++) {
+                memcpy(dst, src, row_size);
+                src += src_stride;
+                dst += dst_stride;
+            }
+
+            if (config->dirty_count == SDL_BUS_DIRTY_RECT_MAX) {
+                SDL_UnionRect(
+                    &config->dirty_rects[SDL_BUS_DIRTY_RECT_MAX - 1],
+                    &rect,
+                    &config->dirty_rects[SDL_BUS_DIRTY_RECT_MAX - 1]
+                );
+            } else {
+                config->dirty_rects[config->dirty_count] = rect;
+                config->dirty_count++;
+            }
+
+            SDL_CondSignal(config->flush_cond);
+        }
+
+        SDL_UnlockMutex(config->mutex);
+
+        // the area has been copied out of LVGL's buffer, without a callback
+        // tx_color waits on this before returning.
+        self->trans_done = true;
+
+        if (lcd_panel_io_native_flush_ready(obj)) {
+            // flush_ready has already been called on the display
+        } else if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
             mp_call_function_n_kw(self->callback, 0, 0, NULL);
         }
 
@@ -128,14 +181,20 @@
     {
         mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
 
-        self->panel_io_config.buf_to_flush = NULL;
+        SDL_LockMutex(self->panel_io_config.mutex);
+        self->panel_io_config.dirty_count = 0;
         self->panel_io_config.exit_thread = true;
+        SDL_CondSignal(self->panel_io_config.flush_cond);
         SDL_UnlockMutex(self->panel_io_config.mutex);
         SDL_WaitThread(self->panel_io_config.thread, NULL);
 
+        LCD_FB_FREE(self->panel_io_config.frame);
+        self->panel_io_config.frame = NULL;
+
         SDL_DestroyTexture(self->texture);
         SDL_DestroyRenderer(self->renderer);
         SDL_DestroyWindow(self->window);
+        SDL_DestroyCond(self->panel_io_config.flush_cond);
         SDL_DestroyMutex(self->panel_io_config.mutex);
 
         uint8_t i = 0;
@@ -177,7 +236,10 @@
         SDL_StartTextInput();
 
         self->panel_io_config.mutex = SDL_CreateMutex();
-        SDL_LockMutex(self->panel_io_config.mutex);
+        self->panel_io_config.flush_cond = SDL_CreateCond();
+        self->panel_io_config.dirty_count = 0;
+        self->panel_io_config.exit_thread = false;
+
         self->window = SDL_CreateWindow(
             "LVGL MP\0",
             SDL_WINDOWPOS_UNDEFINED,
@@ -190,6 +252,9 @@
         self->renderer = SDL_CreateRenderer(self->window, -1, SDL_RENDERER_SOFTWARE);
 
         self->panel_io_config.bytes_per_pixel = bpp / 8;
+        self->panel_io_config.frame = LCD_FB_MALLOC((size_t)width * (size_t)height * (size_t)(bpp / 8));
+        if (self->panel_io_config.frame == NULL) return LCD_ERR_NO_MEM;
+
         self->texture = SDL_CreateTexture(self->renderer, (SDL_PixelFormatEnum)buffer_size, SDL_TEXTUREACCESS_STREAMING, width, height);
         SDL_SetTextureBlendMode(self->texture, SDL_BLENDMODE_BLEND);
         SDL_SetWindowSize(self->window, width, height);
@@ -218,23 +283,47 @@
 
     int flush_thread(void *self_in) {
         mp_lcd_sdl_bus_obj_t *self = (mp_lcd_sdl_bus_obj_t *)self_in;
-        void* buf;
+        panel_io_config_t *config = &self->panel_io_config;
+        SDL_Rect *rect;
         int pitch;
 
-        while (!self->panel_io_config.exit_thread) {
-            SDL_LockMutex(self->panel_io_config.mutex);
+        SDL_LockMutex(config->mutex);
+
+        while (!config->exit_thread) {
+            // sleep until tx_color hands over dirty areas instead of
+            // spinning on the mutex.
+            if (config->dirty_count == 0) {
+                SDL_CondWait(config->flush_cond, config->mutex);
+                continue;
+            }
 
-            if (self->panel_io_config.buf_to_flush != NULL) {
-                pitch = self->panel_io_config.width * self->panel_io_config.bytes_per_pixel;
-                buf = self->panel_io_config.buf_to_flush;
-                SDL_UpdateTexture(self->texture, NULL, buf, pitch);
-                SDL_RenderClear(self->renderer);
-                SDL_RenderCopy(self->renderer, self->texture, NULL, NULL);
-                SDL_RenderPresent(self->renderer);
+            pitch = config->width * config->bytes_per_pixel;
+
+            // only the areas LVGL has redrawn get copied into the texture.
+            for (uint8_t i = 0; i < config->dirty_count; i++) {
+                rect = &config->dirty_rects[i];
+                SDL_UpdateTexture(
+                    self->texture,
+                    rect,
+                    config->frame + (rect->y * pitch) + (rect->x * config->bytes_per_pixel),
+                    pitch
+                );
             }
 
-            self->trans_done = true;
+            config->dirty_count = 0;
+
+            // presenting can wait on the vsync, tx_color is free to copy
+            // the next areas into the frame while it does.
+            SDL_UnlockMutex(config->mutex);
+
+            SDL_RenderClear(self->renderer);
+            SDL_RenderCopy(self->renderer, self->texture, NULL, NULL);
+            SDL_RenderPresent(self->renderer);
+
+            SDL_LockMutex(config->mutex);
         }
+
+        SDL_UnlockMutex(config->mutex);
         return 0;
     }
 
@@ -327,9 +416,24 @@
 
         mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(args[ARG_self].u_obj);
 
+        SDL_LockMutex(self->panel_io_config.mutex);
+
+        // any pending areas belong to the old window size
+        self->panel_io_config.dirty_count = 0;
+
         self->panel_io_config.width = (uint16_t)args[ARG_width].u_int;
         self->panel_io_config.height = (uint16_t)args[ARG_height].u_int;
 
+        uint8_t *frame = LCD_FB_REALLOC(
+            self->panel_io_config.frame,
+            (size_t)self->panel_io_config.width * (size_t)self->panel_io_config.height * (size_t)self->panel_io_config.bytes_per_pixel
+        );
+        if (frame == NULL) {
+            SDL_UnlockMutex(self->panel_io_config.mutex);
+            mp_raise_msg(&mp_type_MemoryError, MP_ERROR_TEXT("Unable to allocate frame buffer"));
+        }
+        self->panel_io_config.frame = frame;
+
         if(self->texture) {
             SDL_DestroyTexture(self->texture);
         }
@@ -343,6 +447,7 @@
         );
 
         SDL_SetTextureBlendMode(self->texture, SDL_BLENDMODE_BLEND);
+        SDL_UnlockMutex(self->panel_io_config.mutex);
 
         if ((bool)args[ARG_ignore_size_chg].u_int == false) {
             SDL_SetWindowSize(self->window, (int)self->panel_io_config.width, (int)self->panel_io_config.height);
@@ -372,15 +477,21 @@
         size_t size = (size_t)args[ARG_size].u_int;
 
         if (args[ARG_buf_num].u_int == 1) {
-            self->buf1 = m_realloc(self->buf1, size);
-            buf = self->buf1;
-            memset(self->buf1, 0x00, size);
+            buf = LCD_FB_REALLOC(self->buf1, size);
+            if (buf == NULL) {
+                mp_raise_msg(&mp_type_MemoryError, MP_ERROR_TEXT("Unable to allocate frame buffer"));
+            }
+            self->buf1 = buf;
         } else {
-            self->buf2 = m_realloc(self->buf2, size);
-            buf = self->buf2;
-            memset(self->buf2, 0x00, size);
+            buf = LCD_FB_REALLOC(self->buf2, size);
+            if (buf == NULL) {
+                mp_raise_msg(&mp_type_MemoryError, MP_ERROR_TEXT("Unable to allocate frame buffer"));
+            }
+            self->buf2 = buf;
         }
 
+        memset(buf, 0x00, size);
+
         mp_obj_array_t *view = MP_OBJ_TO_PTR(mp_obj_new_memoryview(BYTEARRAY_TYPECODE, size, buf));
         view->typecode |= 0x80; // used to indicate writable buffer
         return MP_OBJ_FROM_PTR(view);
@@ -643,9 +754,13 @@
     static const mp_rom_map_elem_t mp_lcd_sdl_bus_locals_dict_table[] = {
         { MP_ROM_QSTR(MP_QSTR_get_lane_count),       MP_ROM_PTR(&mp_lcd_bus_get_lane_count_obj)       },
         { MP_ROM_QSTR(MP_QSTR_register_callback),    MP_ROM_PTR(&mp_lcd_bus_register_callback_obj)    },
+        { MP_ROM_QSTR(MP_QSTR_register_native_flush), MP_ROM_PTR(&mp_lcd_bus_register_native_flush_obj) },
+        { MP_ROM_QSTR(MP_QSTR_get_window_stats),     MP_ROM_PTR(&mp_lcd_bus_get_window_stats_obj)     },
+        { MP_ROM_QSTR(MP_QSTR_reset_window_stats),   MP_ROM_PTR(&mp_lcd_bus_reset_window_stats_obj)   },
         { MP_ROM_QSTR(MP_QSTR_tx_color),             MP_ROM_PTR(&mp_lcd_bus_tx_color_obj)             },
         { MP_ROM_QSTR(MP_QSTR_rx_param),             MP_ROM_PTR(&mp_lcd_bus_rx_param_obj)             },
         { MP_ROM_QSTR(MP_QSTR_tx_param),             MP_ROM_PTR(&mp_lcd_bus_tx_param_obj)             },
+        { MP_ROM_QSTR(MP_QSTR_tx_param_sequence),    MP_ROM_PTR(&mp_lcd_bus_tx_param_sequence_obj)    },
         { MP_ROM_QSTR(MP_QSTR_free_framebuffer),     MP_ROM_PTR(&mp_lcd_bus_free_framebuffer_obj)     },
         { MP_ROM_QSTR(MP_QSTR_allocate_framebuffer), MP_ROM_PTR(&mp_lcd_bus_allocate_framebuffer_obj) },
         { MP_ROM_QSTR(MP_QSTR_init),                 MP_ROM_PTR(&mp_lcd_bus_init_obj)                 },
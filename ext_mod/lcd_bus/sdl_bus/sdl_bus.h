@@ -12,6 +12,8 @@
         #include "SDL.h"
         #include "SDL_thread.h"
 
+        #define SDL_BUS_DIRTY_RECT_MAX  16
+
         typedef struct {
             int32_t x;
             int32_t y;
@@ -23,10 +25,15 @@
             uint16_t height;
             uint32_t win_id;
             bool exit_thread;
-            void *buf_to_flush;
+            // copy of the screen the areas are written into, the flush
+            // thread uploads the dirty parts of it into the texture.
+            uint8_t *frame;
             SDL_Thread *thread;
             uint8_t bytes_per_pixel;
             SDL_mutex *mutex;
+            SDL_cond *flush_cond;
+            SDL_Rect dirty_rects[SDL_BUS_DIRTY_RECT_MAX];
+            uint8_t dirty_count;
             int flags;
         } panel_io_config_t;
 
@@ -37,6 +44,7 @@
 
             void *buf1;
             void *buf2;
+            uint32_t buffer_flags;
 
             bool trans_done;
             bool rgb565_byte_swap;
@@ -0,0 +1,29 @@
+#include "py/obj.h"
+#include "py/runtime.h"
+
+#ifndef __TOUCH_FILTER_H__
+    #define __TOUCH_FILTER_H__
+
+    #define TOUCH_FILTER_MAX_SAMPLES  (32)
+
+    typedef struct _mp_lcd_utils_touch_filter_obj_t {
+        mp_obj_base_t base;
+
+        // sample ring, the oldest sample gets replaced once it is full
+        int16_t xs[TOUCH_FILTER_MAX_SAMPLES];
+        int16_t ys[TOUCH_FILTER_MAX_SAMPLES];
+        uint8_t size;
+        uint8_t count;
+        uint8_t head;
+
+        uint16_t margin;  // distance a sample may be from the median
+        uint16_t alpha;   // IIR weight of a new point in Q8, 256 disables it
+
+        // IIR history in Q8
+        bool has_last;
+        int32_t last_x;
+        int32_t last_y;
+    } mp_lcd_utils_touch_filter_obj_t;
+
+    extern const mp_obj_type_t mp_lcd_utils_touch_filter_type;
+#endif /* __TOUCH_FILTER_H__ */
@@ -0,0 +1,7 @@
+#include "py/obj.h"
+#include "py/runtime.h"
+
+#ifndef __TRANSFORM_H__
+    #define __TRANSFORM_H__
+    extern const mp_obj_fun_builtin_fixed_t mp_lcd_utils_transform_obj;
+#endif /* __TRANSFORM_H__ */
@@ -8,6 +8,8 @@ set(LCD_UTILS_SOURCES
     ${CMAKE_CURRENT_LIST_DIR}/src/lcd_utils.c
     ${CMAKE_CURRENT_LIST_DIR}/src/remap.c
     ${CMAKE_CURRENT_LIST_DIR}/src/binary_float.c
+    ${CMAKE_CURRENT_LIST_DIR}/src/transform.c
+    ${CMAKE_CURRENT_LIST_DIR}/src/touch_filter.c
 )
 
 # Add our source files to the lib
@@ -11,3 +11,5 @@ endif
 SRC_USERMOD_C += $(MOD_DIR)/src/lcd_utils.c
 SRC_USERMOD_C += $(MOD_DIR)/src/remap.c
 SRC_USERMOD_C += $(MOD_DIR)/src/binary_float.c
+SRC_USERMOD_C += $(MOD_DIR)/src/transform.c
+SRC_USERMOD_C += $(MOD_DIR)/src/touch_filter.c
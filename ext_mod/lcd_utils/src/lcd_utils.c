@@ -1,5 +1,7 @@
 #include "../include/remap.h"
 #include "../include/binary_float.h"
+#include "../include/transform.h"
+#include "../include/touch_filter.h"
 
 #include "py/obj.h"
 #include "py/runtime.h"
@@ -9,6 +11,8 @@ static const mp_rom_map_elem_t mp_lcd_utils_module_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR___name__),           MP_OBJ_NEW_QSTR(MP_QSTR_lcd_utils)  },
     { MP_ROM_QSTR(MP_QSTR_remap),              MP_ROM_PTR(&mp_lcd_utils_remap_obj) },
     { MP_ROM_QSTR(MP_QSTR_int_float_converter),    MP_ROM_PTR(&mp_lcd_utils_int_float_converter_obj) },
+    { MP_ROM_QSTR(MP_QSTR_transform),          MP_ROM_PTR(&mp_lcd_utils_transform_obj) },
+    { MP_ROM_QSTR(MP_QSTR_TouchFilter),        MP_ROM_PTR(&mp_lcd_utils_touch_filter_type) },
 };
 
 static MP_DEFINE_CONST_DICT(mp_lcd_utils_module_globals, mp_lcd_utils_module_globals_table);
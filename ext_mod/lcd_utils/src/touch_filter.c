@@ -0,0 +1,249 @@
+#include "../include/touch_filter.h"
+
+#include "py/obj.h"
+#include "py/runtime.h"
+
+/*
+ * Filters the raw samples from a touch controller (mostly resistive panels
+ * that need heavy oversampling) into a single point.
+ *
+ * Samples are stored in a fixed ring so taking a reading does not allocate.
+ * `get` computes the median of the samples, drops the samples that are
+ * further than `margin` from the median, averages what is left and then
+ * optionally runs the result through a single pole IIR filter.
+ */
+
+
+static void touch_filter_set_alpha(mp_lcd_utils_touch_filter_obj_t *self, mp_obj_t alpha_in)
+{
+    mp_float_t alpha = mp_obj_get_float(alpha_in);
+
+    if (alpha <= (mp_float_t)0.0 || alpha > (mp_float_t)1.0) {
+        mp_raise_ValueError(MP_ERROR_TEXT("alpha must be > 0 and <= 1"));
+    }
+
+    self->alpha = (uint16_t)(alpha * (mp_float_t)256.0 + (mp_float_t)0.5);
+    if (self->alpha == 0) self->alpha = 1;
+}
+
+
+static void touch_filter_set_margin(mp_lcd_utils_touch_filter_obj_t *self, mp_obj_t margin_in)
+{
+    mp_int_t margin = mp_obj_get_int(margin_in);
+
+    if (margin < 0) {
+        mp_raise_ValueError(MP_ERROR_TEXT("margin must be >= 0"));
+    }
+
+    self->margin = (uint16_t)MIN(margin, 0xFFFF);
+}
+
+
+static mp_obj_t mp_lcd_utils_touch_filter_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *all_args)
+{
+    enum { ARG_size, ARG_margin, ARG_alpha };
+    static const mp_arg_t allowed_args[] = {
+        { MP_QSTR_size,   MP_ARG_INT | MP_ARG_REQUIRED },
+        { MP_QSTR_margin, MP_ARG_INT | MP_ARG_KW_ONLY, { .u_int = 50 } },
+        { MP_QSTR_alpha,  MP_ARG_OBJ | MP_ARG_KW_ONLY, { .u_obj = mp_const_none } },
+    };
+
+    mp_arg_val_t args[MP_ARRAY_SIZE(allowed_args)];
+    mp_arg_parse_all_kw_array(n_args, n_kw, all_args, MP_ARRAY_SIZE(allowed_args), allowed_args, args);
+
+    if (args[ARG_size].u_int < 1 || args[ARG_size].u_int > TOUCH_FILTER_MAX_SAMPLES) {
+        mp_raise_msg_varg(&mp_type_ValueError, MP_ERROR_TEXT("size must be 1-%d"), TOUCH_FILTER_MAX_SAMPLES);
+    }
+
+    mp_lcd_utils_touch_filter_obj_t *self = m_new_obj(mp_lcd_utils_touch_filter_obj_t);
+    self->base.type = &mp_lcd_utils_touch_filter_type;
+    self->size = (uint8_t)args[ARG_size].u_int;
+    self->count = 0;
+    self->head = 0;
+    self->has_last = false;
+    self->alpha = 256;
+
+    touch_filter_set_margin(self, MP_OBJ_NEW_SMALL_INT(args[ARG_margin].u_int));
+
+    if (args[ARG_alpha].u_obj != mp_const_none) {
+        touch_filter_set_alpha(self, args[ARG_alpha].u_obj);
+    }
+
+    return MP_OBJ_FROM_PTR(self);
+}
+
+
+static mp_obj_t mp_lcd_utils_touch_filter_add(mp_obj_t self_in, mp_obj_t x_in, mp_obj_t y_in)
+{
+    mp_lcd_utils_touch_filter_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    self->xs[self->head] = (int16_t)mp_obj_get_int(x_in);
+    self->ys[self->head] = (int16_t)mp_obj_get_int(y_in);
+
+    self->head++;
+    if (self->head == self->size) self->head = 0;
+    if (self->count < self->size) self->count++;
+
+    return MP_OBJ_NEW_SMALL_INT(self->count);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_3(mp_lcd_utils_touch_filter_add_obj, mp_lcd_utils_touch_filter_add);
+
+
+static int16_t touch_filter_median(const int16_t *values, uint8_t count)
+{
+    int16_t sorted[TOUCH_FILTER_MAX_SAMPLES];
+
+    // insertion sort, count is never larger than TOUCH_FILTER_MAX_SAMPLES
+    for (uint8_t i = 0; i < count; i++) {
+        int16_t value = values[i];
+        uint8_t j = i;
+
+        while (j > 0 && sorted[j - 1] > value) {
+            sorted[j] = sorted[j - 1];
+            j--;
+        }
+        sorted[j] = value;
+    }
+
+    if (count & 1) return sorted[count / 2];
+    return (int16_t)(((int32_t)sorted[count / 2 - 1] + (int32_t)sorted[count / 2]) / 2);
+}
+
+
+static mp_obj_t mp_lcd_utils_touch_filter_get(mp_obj_t self_in)
+{
+    mp_lcd_utils_touch_filter_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    uint8_t count = self->count;
+    if (count == 0) return mp_const_none;
+
+    int32_t median_x = touch_filter_median(self->xs, count);
+    int32_t median_y = touch_filter_median(self->ys, count);
+
+    uint32_t margin = (uint32_t)self->margin * (uint32_t)self->margin;
+    int32_t sum_x = 0;
+    int32_t sum_y = 0;
+    uint8_t kept = 0;
+
+    for (uint8_t i = 0; i < count; i++) {
+        int32_t dx = (int32_t)self->xs[i] - median_x;
+        int32_t dy = (int32_t)self->ys[i] - median_y;
+
+        if ((uint32_t)(dx * dx + dy * dy) <= margin) {
+            sum_x += self->xs[i];
+            sum_y += self->ys[i];
+            kept++;
+        }
+    }
+
+    // more than half of the samples being out of the margin means the
+    // panel is bouncing, it is better to report nothing than a bad point
+    if (kept * 2 <= count) return mp_const_none;
+
+    // Q8 so the IIR filter does not lose the fractional part
+    int32_t x = (sum_x * 256 + kept / 2) / kept;
+    int32_t y = (sum_y * 256 + kept / 2) / kept;
+
+    if (self->has_last && self->alpha < 256) {
+        x = self->last_x + (((x - self->last_x) * self->alpha) / 256);
+        y = self->last_y + (((y - self->last_y) * self->alpha) / 256);
+    }
+
+    self->last_x = x;
+    self->last_y = y;
+    self->has_last = true;
+
+    mp_obj_t items[2] = {
+        mp_obj_new_int((x + 128) >> 8),
+        mp_obj_new_int((y + 128) >> 8)
+    };
+
+    return mp_obj_new_tuple(2, items);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_utils_touch_filter_get_obj, mp_lcd_utils_touch_filter_get);
+
+
+static mp_obj_t mp_lcd_utils_touch_filter_clear(mp_obj_t self_in)
+{
+    mp_lcd_utils_touch_filter_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    self->count = 0;
+    self->head = 0;
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_utils_touch_filter_clear_obj, mp_lcd_utils_touch_filter_clear);
+
+
+static mp_obj_t mp_lcd_utils_touch_filter_reset(mp_obj_t self_in)
+{
+    mp_lcd_utils_touch_filter_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    self->count = 0;
+    self->head = 0;
+    self->has_last = false;
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_utils_touch_filter_reset_obj, mp_lcd_utils_touch_filter_reset);
+
+
+static void mp_lcd_utils_touch_filter_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest)
+{
+    mp_lcd_utils_touch_filter_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    if (dest[0] == MP_OBJ_NULL) {
+        // load
+        switch (attr) {
+            case MP_QSTR_count:
+                dest[0] = MP_OBJ_NEW_SMALL_INT(self->count);
+                return;
+            case MP_QSTR_size:
+                dest[0] = MP_OBJ_NEW_SMALL_INT(self->size);
+                return;
+            case MP_QSTR_margin:
+                dest[0] = MP_OBJ_NEW_SMALL_INT(self->margin);
+                return;
+            case MP_QSTR_alpha:
+                dest[0] = mp_obj_new_float((mp_float_t)self->alpha / (mp_float_t)256.0);
+                return;
+            default:
+                // continue lookup in locals_dict
+                dest[1] = MP_OBJ_SENTINEL;
+                return;
+        }
+    } else if (dest[1] != MP_OBJ_NULL) {
+        // store
+        switch (attr) {
+            case MP_QSTR_margin:
+                touch_filter_set_margin(self, dest[1]);
+                break;
+            case MP_QSTR_alpha:
+                touch_filter_set_alpha(self, dest[1]);
+                break;
+            default:
+                return;
+        }
+        dest[0] = MP_OBJ_NULL;
+    }
+}
+
+
+static const mp_rom_map_elem_t mp_lcd_utils_touch_filter_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR_add),   MP_ROM_PTR(&mp_lcd_utils_touch_filter_add_obj)   },
+    { MP_ROM_QSTR(MP_QSTR_get),   MP_ROM_PTR(&mp_lcd_utils_touch_filter_get_obj)   },
+    { MP_ROM_QSTR(MP_QSTR_clear), MP_ROM_PTR(&mp_lcd_utils_touch_filter_clear_obj) },
+    { MP_ROM_QSTR(MP_QSTR_reset), MP_ROM_PTR(&mp_lcd_utils_touch_filter_reset_obj) },
+};
+
+static MP_DEFINE_CONST_DICT(mp_lcd_utils_touch_filter_locals_dict, mp_lcd_utils_touch_filter_locals_dict_table);
+
+
+MP_DEFINE_CONST_OBJ_TYPE(
+    mp_lcd_utils_touch_filter_type,
+    MP_QSTR_TouchFilter,
+    MP_TYPE_FLAG_NONE,
+    make_new, mp_lcd_utils_touch_filter_make_new,
+    attr, mp_lcd_utils_touch_filter_attr,
+    locals_dict, &mp_lcd_utils_touch_filter_locals_dict
+);
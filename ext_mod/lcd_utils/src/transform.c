@@ -0,0 +1,43 @@
+#include "../include/transform.h"
+
+#include "py/obj.h"
+#include "py/runtime.h"
+
+/*
+ * Applies a precomputed 2D affine transform to a point.
+ *
+ * The matrix is any object exposing the buffer protocol that holds 6 signed
+ * 32 bit integers (a, b, c, d, e, f) in Q16.16 fixed point:
+ *
+ *     x' = a * x + b * y + c
+ *     y' = d * x + e * y + f
+ *
+ * This lets the calibration and rotation math that runs on every indev read
+ * be collapsed into 4 multiplies and 4 adds with no float objects created.
+ */
+static mp_obj_t mp_lcd_utils_transform(mp_obj_t matrix_in, mp_obj_t x_in, mp_obj_t y_in)
+{
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(matrix_in, &bufinfo, MP_BUFFER_READ);
+
+    if (bufinfo.len < sizeof(int32_t) * 6) {
+        mp_raise_ValueError(MP_ERROR_TEXT("matrix needs 6 int32 values"));
+    }
+
+    const int32_t *m = (const int32_t *)bufinfo.buf;
+    int64_t x = (int64_t)mp_obj_get_int(x_in);
+    int64_t y = (int64_t)mp_obj_get_int(y_in);
+
+    // + 0x8000 rounds to the nearest pixel instead of truncating
+    int64_t out_x = (m[0] * x + m[1] * y + m[2] + 0x8000) >> 16;
+    int64_t out_y = (m[3] * x + m[4] * y + m[5] + 0x8000) >> 16;
+
+    mp_obj_t items[2] = {
+        mp_obj_new_int((mp_int_t)out_x),
+        mp_obj_new_int((mp_int_t)out_y)
+    };
+
+    return mp_obj_new_tuple(2, items);
+}
+
+MP_DEFINE_CONST_FUN_OBJ_3(mp_lcd_utils_transform_obj, mp_lcd_utils_transform);
@@ -0,0 +1,484 @@
+// Read-only packed asset archive for LVGL.
+//
+// An archive is a single blob holding any number of files. On an MCU it is
+// normally frozen into the firmware so it sits in flash behind the XIP
+// mapping; on unix it gets mmap'd. Either way the entries are never copied:
+// `get` hands out memoryviews of the blob that can be passed straight to
+// LVGL (image data, fonts loaded from a buffer) and `register` adds an LVGL
+// filesystem letter whose reads are a memcpy out of the blob, with no VFS
+// and no Python callbacks involved.
+//
+// The views of an archive made from a buffer keep that buffer alive. The
+// views of a mmap'd archive point into the mapping, they are only valid
+// until the archive is closed or collected.
+//
+// Layout, little endian, offsets are from the start of the archive:
+//
+//   header   magic "LVPK" (4), version (u16), entry count (u16),
+//            index offset (u32), data alignment (u32)
+//   index    per entry, sorted by name: name offset (u32), name length
+//            (u16), reserved (u16), data offset (u32), data size (u32)
+//   names    the entry names, not NUL terminated
+//   data     the entries, each one aligned to the data alignment
+//
+// builder/archive.py writes this format.
+
+#include <string.h>
+
+#include "py/obj.h"
+#include "py/runtime.h"
+#include "py/mperrno.h"
+#include "py/objarray.h"
+
+#include "lvgl/lvgl.h"
+
+#if (defined(__unix__) || defined(__APPLE__)) && !defined(ESP_PLATFORM)
+    #define LV_ARCHIVE_MMAP  1
+    #include <errno.h>
+    #include <fcntl.h>
+    #include <unistd.h>
+    #include <sys/mman.h>
+    #include <sys/stat.h>
+#else
+    #define LV_ARCHIVE_MMAP  0
+#endif
+
+
+#define LV_ARCHIVE_VERSION     (1)
+#define LV_ARCHIVE_HEADER_SIZE (16)
+#define LV_ARCHIVE_ENTRY_SIZE  (16)
+#define LV_ARCHIVE_MAX_DRIVES  (4)
+
+
+typedef struct _mp_lv_archive_obj_t {
+    mp_obj_base_t base;
+    // memoryview of the buffer the archive was made from, entries are
+    // sliced out of it so they keep the buffer alive. None when mmap'd.
+    mp_obj_t source;
+    const uint8_t *data;
+    size_t size;
+    uint16_t count;
+    const uint8_t *index;
+    bool mapped;
+    lv_fs_drv_t drv;
+} mp_lv_archive_obj_t;
+
+
+typedef struct _lv_archive_file_t {
+    const uint8_t *data;
+    uint32_t size;
+    uint32_t pos;
+} lv_archive_file_t;
+
+
+// archives registered as an LVGL drive can't be collected, LVGL has no way
+// to remove a drive again
+MP_REGISTER_ROOT_POINTER(void *lv_archive_drives[LV_ARCHIVE_MAX_DRIVES]);
+
+const mp_obj_type_t mp_lv_archive_type;
+
+
+static inline uint16_t archive_u16(const uint8_t *p)
+{
+    return (uint16_t)(p[0] | (p[1] << 8));
+}
+
+
+static inline uint32_t archive_u32(const uint8_t *p)
+{
+    return (uint32_t)p[0] | ((uint32_t)p[1] << 8) | ((uint32_t)p[2] << 16) | ((uint32_t)p[3] << 24);
+}
+
+
+static void archive_parse(mp_lv_archive_obj_t *self)
+{
+    const uint8_t *data = self->data;
+
+    if (self->size < LV_ARCHIVE_HEADER_SIZE || memcmp(data, "LVPK", 4) != 0) {
+        mp_raise_ValueError(MP_ERROR_TEXT("not an asset archive"));
+    }
+
+    if (archive_u16(data + 4) != LV_ARCHIVE_VERSION) {
+        mp_raise_ValueError(MP_ERROR_TEXT("unsupported archive version"));
+    }
+
+    self->count = archive_u16(data + 6);
+    uint32_t index_offset = archive_u32(data + 8);
+
+    if ((size_t)index_offset + (size_t)self->count * LV_ARCHIVE_ENTRY_SIZE > self->size) {
+        mp_raise_ValueError(MP_ERROR_TEXT("archive is truncated"));
+    }
+
+    self->index = data + index_offset;
+
+    for (uint16_t i = 0; i < self->count; i++) {
+        const uint8_t *entry = self->index + i * LV_ARCHIVE_ENTRY_SIZE;
+
+        if ((size_t)archive_u32(entry) + archive_u16(entry + 4) > self->size ||
+            (size_t)archive_u32(entry + 8) + archive_u32(entry + 12) > self->size) {
+            mp_raise_ValueError(MP_ERROR_TEXT("archive is truncated"));
+        }
+    }
+}
+
+
+// binary search of the sorted index
+static const uint8_t *archive_find(mp_lv_archive_obj_t *self, const char *name, size_t name_len)
+{
+    // LVGL passes the path with the leading slash
+    while (name_len && (*name == '/' || *name == '\\')) {
+        name++;
+        name_len--;
+    }
+
+    int32_t low = 0;
+    int32_t high = (int32_t)self->count - 1;
+
+    while (low <= high) {
+        int32_t mid = (low + high) / 2;
+        const uint8_t *entry = self->index + mid * LV_ARCHIVE_ENTRY_SIZE;
+        const char *entry_name = (const char *)self->data + archive_u32(entry);
+        size_t entry_len = archive_u16(entry + 4);
+
+        int cmp = memcmp(name, entry_name, LV_MIN(name_len, entry_len));
+        if (cmp == 0) {
+            if (name_len == entry_len) return entry;
+            cmp = name_len < entry_len ? -1 : 1;
+        }
+
+        if (cmp < 0) high = mid - 1;
+        else low = mid + 1;
+    }
+
+    return NULL;
+}
+
+
+// LVGL filesystem driver
+static void *archive_fs_open(lv_fs_drv_t *drv, const char *path, lv_fs_mode_t mode)
+{
+    mp_lv_archive_obj_t *self = (mp_lv_archive_obj_t *)drv->user_data;
+
+    if (mode & LV_FS_MODE_WR) return NULL;
+
+    const uint8_t *entry = archive_find(self, path, strlen(path));
+    if (entry == NULL) return NULL;
+
+    lv_archive_file_t *file = lv_malloc(sizeof(lv_archive_file_t));
+    if (file == NULL) return NULL;
+
+    file->data = self->data + archive_u32(entry + 8);
+    file->size = archive_u32(entry + 12);
+    file->pos = 0;
+
+    return file;
+}
+
+
+static lv_fs_res_t archive_fs_close(lv_fs_drv_t *drv, void *file_p)
+{
+    LV_UNUSED(drv);
+    lv_free(file_p);
+    return LV_FS_RES_OK;
+}
+
+
+static lv_fs_res_t archive_fs_read(lv_fs_drv_t *drv, void *file_p, void *buf, uint32_t btr, uint32_t *br)
+{
+    LV_UNUSED(drv);
+    lv_archive_file_t *file = (lv_archive_file_t *)file_p;
+
+    uint32_t remaining = file->size - file->pos;
+    if (btr > remaining) btr = remaining;
+
+    memcpy(buf, file->data + file->pos, btr);
+    file->pos += btr;
+    *br = btr;
+
+    return LV_FS_RES_OK;
+}
+
+
+static lv_fs_res_t archive_fs_seek(lv_fs_drv_t *drv, void *file_p, uint32_t pos, lv_fs_whence_t whence)
+{
+    LV_UNUSED(drv);
+    lv_archive_file_t *file = (lv_archive_file_t *)file_p;
+    int64_t new_pos;
+
+    switch (whence) {
+        case LV_FS_SEEK_SET:
+            new_pos = pos;
+            break;
+        case LV_FS_SEEK_CUR:
+            new_pos = (int64_t)file->pos + (int32_t)pos;
+            break;
+        case LV_FS_SEEK_END:
+            new_pos = (int64_t)file->size + (int32_t)pos;
+            break;
+        default:
+            return LV_FS_RES_INV_PARAM;
+    }
+
+    if (new_pos < 0 || new_pos > file->size) return LV_FS_RES_INV_PARAM;
+
+    file->pos = (uint32_t)new_pos;
+    return LV_FS_RES_OK;
+}
+
+
+static lv_fs_res_t archive_fs_tell(lv_fs_drv_t *drv, void *file_p, uint32_t *pos_p)
+{
+    LV_UNUSED(drv);
+    *pos_p = ((lv_archive_file_t *)file_p)->pos;
+    return LV_FS_RES_OK;
+}
+
+
+static mp_obj_t mp_lv_archive_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *all_args)
+{
+    mp_arg_check_num(n_args, n_kw, 1, 1, false);
+
+    mp_lv_archive_obj_t *self;
+
+    if (mp_obj_is_str(all_args[0])) {
+    #if LV_ARCHIVE_MMAP
+        // the finaliser unmaps the file
+        self = m_new_obj_with_finaliser(mp_lv_archive_obj_t);
+        memset(self, 0, sizeof(mp_lv_archive_obj_t));
+        self->base.type = &mp_lv_archive_type;
+
+        const char *path = mp_obj_str_get_str(all_args[0]);
+        struct stat st;
+
+        int fd = open(path, O_RDONLY);
+        if (fd < 0) mp_raise_OSError(errno);
+
+        if (fstat(fd, &st) < 0) {
+            int err = errno;
+            close(fd);
+            mp_raise_OSError(err);
+        }
+
+        void *data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_SHARED, fd, 0);
+        // the mapping stays valid after the descriptor is closed
+        close(fd);
+
+        if (data == MAP_FAILED) mp_raise_OSError(errno);
+
+        self->data = (const uint8_t *)data;
+        self->size = (size_t)st.st_size;
+        self->mapped = true;
+        self->source = mp_const_none;
+    #else
+        mp_raise_msg(&mp_type_NotImplementedError,
+                     MP_ERROR_TEXT("archives can only be opened from a buffer on this port"));
+    #endif
+    } else {
+        self = m_new0(mp_lv_archive_obj_t, 1);
+        self->base.type = &mp_lv_archive_type;
+
+        mp_buffer_info_t bufinfo;
+        mp_get_buffer_raise(all_args[0], &bufinfo, MP_BUFFER_READ);
+
+        self->data = (const uint8_t *)bufinfo.buf;
+        self->size = bufinfo.len;
+        self->source = mp_obj_new_memoryview('B', bufinfo.len, bufinfo.buf);
+    }
+
+    // a mapping that isn't an archive is unmapped by the finaliser
+    archive_parse(self);
+
+    return MP_OBJ_FROM_PTR(self);
+}
+
+
+static mp_obj_t mp_lv_archive_get(mp_obj_t self_in, mp_obj_t name_in)
+{
+    mp_lv_archive_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    size_t name_len;
+    const char *name = mp_obj_str_get_data(name_in, &name_len);
+
+    const uint8_t *entry = archive_find(self, name, name_len);
+    if (entry == NULL) return mp_const_none;
+
+    uint32_t offset = archive_u32(entry + 8);
+    uint32_t size = archive_u32(entry + 12);
+
+    if (self->source == mp_const_none) {
+        // a view of the mapping, nothing gets copied
+        return mp_obj_new_memoryview('B', size, (void *)(self->data + offset));
+    }
+
+    // slicing the memoryview keeps a reference to the start of the buffer,
+    // so the buffer stays alive as long as the view does
+    mp_obj_t slice = mp_obj_new_slice(MP_OBJ_NEW_SMALL_INT(offset),
+                                      mp_obj_new_int_from_uint(offset + size),
+                                      mp_const_none);
+    return mp_obj_subscr(self->source, slice, MP_OBJ_SENTINEL);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_2(mp_lv_archive_get_obj, mp_lv_archive_get);
+
+
+static mp_obj_t mp_lv_archive_names(mp_obj_t self_in)
+{
+    mp_lv_archive_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_obj_t list = mp_obj_new_list(0, NULL);
+
+    for (uint16_t i = 0; i < self->count; i++) {
+        const uint8_t *entry = self->index + i * LV_ARCHIVE_ENTRY_SIZE;
+        mp_obj_list_append(list, mp_obj_new_str((const char *)self->data + archive_u32(entry),
+                                                archive_u16(entry + 4)));
+    }
+
+    return list;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lv_archive_names_obj, mp_lv_archive_names);
+
+
+// unmaps an archive opened from a file, the views it handed out must not be
+// used after this. Buffer archives don't hold anything that needs releasing.
+static mp_obj_t mp_lv_archive_close(mp_obj_t self_in)
+{
+    mp_lv_archive_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    if (self->drv.letter != 0) {
+        // LVGL can't remove the drive, it would read from freed memory
+        mp_raise_msg(&mp_type_RuntimeError, MP_ERROR_TEXT("a registered archive can't be closed"));
+    }
+
+    #if LV_ARCHIVE_MMAP
+    if (self->mapped) {
+        munmap((void *)self->data, self->size);
+        self->mapped = false;
+    }
+    #endif
+
+    self->data = NULL;
+    self->size = 0;
+    self->count = 0;
+    self->index = NULL;
+    self->source = mp_const_none;
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lv_archive_close_obj, mp_lv_archive_close);
+
+
+static mp_obj_t mp_lv_archive_register(mp_obj_t self_in, mp_obj_t letter_in)
+{
+    mp_lv_archive_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    size_t len;
+    const char *letter = mp_obj_str_get_data(letter_in, &len);
+    if (len != 1) {
+        mp_raise_ValueError(MP_ERROR_TEXT("letter must be a single character"));
+    }
+
+    if (self->drv.letter != 0) {
+        mp_raise_msg(&mp_type_RuntimeError, MP_ERROR_TEXT("archive is already registered"));
+    }
+
+    if (self->data == NULL) {
+        mp_raise_msg(&mp_type_RuntimeError, MP_ERROR_TEXT("archive is closed"));
+    }
+
+    if (lv_fs_get_drv(letter[0]) != NULL) {
+        mp_raise_ValueError(MP_ERROR_TEXT("letter is already in use"));
+    }
+
+    uint8_t i = 0;
+    for (; i < LV_ARCHIVE_MAX_DRIVES; i++) {
+        if (MP_STATE_PORT(lv_archive_drives)[i] == NULL) break;
+    }
+
+    if (i == LV_ARCHIVE_MAX_DRIVES) {
+        mp_raise_msg(&mp_type_RuntimeError, MP_ERROR_TEXT("too many archives registered"));
+    }
+
+    MP_STATE_PORT(lv_archive_drives)[i] = self;
+
+    lv_fs_drv_init(&self->drv);
+    self->drv.letter = letter[0];
+    self->drv.cache_size = 0;
+    self->drv.open_cb = archive_fs_open;
+    self->drv.close_cb = archive_fs_close;
+    self->drv.read_cb = archive_fs_read;
+    self->drv.seek_cb = archive_fs_seek;
+    self->drv.tell_cb = archive_fs_tell;
+    self->drv.user_data = self;
+
+    lv_fs_drv_register(&self->drv);
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_2(mp_lv_archive_register_obj, mp_lv_archive_register);
+
+
+static mp_obj_t mp_lv_archive_unary_op(mp_unary_op_t op, mp_obj_t self_in)
+{
+    mp_lv_archive_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    switch (op) {
+        case MP_UNARY_OP_LEN:
+            return MP_OBJ_NEW_SMALL_INT(self->count);
+        default:
+            return MP_OBJ_NULL;
+    }
+}
+
+
+static mp_obj_t mp_lv_archive_binary_op(mp_binary_op_t op, mp_obj_t lhs_in, mp_obj_t rhs_in)
+{
+    mp_lv_archive_obj_t *self = MP_OBJ_TO_PTR(lhs_in);
+
+    if (op == MP_BINARY_OP_CONTAINS) {
+        size_t name_len;
+        const char *name = mp_obj_str_get_data(rhs_in, &name_len);
+        return mp_obj_new_bool(archive_find(self, name, name_len) != NULL);
+    }
+
+    return MP_OBJ_NULL;
+}
+
+
+static const mp_rom_map_elem_t mp_lv_archive_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR_get),      MP_ROM_PTR(&mp_lv_archive_get_obj)      },
+    { MP_ROM_QSTR(MP_QSTR_names),    MP_ROM_PTR(&mp_lv_archive_names_obj)    },
+    { MP_ROM_QSTR(MP_QSTR_register), MP_ROM_PTR(&mp_lv_archive_register_obj) },
+    { MP_ROM_QSTR(MP_QSTR_close),    MP_ROM_PTR(&mp_lv_archive_close_obj)    },
+    { MP_ROM_QSTR(MP_QSTR___del__),  MP_ROM_PTR(&mp_lv_archive_close_obj)    },
+};
+
+static MP_DEFINE_CONST_DICT(mp_lv_archive_locals_dict, mp_lv_archive_locals_dict_table);
+
+
+MP_DEFINE_CONST_OBJ_TYPE(
+    mp_lv_archive_type,
+    MP_QSTR_Archive,
+    MP_TYPE_FLAG_NONE,
+    make_new, mp_lv_archive_make_new,
+    unary_op, mp_lv_archive_unary_op,
+    binary_op, mp_lv_archive_binary_op,
+    locals_dict, &mp_lv_archive_locals_dict
+);
+
+
+static const mp_rom_map_elem_t mp_module_lv_archive_globals_table[] = {
+    { MP_ROM_QSTR(MP_QSTR___name__), MP_OBJ_NEW_QSTR(MP_QSTR_lv_archive) },
+    { MP_ROM_QSTR(MP_QSTR_Archive),  MP_ROM_PTR(&mp_lv_archive_type)     },
+};
+
+static MP_DEFINE_CONST_DICT(mp_module_lv_archive_globals, mp_module_lv_archive_globals_table);
+
+
+const mp_obj_module_t mp_module_lv_archive = {
+    .base    = {&mp_type_module},
+    .globals = (mp_obj_dict_t *)&mp_module_lv_archive_globals,
+};
+
+MP_REGISTER_MODULE(MP_QSTR_lv_archive, mp_module_lv_archive);
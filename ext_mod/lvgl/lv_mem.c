@@ -0,0 +1,151 @@
+// Memory accounting for LVGL.
+//
+// LVGL allocates from the MicroPython GC heap (see mem_core.c) so the memory
+// it holds is mixed in with Python objects. When the firmware is built with
+// MICROPY_MEM_MONITOR=1 the mem core keeps count of what LVGL allocates and
+// this module reports it next to the state of the GC heap. lv.mem_monitor()
+// reports the same numbers in an lv.mem_monitor_t.
+//
+// When the firmware is built with MICROPY_TLSF=1 LVGL allocates from its own
+// pool instead and the numbers come from LVGL's TLSF allocator.
+
+#include "py/obj.h"
+#include "py/runtime.h"
+#include "py/gc.h"
+
+#include "lvgl/lvgl.h"
+#include "mem_core.h"
+
+
+MP_REGISTER_ROOT_POINTER(void *mp_lv_pool);
+
+
+// LV_MEM_POOL_ALLOC, called by lv_init when the TLSF allocator is used.
+//
+// The pool is one block of the GC heap. A collection scans it as a flat
+// block, which keeps the Python objects the binding stores in LVGL's user
+// data alive, but the collector never marks or sweeps the LVGL objects in
+// it and LVGL allocations never trigger a collection.
+void *mp_lv_pool_alloc(size_t size)
+{
+    // a second lv_init after lv_deinit gets the same pool back
+    if (MP_STATE_PORT(mp_lv_pool) == NULL) {
+        MP_STATE_PORT(mp_lv_pool) = m_malloc(size);
+    }
+
+    return MP_STATE_PORT(mp_lv_pool);
+}
+
+
+static void lv_mem_store(mp_obj_t dict, qstr key, size_t value)
+{
+    mp_obj_dict_store(dict, MP_OBJ_NEW_QSTR(key), mp_obj_new_int_from_uint(value));
+}
+
+
+static mp_obj_t lv_mem_info(void)
+{
+    gc_info_t info;
+    gc_info(&info);
+
+    mp_obj_t dict = mp_obj_new_dict(11);
+
+#if LV_USE_STDLIB_MALLOC == LV_STDLIB_BUILTIN
+    lv_mem_monitor_t mon;
+    lv_memzero(&mon, sizeof(mon));
+
+    if (lv_is_initialized()) lv_mem_monitor(&mon);
+
+    lv_mem_store(dict, MP_QSTR_pool, mon.total_size);
+    lv_mem_store(dict, MP_QSTR_used, mon.total_size - mon.free_size);
+    lv_mem_store(dict, MP_QSTR_peak, mon.max_used);
+    lv_mem_store(dict, MP_QSTR_count, mon.used_cnt);
+#else
+    lv_mem_store(dict, MP_QSTR_pool, 0);
+    lv_mem_store(dict, MP_QSTR_used, mem_core_stats.used);
+    lv_mem_store(dict, MP_QSTR_peak, mem_core_stats.peak);
+    lv_mem_store(dict, MP_QSTR_count, mem_core_stats.count);
+#endif
+    lv_mem_store(dict, MP_QSTR_total, mem_core_stats.total);
+    lv_mem_store(dict, MP_QSTR_failed, mem_core_stats.failed);
+
+    mp_obj_t classes[MEM_CORE_SIZE_CLASSES];
+    for (uint8_t i = 0; i < MEM_CORE_SIZE_CLASSES; i++) {
+        classes[i] = mp_obj_new_int_from_uint(mem_core_stats.classes[i]);
+    }
+    mp_obj_dict_store(dict, MP_OBJ_NEW_QSTR(MP_QSTR_classes),
+                      mp_obj_new_tuple(MEM_CORE_SIZE_CLASSES, classes));
+
+    lv_mem_store(dict, MP_QSTR_heap_total, info.total);
+    lv_mem_store(dict, MP_QSTR_heap_used, info.used);
+    lv_mem_store(dict, MP_QSTR_heap_free, info.free);
+    lv_mem_store(dict, MP_QSTR_heap_largest_free, info.max_free * MICROPY_BYTES_PER_GC_BLOCK);
+
+    return dict;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_0(lv_mem_info_obj, lv_mem_info);
+
+
+static mp_obj_t lv_mem_reset_peak(void)
+{
+    mem_core_stats.peak = mem_core_stats.used;
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_0(lv_mem_reset_peak_obj, lv_mem_reset_peak);
+
+
+// bytes allocated from the GC heap since the last collection, a collection
+// resets it. None when the port doesn't keep count.
+static mp_obj_t lv_mem_gc_allocated(void)
+{
+#if MICROPY_GC_ALLOC_THRESHOLD
+    return mp_obj_new_int_from_uint(MP_STATE_MEM(gc_alloc_amount) * MICROPY_BYTES_PER_GC_BLOCK);
+#else
+    return mp_const_none;
+#endif
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_0(lv_mem_gc_allocated_obj, lv_mem_gc_allocated);
+
+
+static const mp_rom_obj_tuple_t lv_mem_size_classes_obj = {
+    {&mp_type_tuple},
+    MEM_CORE_SIZE_CLASSES - 1,
+    {
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN),
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN << 1),
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN << 2),
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN << 3),
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN << 4),
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN << 5),
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN << 6),
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN << 7),
+        MP_ROM_INT(MEM_CORE_SIZE_CLASS_MIN << 8),
+    }
+};
+
+
+static const mp_rom_map_elem_t mp_module_lv_mem_globals_table[] = {
+    { MP_ROM_QSTR(MP_QSTR___name__),     MP_OBJ_NEW_QSTR(MP_QSTR_lv_mem)       },
+    { MP_ROM_QSTR(MP_QSTR_info),         MP_ROM_PTR(&lv_mem_info_obj)          },
+    { MP_ROM_QSTR(MP_QSTR_reset_peak),   MP_ROM_PTR(&lv_mem_reset_peak_obj)    },
+    { MP_ROM_QSTR(MP_QSTR_gc_allocated), MP_ROM_PTR(&lv_mem_gc_allocated_obj)  },
+    { MP_ROM_QSTR(MP_QSTR_SIZE_CLASSES), MP_ROM_PTR(&lv_mem_size_classes_obj)  },
+#if MICROPY_MEM_MONITOR
+    { MP_ROM_QSTR(MP_QSTR_ENABLED),      MP_ROM_TRUE                           },
+#else
+    { MP_ROM_QSTR(MP_QSTR_ENABLED),      MP_ROM_FALSE                          },
+#endif
+};
+
+static MP_DEFINE_CONST_DICT(mp_module_lv_mem_globals, mp_module_lv_mem_globals_table);
+
+
+const mp_obj_module_t mp_module_lv_mem = {
+    .base    = {&mp_type_module},
+    .globals = (mp_obj_dict_t *)&mp_module_lv_mem_globals,
+};
+
+MP_REGISTER_MODULE(MP_QSTR_lv_mem, mp_module_lv_mem);
@@ -6,6 +6,12 @@
  *      INCLUDES
  *********************/
 #include "lvgl/src/stdlib/lv_mem.h"
+#include "mem_core.h"
+
+/* defined even when the MicroPython allocator isn't used so the lv_mem
+ * module always links */
+mem_core_stats_t mem_core_stats;
+
 #if LV_USE_STDLIB_MALLOC == LV_STDLIB_MPY
 #include <py/mpconfig.h>
 #include <py/misc.h>
@@ -21,6 +27,10 @@
 /**********************
  *  STATIC PROTOTYPES
  **********************/
+#if MICROPY_MEM_MONITOR
+static uint8_t mem_core_size_class(size_t size);
+static void mem_core_track(void * p, int32_t sign);
+#endif
 
 /**********************
  *  STATIC VARIABLES
@@ -62,25 +72,60 @@ void lv_mem_remove_pool(lv_mem_pool_t pool)
 
 void * lv_malloc_core(size_t size)
 {
+    void * p;
+
 #if MICROPY_MALLOC_USES_ALLOCATED_SIZE
-    return gc_alloc(size, true);
+    p = gc_alloc(size, true);
 #else
-    return m_malloc(size);
+    p = m_malloc(size);
 #endif
+
+#if MICROPY_MEM_MONITOR
+    if(p == NULL) mem_core_stats.failed++;
+    else mem_core_track(p, 1);
+#endif
+
+    return p;
 }
 
 void * lv_realloc_core(void * p, size_t new_size)
 {
+#if MICROPY_MEM_MONITOR
+    /*The size has to be read before the block is moved or freed*/
+    size_t old_size = (p == NULL) ? 0 : gc_nbytes(p);
+#endif
+
+    void * new_p;
 
 #if MICROPY_MALLOC_USES_ALLOCATED_SIZE
-    return gc_realloc(p, new_size, true);
+    new_p = gc_realloc(p, new_size, true);
 #else
-    return m_realloc(p, new_size);
+    new_p = m_realloc(p, new_size);
+#endif
+
+#if MICROPY_MEM_MONITOR
+    if(new_p == NULL && new_size != 0) {
+        /*The old block is untouched*/
+        mem_core_stats.failed++;
+    }
+    else {
+        if(p != NULL) {
+            mem_core_stats.used -= old_size;
+            mem_core_stats.count--;
+            mem_core_stats.classes[mem_core_size_class(old_size)]--;
+        }
+        if(new_p != NULL) mem_core_track(new_p, 1);
+    }
 #endif
+
+    return new_p;
 }
 
 void lv_free_core(void * p)
 {
+#if MICROPY_MEM_MONITOR
+    if(p != NULL) mem_core_track(p, -1);
+#endif
 
 #if MICROPY_MALLOC_USES_ALLOCATED_SIZE
     gc_free(p);
@@ -92,9 +137,27 @@ void lv_free_core(void * p)
 
 void lv_mem_monitor_core(lv_mem_monitor_t * mon_p)
 {
-    /*Not supported*/
-    LV_UNUSED(mon_p);
-    return;
+    /*The heap is the GC heap that is shared with Python objects*/
+    gc_info_t info;
+    gc_info(&info);
+
+    mon_p->total_size = info.total;
+    mon_p->free_size = info.free;
+    mon_p->free_biggest_size = info.max_free * MICROPY_BYTES_PER_GC_BLOCK;
+
+    if(info.total != 0) {
+        mon_p->used_pct = (uint8_t)((info.total - info.free) * 100 / info.total);
+    }
+
+    if(info.free != 0) {
+        mon_p->frag_pct = (uint8_t)(100 - mon_p->free_biggest_size * 100 / info.free);
+    }
+
+#if MICROPY_MEM_MONITOR
+    /*Only LVGL's own allocations*/
+    mon_p->used_cnt = mem_core_stats.count;
+    mon_p->max_used = mem_core_stats.peak;
+#endif
 }
 
 lv_result_t lv_mem_test_core(void)
@@ -107,4 +170,40 @@ lv_result_t lv_mem_test_core(void)
  *   STATIC FUNCTIONS
  **********************/
 
+#if MICROPY_MEM_MONITOR
+static uint8_t mem_core_size_class(size_t size)
+{
+    uint8_t size_class = 0;
+    size_t limit = MEM_CORE_SIZE_CLASS_MIN;
+
+    while(size > limit && size_class < MEM_CORE_SIZE_CLASSES - 1) {
+        limit <<= 1;
+        size_class++;
+    }
+
+    return size_class;
+}
+
+static void mem_core_track(void * p, int32_t sign)
+{
+    /*The size of the GC block, this is what the allocation really costs*/
+    size_t size = gc_nbytes(p);
+    uint8_t size_class = mem_core_size_class(size);
+
+    if(sign > 0) {
+        mem_core_stats.used += size;
+        mem_core_stats.count++;
+        mem_core_stats.total++;
+        mem_core_stats.classes[size_class]++;
+
+        if(mem_core_stats.used > mem_core_stats.peak) mem_core_stats.peak = mem_core_stats.used;
+    }
+    else {
+        mem_core_stats.used -= size;
+        mem_core_stats.count--;
+        mem_core_stats.classes[size_class]--;
+    }
+}
+#endif
+
 #endif /*LV_STDLIB_MICROPYTHON*/
\ No newline at end of file
@@ -0,0 +1,43 @@
+/**
+ * @file mem_core.h
+ */
+
+#ifndef __MEM_CORE_H__
+#define __MEM_CORE_H__
+
+/*********************
+ *      INCLUDES
+ *********************/
+#include <stddef.h>
+#include <stdint.h>
+
+/*********************
+ *      DEFINES
+ *********************/
+
+/* allocations are counted in power of 2 size classes from 16 bytes up to
+ * 4096 bytes, the last class holds everything larger */
+#define MEM_CORE_SIZE_CLASS_MIN  (16)
+#define MEM_CORE_SIZE_CLASSES    (10)
+
+/**********************
+ *      TYPEDEFS
+ **********************/
+
+typedef struct _mem_core_stats_t {
+    size_t used;        /* bytes of the GC heap held by LVGL */
+    size_t peak;        /* highest value of used since the last reset */
+    uint32_t count;     /* live allocations */
+    uint32_t total;     /* allocations made since boot */
+    uint32_t failed;    /* allocations that failed */
+    uint32_t classes[MEM_CORE_SIZE_CLASSES];  /* live allocations per size class */
+} mem_core_stats_t;
+
+/**********************
+ * GLOBAL PROTOTYPES
+ **********************/
+
+/* only updated when LVGL is built with MICROPY_MEM_MONITOR=1 */
+extern mem_core_stats_t mem_core_stats;
+
+#endif /*__MEM_CORE_H__*/
@@ -59,10 +59,15 @@ set(LVGL_MPY_INCLUDES
     ${BINDING_DIR}/lib/micropython
     ${BINDING_DIR}/lib
     ${BINDING_DIR}/lib/lvgl
+    ${BINDING_DIR}/ext_mod/lvgl
 )
 
 add_library(usermod_lvgl INTERFACE)
-target_sources(usermod_lvgl INTERFACE ${CMAKE_BINARY_DIR}/lv_mp.c)
+target_sources(usermod_lvgl INTERFACE
+    ${CMAKE_BINARY_DIR}/lv_mp.c
+    ${BINDING_DIR}/ext_mod/lvgl/lv_archive.c
+    ${BINDING_DIR}/ext_mod/lvgl/lv_mem.c
+)
 target_include_directories(usermod_lvgl INTERFACE ${LVGL_MPY_INCLUDES})
 target_link_libraries(usermod_lvgl INTERFACE lvgl_interface)
 target_link_libraries(usermod INTERFACE usermod_lvgl)
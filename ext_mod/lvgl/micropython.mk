@@ -14,9 +14,10 @@ LVGL_HEADER = $(LVGL_BINDING_DIR)/build/lvgl_header.h
 CURRENT_DIR = $(LVGL_BINDING_DIR)/ext_mod/lvgl
 CFLAGS_USERMOD += -I$(LVGL_DIR)
 CFLAGS_USERMOD += -I$(LIB_DIR)
+CFLAGS_USERMOD += -I$(CURRENT_DIR)
 
 
-ifdef $(LV_CFLAGS)
+ifneq ($(LV_CFLAGS),)
     CFLAGS_USERMOD += $(LV_CFLAGS)
 endif
 
@@ -35,6 +36,8 @@ SRC_USERMOD_LIB_C += $(shell find $(LVGL_DIR)/src -type f -name "*.c")
 SRC_USERMOD_LIB_C += $(LVGL_ADDON_DIR)/src/color_addons.c
 SRC_USERMOD_LIB_C += $(CURRENT_DIR)/mem_core.c
 SRC_USERMOD_C += $(LVGL_MPY)
+SRC_USERMOD_C += $(CURRENT_DIR)/lv_archive.c
+SRC_USERMOD_C += $(CURRENT_DIR)/lv_mem.c
 
 ifneq (,$(findstring stm32, $(LV_PORT)))
     CFLAGS_USERMOD += -DMP_SOFT_MATH=1
@@ -0,0 +1,12 @@
+################################################################################
+# timerfd build rules
+
+MOD_DIR := $(USERMOD_DIR)
+
+# timerfd and epoll only exist on Linux
+ifneq (,$(findstring unix, $(LV_PORT)))
+    ifeq ($(shell uname -s),Linux)
+        SRC_USERMOD_C += $(MOD_DIR)/modtimerfd.c
+        LDFLAGS_USERMOD += -lpthread
+    endif
+endif
@@ -0,0 +1,384 @@
+// Timers for the unix port built on timerfd.
+//
+// The Timer class has the same API as machine.Timer. Every timer that has
+// been initialized is a timerfd registered with a single epoll instance that
+// one dispatch thread waits on. When a timer expires the dispatch thread
+// hands the callback to the MicroPython scheduler so the callback runs in the
+// main thread the same way a function passed to micropython.schedule does.
+//
+// The scheduler only runs between bytecodes, a main thread that is blocked
+// in a syscall (the REPL waiting in read() for example) would never get to
+// it. So once a callback is scheduled the main thread is sent TIMERFD_WAKE,
+// a signal with an empty handler installed without SA_RESTART. The blocked
+// call returns EINTR and the port runs the pending callbacks before it
+// retries the call, the same as it did for the signal based lv_timer.
+
+#include <errno.h>
+#include <pthread.h>
+#include <signal.h>
+#include <stdint.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/epoll.h>
+#include <sys/timerfd.h>
+
+#include "py/obj.h"
+#include "py/runtime.h"
+
+
+#define TIMERFD_MAX  (16)
+
+#define TIMERFD_PERIODIC  (0)
+#define TIMERFD_ONE_SHOT  (1)
+
+// lv_timer uses the signals from SIGRTMIN up, the top one is kept for this
+#define TIMERFD_WAKE  (SIGRTMAX)
+
+
+typedef struct _mp_timerfd_obj_t {
+    mp_obj_base_t base;
+    mp_int_t id;
+    mp_obj_t callback;
+    mp_int_t period;
+    uint8_t mode;
+    int fd;
+    // set by the dispatch thread when the callback has been scheduled and
+    // cleared when it runs, a timer never has more than one run queued
+    volatile bool pending;
+} mp_timerfd_obj_t;
+
+// Timers that are initialized are kept here so they are not collected while
+// the dispatch thread can still schedule their callback.
+MP_REGISTER_ROOT_POINTER(void *timerfd_timers[TIMERFD_MAX]);
+
+static pthread_mutex_t timerfd_mutex = PTHREAD_MUTEX_INITIALIZER;
+static int timerfd_epoll = -1;
+static pthread_t timerfd_main_thread;
+
+const mp_obj_type_t mp_timerfd_type;
+
+
+// must be called with timerfd_mutex held
+static mp_timerfd_obj_t *timerfd_from_fd(int fd)
+{
+    mp_timerfd_obj_t *self;
+
+    for (uint8_t i = 0; i < TIMERFD_MAX; i++) {
+        self = (mp_timerfd_obj_t *)MP_STATE_PORT(timerfd_timers)[i];
+        if (self != NULL && self->fd == fd) return self;
+    }
+    return NULL;
+}
+
+
+static void timerfd_deinit(mp_timerfd_obj_t *self)
+{
+    pthread_mutex_lock(&timerfd_mutex);
+
+    if (self->fd >= 0) {
+        for (uint8_t i = 0; i < TIMERFD_MAX; i++) {
+            if (MP_STATE_PORT(timerfd_timers)[i] == self) {
+                MP_STATE_PORT(timerfd_timers)[i] = NULL;
+                break;
+            }
+        }
+
+        epoll_ctl(timerfd_epoll, EPOLL_CTL_DEL, self->fd, NULL);
+        close(self->fd);
+        self->fd = -1;
+    }
+
+    pthread_mutex_unlock(&timerfd_mutex);
+}
+
+
+// Runs from the scheduler in the main thread.
+static mp_obj_t timerfd_dispatch(mp_obj_t self_in)
+{
+    mp_timerfd_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    self->pending = false;
+
+    if (self->fd < 0 || self->callback == mp_const_none) return mp_const_none;
+
+    nlr_buf_t nlr;
+    if (nlr_push(&nlr) == 0) {
+        mp_call_function_1(self->callback, self_in);
+        nlr_pop();
+    } else {
+        // a callback that raises stops the timer
+        timerfd_deinit(self);
+        nlr_jump(nlr.ret_val);
+    }
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(timerfd_dispatch_obj, timerfd_dispatch);
+
+
+static void timerfd_wake_handler(int signum)
+{
+    (void)signum;
+}
+
+
+static void *timerfd_dispatch_thread(void *arg)
+{
+    (void)arg;
+
+    struct epoll_event events[TIMERFD_MAX];
+    mp_timerfd_obj_t *self;
+    uint64_t expirations;
+    int count;
+    bool scheduled;
+
+    for (;;) {
+        count = epoll_wait(timerfd_epoll, events, TIMERFD_MAX, -1);
+        if (count < 0) {
+            if (errno == EINTR) continue;
+            break;
+        }
+
+        pthread_mutex_lock(&timerfd_mutex);
+
+        scheduled = false;
+
+        for (int i = 0; i < count; i++) {
+            // the timer may have been removed after epoll_wait returned
+            self = timerfd_from_fd(events[i].data.fd);
+            if (self == NULL) continue;
+
+            // clears the expiration count, a timer that has fired more than
+            // once since the last read still only runs its callback once
+            if (read(self->fd, &expirations, sizeof(expirations)) != sizeof(expirations)) continue;
+
+            if (self->pending || self->callback == mp_const_none) continue;
+
+            self->pending = true;
+            if (mp_sched_schedule(MP_OBJ_FROM_PTR(&timerfd_dispatch_obj), MP_OBJ_FROM_PTR(self))) {
+                scheduled = true;
+            } else {
+                // the schedule queue is full, the next expiration retries
+                self->pending = false;
+            }
+        }
+
+        pthread_mutex_unlock(&timerfd_mutex);
+
+        // gets the main thread out of a blocking call so the scheduler runs
+        if (scheduled) pthread_kill(timerfd_main_thread, TIMERFD_WAKE);
+    }
+
+    return NULL;
+}
+
+
+static void timerfd_start_dispatch(void)
+{
+    if (timerfd_epoll >= 0) return;
+
+    int epoll_fd = epoll_create1(EPOLL_CLOEXEC);
+    if (epoll_fd < 0) mp_raise_OSError(errno);
+
+    timerfd_epoll = epoll_fd;
+
+    // timers are always started from the main thread
+    timerfd_main_thread = pthread_self();
+
+    struct sigaction wake;
+    memset(&wake, 0, sizeof(wake));
+    wake.sa_handler = timerfd_wake_handler;
+    sigemptyset(&wake.sa_mask);
+    // no SA_RESTART, the interrupted call has to return EINTR
+    wake.sa_flags = 0;
+    sigaction(TIMERFD_WAKE, &wake, NULL);
+
+    // signals stay with the main thread
+    sigset_t block_all;
+    sigset_t old_mask;
+    sigfillset(&block_all);
+    pthread_sigmask(SIG_BLOCK, &block_all, &old_mask);
+
+    pthread_t thread;
+    int ret = pthread_create(&thread, NULL, timerfd_dispatch_thread, NULL);
+
+    pthread_sigmask(SIG_SETMASK, &old_mask, NULL);
+
+    if (ret != 0) {
+        timerfd_epoll = -1;
+        close(epoll_fd);
+        mp_raise_OSError(ret);
+    }
+
+    pthread_detach(thread);
+}
+
+
+static mp_obj_t timerfd_init_helper(mp_timerfd_obj_t *self, size_t n_args, const mp_obj_t *pos_args, mp_map_t *kw_args)
+{
+    enum { ARG_mode, ARG_period, ARG_callback };
+    static const mp_arg_t allowed_args[] = {
+        { MP_QSTR_mode,     MP_ARG_INT, { .u_int = TIMERFD_PERIODIC } },
+        { MP_QSTR_period,   MP_ARG_INT, { .u_int = -1               } },
+        { MP_QSTR_callback, MP_ARG_OBJ, { .u_obj = mp_const_none    } },
+    };
+    mp_arg_val_t args[MP_ARRAY_SIZE(allowed_args)];
+    mp_arg_parse_all(n_args, pos_args, kw_args, MP_ARRAY_SIZE(allowed_args), allowed_args, args);
+
+    if (args[ARG_callback].u_obj != mp_const_none && !mp_obj_is_callable(args[ARG_callback].u_obj)) {
+        mp_raise_TypeError(MP_ERROR_TEXT("callback must be callable"));
+    }
+
+    timerfd_start_dispatch();
+
+    pthread_mutex_lock(&timerfd_mutex);
+
+    if (self->fd < 0) {
+        uint8_t slot = TIMERFD_MAX;
+        for (uint8_t i = 0; i < TIMERFD_MAX; i++) {
+            if (MP_STATE_PORT(timerfd_timers)[i] == NULL) {
+                slot = i;
+                break;
+            }
+        }
+
+        if (slot == TIMERFD_MAX) {
+            pthread_mutex_unlock(&timerfd_mutex);
+            mp_raise_msg_varg(&mp_type_RuntimeError, MP_ERROR_TEXT("Only %d timers can be active"), TIMERFD_MAX);
+        }
+
+        int fd = timerfd_create(CLOCK_MONOTONIC, TFD_NONBLOCK | TFD_CLOEXEC);
+        if (fd < 0) {
+            int err = errno;
+            pthread_mutex_unlock(&timerfd_mutex);
+            mp_raise_OSError(err);
+        }
+
+        struct epoll_event event = {
+            .events = EPOLLIN,
+            .data.fd = fd
+        };
+
+        if (epoll_ctl(timerfd_epoll, EPOLL_CTL_ADD, fd, &event) != 0) {
+            int err = errno;
+            close(fd);
+            pthread_mutex_unlock(&timerfd_mutex);
+            mp_raise_OSError(err);
+        }
+
+        self->fd = fd;
+        MP_STATE_PORT(timerfd_timers)[slot] = self;
+    }
+
+    self->mode = (uint8_t)args[ARG_mode].u_int;
+    self->period = args[ARG_period].u_int;
+    self->callback = args[ARG_callback].u_obj;
+
+    // a period of 0 or less leaves the timer disarmed
+    struct itimerspec spec;
+    memset(&spec, 0, sizeof(spec));
+
+    if (self->period > 0) {
+        spec.it_value.tv_sec = self->period / 1000;
+        spec.it_value.tv_nsec = (self->period % 1000) * 1000000;
+
+        if (self->mode == TIMERFD_PERIODIC) spec.it_interval = spec.it_value;
+    }
+
+    int ret = timerfd_settime(self->fd, 0, &spec, NULL);
+    int err = errno;
+
+    pthread_mutex_unlock(&timerfd_mutex);
+
+    if (ret != 0) mp_raise_OSError(err);
+
+    return mp_const_none;
+}
+
+
+static mp_obj_t mp_timerfd_init(size_t n_args, const mp_obj_t *pos_args, mp_map_t *kw_args)
+{
+    return timerfd_init_helper(MP_OBJ_TO_PTR(pos_args[0]), n_args - 1, pos_args + 1, kw_args);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_KW(mp_timerfd_init_obj, 1, mp_timerfd_init);
+
+
+static mp_obj_t mp_timerfd_deinit(mp_obj_t self_in)
+{
+    timerfd_deinit(MP_OBJ_TO_PTR(self_in));
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_timerfd_deinit_obj, mp_timerfd_deinit);
+
+
+static mp_obj_t mp_timerfd_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *all_args)
+{
+    mp_arg_check_num(n_args, n_kw, 1, MP_OBJ_FUN_ARGS_MAX, true);
+
+    mp_timerfd_obj_t *self = m_new_obj(mp_timerfd_obj_t);
+    self->base.type = &mp_timerfd_type;
+    self->id = mp_obj_get_int(all_args[0]);
+    self->callback = mp_const_none;
+    self->period = -1;
+    self->mode = TIMERFD_PERIODIC;
+    self->fd = -1;
+    self->pending = false;
+
+    // Timer(id, mode=..., period=..., callback=...) also starts the timer
+    if (n_args > 1 || n_kw > 0) {
+        mp_map_t kw_args;
+        mp_map_init_fixed_table(&kw_args, n_kw, all_args + n_args);
+        timerfd_init_helper(self, n_args - 1, all_args + 1, &kw_args);
+    }
+
+    return MP_OBJ_FROM_PTR(self);
+}
+
+
+static void mp_timerfd_print(const mp_print_t *print, mp_obj_t self_in, mp_print_kind_t kind)
+{
+    (void)kind;
+    mp_timerfd_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    mp_printf(print, "Timer(%d, mode=%s, period=%d)", (int)self->id,
+              self->mode == TIMERFD_ONE_SHOT ? "ONE_SHOT" : "PERIODIC", (int)self->period);
+}
+
+
+static const mp_rom_map_elem_t mp_timerfd_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR_init),     MP_ROM_PTR(&mp_timerfd_init_obj)        },
+    { MP_ROM_QSTR(MP_QSTR_deinit),   MP_ROM_PTR(&mp_timerfd_deinit_obj)      },
+    { MP_ROM_QSTR(MP_QSTR_PERIODIC), MP_ROM_INT(TIMERFD_PERIODIC)            },
+    { MP_ROM_QSTR(MP_QSTR_ONE_SHOT), MP_ROM_INT(TIMERFD_ONE_SHOT)            },
+};
+
+static MP_DEFINE_CONST_DICT(mp_timerfd_locals_dict, mp_timerfd_locals_dict_table);
+
+
+MP_DEFINE_CONST_OBJ_TYPE(
+    mp_timerfd_type,
+    MP_QSTR_Timer,
+    MP_TYPE_FLAG_NONE,
+    make_new, mp_timerfd_make_new,
+    print, mp_timerfd_print,
+    locals_dict, &mp_timerfd_locals_dict
+);
+
+
+static const mp_rom_map_elem_t mp_module_timerfd_globals_table[] = {
+    { MP_ROM_QSTR(MP_QSTR___name__), MP_OBJ_NEW_QSTR(MP_QSTR_timerfd) },
+    { MP_ROM_QSTR(MP_QSTR_Timer),    MP_ROM_PTR(&mp_timerfd_type)     },
+};
+
+static MP_DEFINE_CONST_DICT(mp_module_timerfd_globals, mp_module_timerfd_globals_table);
+
+
+const mp_obj_module_t mp_module_timerfd = {
+    .base    = {&mp_type_module},
+    .globals = (mp_obj_dict_t *)&mp_module_timerfd_globals,
+};
+
+MP_REGISTER_MODULE(MP_QSTR_timerfd, mp_module_timerfd);
@@ -0,0 +1,181 @@
+# Content addressed cache for the binding generator.
+#
+# Running the generator means preprocessing all of the LVGL headers, parsing
+# the result with pycparser and writing out the whole binding. Most of the
+# time nothing that goes into that process has changed between builds so the
+# results get stored using the hash of everything that affects them.
+#
+# There are 2 levels to the cache.
+#
+# The parsed AST is keyed on the preprocessed source and the pycparser
+# version. If the generator gets edited the headers do not need to be
+# parsed again.
+#
+# The generated C source and the JSON metadata are keyed on the preprocessed
+# source, the contents of the generator scripts (the generator, stub_gen.py
+# and the fake libc headers) and the generator options.
+# If nothing changed the files get copied from the cache and the generator
+# exits without doing any work.
+
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+
+
+# bump this if the layout of the cache or the way keys are made changes
+CACHE_VERSION = 1
+
+# number of entries of each kind that are kept
+MAX_ENTRIES = 4
+
+_OUTPUT_NAME = 'output.c'
+_METADATA_NAME = 'metadata.json'
+
+
+def _hash(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+
+        h.update(part)
+        h.update(b'\x00')
+
+    return h.hexdigest()
+
+
+def _atomic_copy(src, dst):
+    tmp = f'{dst}.{os.getpid()}.tmp'
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class GenCache:
+
+    def __init__(self, cache_dir, preprocessed, generator_files, options):
+        import pycparser
+
+        self.cache_dir = cache_dir
+
+        pp_hash = _hash(preprocessed)
+
+        generator_hashes = []
+        for file in generator_files:
+            with open(file, 'rb') as f:
+                generator_hashes.append(_hash(f.read()))
+
+        self.ast_key = _hash(
+            str(CACHE_VERSION),
+            pp_hash,
+            pycparser.__version__
+        )
+        self.output_key = _hash(
+            str(CACHE_VERSION),
+            pp_hash,
+            *generator_hashes,
+            repr(sorted(options.items()))
+        )
+
+        self._ast_file = os.path.join(cache_dir, 'ast', self.ast_key + '.pickle')
+        self._output_dir = os.path.join(cache_dir, 'output', self.output_key)
+
+    def load_ast(self):
+        if not os.path.exists(self._ast_file):
+            return None
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 20000))
+
+        try:
+            with open(self._ast_file, 'rb') as f:
+                ast = pickle.load(f)
+        except Exception:  # NOQA
+            # a broken cache entry is the same as a miss
+            return None
+        finally:
+            sys.setrecursionlimit(limit)
+
+        os.utime(self._ast_file)
+        return ast
+
+    def save_ast(self, ast):
+        ast_dir = os.path.dirname(self._ast_file)
+        os.makedirs(ast_dir, exist_ok=True)
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 20000))
+
+        tmp = f'{self._ast_file}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                pickle.dump(ast, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._ast_file)
+        except Exception:  # NOQA
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        finally:
+            sys.setrecursionlimit(limit)
+
+        self._prune(ast_dir)
+
+    def restore_output(self, output, metadata):
+        cached_output = os.path.join(self._output_dir, _OUTPUT_NAME)
+        cached_metadata = os.path.join(self._output_dir, _METADATA_NAME)
+
+        if not os.path.exists(cached_output):
+            return False
+
+        if metadata and not os.path.exists(cached_metadata):
+            return False
+
+        _atomic_copy(cached_output, output)
+        if metadata:
+            _atomic_copy(cached_metadata, metadata)
+
+        os.utime(self._output_dir)
+        return True
+
+    def save_output(self, output, metadata):
+        output_root = os.path.dirname(self._output_dir)
+        os.makedirs(output_root, exist_ok=True)
+
+        # the entry is written to a temporary folder and renamed so a build
+        # that gets interrupted never leaves a partial entry behind.
+        tmp_dir = f'{self._output_dir}.{os.getpid()}.tmp'
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+
+        os.makedirs(tmp_dir)
+        shutil.copyfile(output, os.path.join(tmp_dir, _OUTPUT_NAME))
+        if metadata:
+            shutil.copyfile(metadata, os.path.join(tmp_dir, _METADATA_NAME))
+
+        if os.path.exists(self._output_dir):
+            shutil.rmtree(self._output_dir)
+
+        os.replace(tmp_dir, self._output_dir)
+        self._prune(output_root)
+
+    @staticmethod
+    def _prune(path):
+        entries = []
+        for name in os.listdir(path):
+            if name.endswith('.tmp'):
+                continue
+
+            entry = os.path.join(path, name)
+            entries.append((os.path.getmtime(entry), entry))
+
+        entries.sort(reverse=True)
+
+        for _, entry in entries[MAX_ENTRIES:]:
+            if os.path.isdir(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                try:
+                    os.remove(entry)
+                except OSError:
+                    pass
@@ -114,6 +114,8 @@ argParser.add_argument('--metadata', dest='metadata', help='Optional file to emi
 argParser.add_argument('--board', dest='board', help='Board or OS', metavar='<Board or OS>', action='store')
 argParser.add_argument('--output', dest='output', help='Output file path', metavar='<Output path>', action='store')
 argParser.add_argument('--debug', dest='debug', help='enable debugging output', action='store_true')
+argParser.add_argument('--cache-dir', dest='cache_dir', help='Folder used to cache the parsed headers and generated output (defaults to a folder next to the output file)', metavar='<Cache path>', action='store')
+argParser.add_argument('--no-cache', dest='no_cache', help='always parse the headers and generate the output', action='store_true')
 
 argParser.add_argument('input', nargs='+')
 
@@ -579,13 +581,72 @@ func_prototypes = {}
 parser = c_parser.CParser()
 gen = c_generator.CGenerator()
 
-ast = pycparser.parse_file(
-    args.input[0], 
-    use_cpp=True, 
+# pycparser.parse_file is split into its 2 steps so the preprocessed source
+# can be used to look up previous results in the cache. If the headers,
+# lv_conf.h, the generator and its options are all the same as a previous run
+# the output files are copied from the cache and there is nothing else to do.
+pp_text = pycparser.preprocess_file(
+    args.input[0],
     cpp_path=cpp_path,
     cpp_args=cpp_args
 )
 
+gen_cache = None
+ast = None
+
+if not args.no_cache and not DEBUG:
+    import gen_cache as _gen_cache
+
+    cache_dir = args.cache_dir
+    if cache_dir is None:
+        cache_dir = os.path.join(
+            os.path.dirname(os.path.abspath(args.output)),
+            'lv_mpy_cache'
+        )
+
+    # stub_gen writes the stubs from the metadata and the fake libc headers
+    # decide what the LVGL headers get preprocessed into, a change to any of
+    # them has to miss the cache the same as a change to this script
+    generator_files = [
+        os.path.abspath(__file__),
+        os.path.join(script_path, 'stub_gen.py')
+    ]
+    for root, dirs, files in os.walk(fake_libc_path):
+        dirs.sort()
+        for file in sorted(files):
+            generator_files.append(os.path.join(root, file))
+
+    gen_cache = _gen_cache.GenCache(
+        cache_dir,
+        pp_text,
+        generator_files,
+        dict(
+            module_name=module_name,
+            module_prefix=module_prefix,
+            board=args.board,
+            metadata=bool(args.metadata)
+        )
+    )
+
+    if gen_cache.restore_output(args.output, args.metadata):
+        eprint('lv_mpy: using cached binding ' + gen_cache.output_key[:12])
+        if args.metadata:
+            import stub_gen
+
+            stub_gen.run(args.metadata)
+
+        sys.exit(0)
+
+    ast = gen_cache.load_ast()
+
+if ast is None:
+    ast = parser.parse(pp_text, args.input[0])
+
+    if gen_cache is not None:
+        gen_cache.save_ast(ast)
+
+del pp_text
+
 
 forward_struct_decls = {}
 
@@ -1675,6 +1736,78 @@ static mp_obj_t lv_to_mp_struct(const mp_obj_type_t *type, void *lv_struct)
     return MP_OBJ_FROM_PTR(self);
 }
 
+// Borrowed struct views for callback arguments.
+// A callback receives struct pointers that are only valid while the callback
+// runs, so instead of allocating a new wrapper on every call the arguments are
+// wrapped by views taken from a static pool. Views are taken and released in
+// stack order, which keeps nested callbacks (an event sent from an event
+// handler) safe. A released view is marked stale so that it can't be used to
+// access memory after the callback returned, but only until its slot is
+// taken again by a later callback. From then on a reference kept from the
+// earlier callback is the view of the new argument, which may be a struct of
+// another type. Views must not be kept past the callback, copy() copies the
+// struct into a heap buffer that can be kept.
+
+#ifndef MP_LV_BORROWED_VIEWS
+#define MP_LV_BORROWED_VIEWS (1)
+#endif
+
+#ifndef MP_LV_BORROWED_VIEWS_MAX
+#define MP_LV_BORROWED_VIEWS_MAX (16)
+#endif
+
+static void mp_lv_stale_struct_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest)
+{
+    (void)self_in;
+    (void)attr;
+    (void)dest;
+    nlr_raise(
+        mp_obj_new_exception_msg(
+            &mp_type_RuntimeError, MP_ERROR_TEXT("struct view is only valid inside the callback, use copy() to keep it")));
+}
+
+static MP_DEFINE_CONST_OBJ_TYPE(
+    mp_lv_stale_struct_type,
+    MP_QSTR_Struct,
+    MP_TYPE_FLAG_NONE,
+    attr, mp_lv_stale_struct_attr
+);
+
+#if MP_LV_BORROWED_VIEWS
+
+static mp_lv_struct_t mp_lv_borrowed_views[MP_LV_BORROWED_VIEWS_MAX];
+static size_t mp_lv_borrowed_views_used = 0;
+
+GENMPY_UNUSED static mp_obj_t mp_lv_borrow_struct(const mp_obj_type_t *type, void *lv_struct)
+{
+    if (lv_struct == NULL) return mp_const_none;
+    // deeper nesting than the pool allows falls back to heap wrappers
+    if (mp_lv_borrowed_views_used >= MP_LV_BORROWED_VIEWS_MAX) return lv_to_mp_struct(type, lv_struct);
+    mp_lv_struct_t *self = &mp_lv_borrowed_views[mp_lv_borrowed_views_used++];
+    *self = (mp_lv_struct_t){
+        .base = {type},
+        .data = lv_struct
+    };
+    return MP_OBJ_FROM_PTR(self);
+}
+
+GENMPY_UNUSED static void mp_lv_release_views(size_t mark)
+{
+    while (mp_lv_borrowed_views_used > mark) {
+        mp_lv_struct_t *self = &mp_lv_borrowed_views[--mp_lv_borrowed_views_used];
+        self->base.type = &mp_lv_stale_struct_type;
+        self->data = NULL;
+    }
+}
+
+#else
+
+#define mp_lv_borrowed_views_used (0)
+#define mp_lv_borrow_struct(type, lv_struct) lv_to_mp_struct(type, lv_struct)
+#define mp_lv_release_views(mark) ((void)(mark))
+
+#endif
+
 static void call_parent_methods(mp_obj_t obj, qstr attr, mp_obj_t *dest)
 {
     const mp_obj_type_t *type = mp_obj_get_type(obj);
@@ -1718,6 +1851,108 @@ static mp_obj_t dict_to_struct(mp_obj_t dict, const mp_obj_type_t *type)
     return mp_struct;
 }
 
+// Callback table
+// A callback table is used as user_data in place of a callbacks dict. It has a slot for every callback in its group
+// (callbacks that receive the same kind of user_data), so a generated callback can find the Python callable by index.
+
+typedef struct mp_lv_callback_table_t {
+    mp_obj_base_t base;
+    mp_obj_t extra; // dict for callbacks that belong to a different group, created when needed
+    uint16_t group;
+    uint16_t slot_count;
+    mp_obj_t slots[];
+} mp_lv_callback_table_t;
+
+GENMPY_UNUSED static MP_DEFINE_CONST_OBJ_TYPE(
+    mp_lv_callback_table_type,
+    MP_QSTR_CallbackTable,
+    MP_TYPE_FLAG_NONE
+);
+
+// Buffer is a sized view of the memory a pointer points to.
+// Unlike Blob, its buffer protocol exposes the memory itself, so it can be
+// passed to anything that takes a buffer without creating a memoryview.
+// __cast_instance__ retargets it without allocating, so a single instance can
+// be reused on every call, for example in a flush callback.
+
+typedef struct mp_lv_buffer_t
+{
+    mp_lv_struct_t base;
+    size_t size;
+} mp_lv_buffer_t;
+
+static mp_int_t mp_lv_buffer_get_buffer(mp_obj_t self_in, mp_buffer_info_t *bufinfo, mp_uint_t flags) {
+    (void)flags;
+    mp_lv_buffer_t *self = MP_OBJ_TO_PTR(self_in);
+
+    bufinfo->buf = self->base.data;
+    bufinfo->len = self->base.data? self->size: 0;
+    bufinfo->typecode = BYTEARRAY_TYPECODE;
+    return 0;
+}
+
+static void mp_lv_buffer_print(const mp_print_t *print,
+    mp_obj_t self_in,
+    mp_print_kind_t kind)
+{
+    mp_lv_buffer_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_printf(print, "C_Buffer(%p, %u)", self->base.data, (unsigned int)self->size);
+}
+
+static mp_obj_t mp_lv_buffer_unary_op(mp_unary_op_t op, mp_obj_t self_in)
+{
+    mp_lv_buffer_t *self = MP_OBJ_TO_PTR(self_in);
+    switch (op) {
+        case MP_UNARY_OP_BOOL: return mp_obj_new_bool(self->base.data != NULL);
+        case MP_UNARY_OP_LEN: return MP_OBJ_NEW_SMALL_INT(self->base.data? self->size: 0);
+        default: return MP_OBJ_NULL; // op not supported
+    }
+}
+
+// Point the buffer at new memory. The size is kept when it's not given.
+
+static mp_obj_t mp_lv_buffer_cast_instance(size_t argc, const mp_obj_t *argv)
+{
+    mp_lv_buffer_t *self = MP_OBJ_TO_PTR(argv[0]);
+    self->base.data = mp_to_ptr(argv[1]);
+    if (argc > 2) self->size = (size_t)mp_obj_get_int(argv[2]);
+    return argv[0];
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mp_lv_buffer_cast_instance_obj, 2, 3, mp_lv_buffer_cast_instance);
+
+static const mp_rom_map_elem_t mp_lv_buffer_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR___cast_instance__), MP_ROM_PTR(&mp_lv_buffer_cast_instance_obj) },
+};
+
+static MP_DEFINE_CONST_DICT(mp_lv_buffer_locals_dict, mp_lv_buffer_locals_dict_table);
+
+static mp_obj_t mp_lv_buffer_make_new(
+    const mp_obj_type_t *type,
+    size_t n_args,
+    size_t n_kw,
+    const mp_obj_t *args)
+{
+    mp_arg_check_num(n_args, n_kw, 0, 2, false);
+    mp_lv_buffer_t *self = m_new_obj(mp_lv_buffer_t);
+    *self = (mp_lv_buffer_t){
+        { {type}, n_args > 0? mp_to_ptr(args[0]): NULL },
+        n_args > 1? (size_t)mp_obj_get_int(args[1]): 0
+    };
+    return MP_OBJ_FROM_PTR(self);
+}
+
+static MP_DEFINE_CONST_OBJ_TYPE(
+    mp_lv_buffer_type,
+    MP_QSTR_C_Buffer,
+    MP_TYPE_FLAG_NONE,
+    make_new, mp_lv_buffer_make_new,
+    print, mp_lv_buffer_print,
+    unary_op, mp_lv_buffer_unary_op,
+    locals_dict, &mp_lv_buffer_locals_dict,
+    buffer, mp_lv_buffer_get_buffer
+);
+
 // Convert mp object to ptr
 
 static void* mp_to_ptr(mp_obj_t self_in)
@@ -1738,7 +1973,7 @@ static void* mp_to_ptr(mp_obj_t self_in)
         // No buffer protocol - this is not a Struct or a Blob, it's some other mp object.
         // We only allow setting dict directly, since it's useful to setting user_data for passing data to C.
         // On other cases throw an exception, to avoid a crash later
-        if (MP_OBJ_IS_TYPE(self_in, &mp_type_dict))
+        if (MP_OBJ_IS_TYPE(self_in, &mp_type_dict) || MP_OBJ_IS_TYPE(self_in, &mp_lv_callback_table_type))
             return MP_OBJ_TO_PTR(self_in);
         else nlr_raise(
                 mp_obj_new_exception_msg_varg(
@@ -1747,7 +1982,8 @@ static void* mp_to_ptr(mp_obj_t self_in)
 
     if (MP_OBJ_IS_STR_OR_BYTES(self_in) ||
         MP_OBJ_IS_TYPE(self_in, &mp_type_bytearray) ||
-        MP_OBJ_IS_TYPE(self_in, &mp_type_memoryview))
+        MP_OBJ_IS_TYPE(self_in, &mp_type_memoryview) ||
+        MP_OBJ_IS_TYPE(self_in, &mp_lv_buffer_type))
             return buffer_info.buf;
     else
     {
@@ -1881,7 +2117,7 @@ static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mp_lv_dereference_obj, 1, 2, mp_lv_de
 // Callback is either a callable object or a pointer. If it's a callable object, set user_data to the callback.
 // Multiple callbacks are kept per object/struct using a dict that associate callback name with callback object
 // In case of an lv_obj_t, user_data is mp_lv_obj_t which contains a member "callbacks" for that dict.
-// In case of a struct, user_data is a pointer to that dict directly
+// In case of a struct, user_data is a pointer to a callback table, or to a dict if one was given from Python
 
 static mp_obj_t get_callback_dict_from_user_data(void *user_data)
 {
@@ -1898,6 +2134,68 @@ static mp_obj_t get_callback_dict_from_user_data(void *user_data)
     return NULL;
 }
 
+typedef struct mp_lv_callback_slot_t {
+    qstr name;
+    uint16_t group;
+    uint16_t slot;
+} mp_lv_callback_slot_t;
+
+#define MP_LV_NO_CALLBACK_GROUP 0xFFFF
+
+// Generated after all of the callback functions are known
+static const mp_lv_callback_slot_t *mp_lv_find_callback_slot(qstr callback_name);
+static uint16_t mp_lv_callback_group_size(uint16_t group);
+
+static mp_obj_t mp_lv_new_callback_container(qstr callback_name)
+{
+    const mp_lv_callback_slot_t *slot = mp_lv_find_callback_slot(callback_name);
+    if (!slot) return mp_obj_new_dict(0);
+
+    uint16_t slot_count = mp_lv_callback_group_size(slot->group);
+    mp_lv_callback_table_t *table = m_malloc(sizeof(mp_lv_callback_table_t) + slot_count * sizeof(mp_obj_t));
+    table->base.type = &mp_lv_callback_table_type;
+    table->extra = MP_OBJ_NULL;
+    table->group = slot->group;
+    table->slot_count = slot_count;
+    for (uint16_t i = 0; i < slot_count; i++) table->slots[i] = MP_OBJ_NULL;
+    return MP_OBJ_FROM_PTR(table);
+}
+
+static void mp_lv_store_callback(void *user_data, qstr callback_name, mp_obj_t mp_callback)
+{
+    mp_obj_t obj = MP_OBJ_FROM_PTR(user_data);
+    if (MP_OBJ_IS_TYPE(obj, &mp_lv_callback_table_type)) {
+        mp_lv_callback_table_t *table = MP_OBJ_TO_PTR(obj);
+        const mp_lv_callback_slot_t *slot = mp_lv_find_callback_slot(callback_name);
+        if (slot && slot->group == table->group) {
+            table->slots[slot->slot] = mp_callback;
+            return;
+        }
+        if (table->extra == MP_OBJ_NULL) table->extra = mp_obj_new_dict(0);
+        mp_obj_dict_store(table->extra, MP_OBJ_NEW_QSTR(callback_name), mp_callback);
+        return;
+    }
+    mp_obj_dict_store(get_callback_dict_from_user_data(user_data), MP_OBJ_NEW_QSTR(callback_name), mp_callback);
+}
+
+// Used by the generated callback functions. group and slot are known when the binding is generated so when user_data
+// is a table of the same group this is a single array load. Dicts and tables of other groups are looked up by name.
+
+static inline mp_obj_t mp_lv_get_callback(void *user_data, uint16_t group, uint16_t slot, qstr callback_name)
+{
+    mp_obj_t obj = MP_OBJ_FROM_PTR(user_data);
+    if (MP_OBJ_IS_TYPE(obj, &mp_lv_callback_table_type)) {
+        mp_lv_callback_table_t *table = MP_OBJ_TO_PTR(obj);
+        mp_obj_t callback = MP_OBJ_NULL;
+        if (table->group == group) callback = table->slots[slot];
+        else if (table->extra != MP_OBJ_NULL) return mp_obj_dict_get(table->extra, MP_OBJ_NEW_QSTR(callback_name));
+
+        if (callback == MP_OBJ_NULL) nlr_raise(mp_obj_new_exception_arg1(&mp_type_KeyError, MP_OBJ_NEW_QSTR(callback_name)));
+        return callback;
+    }
+    return mp_obj_dict_get(get_callback_dict_from_user_data(user_data), MP_OBJ_NEW_QSTR(callback_name));
+}
+
 typedef void *(*mp_lv_get_user_data)(void *);
 typedef void (*mp_lv_set_user_data)(void *, void *);
 
@@ -1908,21 +2206,18 @@ static void *mp_lv_callback(mp_obj_t mp_callback, void *lv_callback, qstr callba
         void *user_data = NULL;
         if (user_data_ptr) {
             // user_data is either a dict of callbacks in case of struct, or a pointer to mp_lv_obj_t in case of lv_obj_t
-            if (! (*user_data_ptr) ) *user_data_ptr = MP_OBJ_TO_PTR(mp_obj_new_dict(0)); // if it's NULL - it's a dict for a struct
+            if (! (*user_data_ptr) ) *user_data_ptr = MP_OBJ_TO_PTR(mp_lv_new_callback_container(callback_name)); // if it's NULL - it's a table for a struct
             user_data = *user_data_ptr;
         }
         else if (get_user_data && set_user_data) {
             user_data = get_user_data(containing_struct);
             if (!user_data) {
-                user_data = MP_OBJ_TO_PTR(mp_obj_new_dict(0));
+                user_data = MP_OBJ_TO_PTR(mp_lv_new_callback_container(callback_name));
                 set_user_data(containing_struct, user_data);
             }
         }
 
-        if (user_data) {
-            mp_obj_t callbacks = get_callback_dict_from_user_data(user_data);
-            mp_obj_dict_store(callbacks, MP_OBJ_NEW_QSTR(callback_name), mp_callback);
-        }
+        if (user_data) mp_lv_store_callback(user_data, callback_name, mp_callback);
         return lv_callback;
     } else {
         return mp_to_ptr(mp_callback);
@@ -1937,10 +2232,11 @@ static mp_obj_t mp_lv_funcptr(const mp_lv_obj_fun_builtin_var_t *mp_fun, void *l
 {
     if (lv_fun == NULL)
         return mp_const_none;
-    if (lv_fun == lv_callback) {
-        mp_obj_t callbacks = get_callback_dict_from_user_data(user_data);
-        if (callbacks)
-            return mp_obj_dict_get(callbacks, MP_OBJ_NEW_QSTR(func_name));
+    if (lv_fun == lv_callback && user_data) {
+        const mp_lv_callback_slot_t *slot = mp_lv_find_callback_slot(func_name);
+        if (slot)
+            return mp_lv_get_callback(user_data, slot->group, slot->slot, func_name);
+        return mp_lv_get_callback(user_data, MP_LV_NO_CALLBACK_GROUP, 0, func_name);
     }
     mp_lv_obj_fun_builtin_var_t *funcptr = m_new_obj(mp_lv_obj_fun_builtin_var_t);
     *funcptr = *mp_fun;
@@ -2022,10 +2318,38 @@ static mp_obj_t lv_array_subscr(mp_obj_t self_in, mp_obj_t index, mp_obj_t value
     return self_in;
 }
 
+// Copy the struct into a new heap buffer. Callback arguments usually point
+// to the stack of the caller so only a copy of the data can outlive the
+// callback.
+
+static mp_obj_t mp_lv_struct_copy(mp_obj_t self_in)
+{
+    mp_lv_struct_t *self = mp_to_lv_struct(self_in);
+    const mp_obj_type_t *type = mp_obj_get_type(self_in);
+    size_t size = get_lv_struct_size(type);
+
+    if (self->data == NULL) return mp_const_none;
+    if (size == 0) {
+        nlr_raise(
+            mp_obj_new_exception_msg_varg(
+                &mp_type_TypeError, MP_ERROR_TEXT("size of '%s' is unknown, it can't be copied"), mp_obj_get_type_str(self_in)));
+    }
+
+    mp_lv_struct_t *copy = m_new_obj(mp_lv_struct_t);
+    *copy = (mp_lv_struct_t){
+        .base = {type},
+        .data = copy_buffer(self->data, size)
+    };
+    return MP_OBJ_FROM_PTR(copy);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lv_struct_copy_obj, mp_lv_struct_copy);
+
 static const mp_rom_map_elem_t mp_base_struct_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR___cast__), MP_ROM_PTR(&mp_lv_cast_class_method) },
     { MP_ROM_QSTR(MP_QSTR___cast_instance__), MP_ROM_PTR(&mp_lv_cast_instance_obj) },
     { MP_ROM_QSTR(MP_QSTR___dereference__), MP_ROM_PTR(&mp_lv_dereference_obj) },
+    { MP_ROM_QSTR(MP_QSTR_copy), MP_ROM_PTR(&mp_lv_struct_copy_obj) },
 };
 
 static MP_DEFINE_CONST_DICT(mp_base_struct_locals_dict, mp_base_struct_locals_dict_table);
@@ -2411,6 +2735,11 @@ static inline mp_obj_t mp_read_ptr_{sanitized_struct_name}(const {struct_name} *
     return lv_to_mp_struct(get_mp_{sanitized_struct_name}_type(), (void *)field);
 }}
 
+GENMPY_UNUSED static inline mp_obj_t mp_borrow_ptr_{sanitized_struct_name}(const {struct_name} *field)
+{{
+    return mp_lv_borrow_struct(get_mp_{sanitized_struct_name}_type(), (void *)field);
+}}
+
 #define mp_read_{sanitized_struct_name}(field) mp_read_ptr_{sanitized_struct_name}(copy_buffer(&field, sizeof({struct_tag}{struct_name})))
 #define mp_read_byref_{sanitized_struct_name}(field) mp_read_ptr_{sanitized_struct_name}(&field)
 
@@ -2756,12 +3085,35 @@ def build_callback_func_arg(arg, index, func, func_name = None):
         arg_metadata['name'] = None
 
     callback_metadata[func_name]['args'].append(arg_metadata)
+    convertor = lv_to_mp[arg_type]
+    if convertor.startswith('mp_read_ptr_'):
+        # struct pointers passed to a callback are wrapped by borrowed views
+        convertor = 'mp_borrow_ptr_' + convertor[len('mp_read_ptr_'):]
     return 'mp_args[{i}] = (mp_obj_t){convertor}({cast_in}arg{i});'.format(
-                convertor = lv_to_mp[arg_type],
+                convertor = convertor,
                 i = index, cast_in = cast_in)
 
 
-def gen_callback_func(func, func_name = None, user_data_argument = False):
+# Every generated callback gets a slot in the callback table of its group.
+# Callbacks in the same group are stored in the same user_data, so the group
+# is the struct that holds user_data, or the function when user_data is
+# passed as an argument.
+
+callback_slot_groups = collections.OrderedDict()  # group name -> (group index, [callback names])
+callback_slots = collections.OrderedDict()  # callback name -> (group index, slot)
+
+
+def add_callback_slot(func_name, group_name):
+    if group_name not in callback_slot_groups:
+        callback_slot_groups[group_name] = (len(callback_slot_groups), [])
+
+    group, names = callback_slot_groups[group_name]
+    callback_slots[func_name] = (group, len(names))
+    names.append(func_name)
+    return callback_slots[func_name]
+
+
+def gen_callback_func(func, func_name = None, user_data_argument = False, slot_group = None):
     global mp_to_lv
     if func_name in generated_callbacks:
         return
@@ -2800,6 +3152,7 @@ def gen_callback_func(func, func_name = None, user_data_argument = False):
 
     if is_global_callback(func):
         full_user_data = 'MP_STATE_PORT(mp_lv_user_data)'
+        slot_group = '__global__'
     else:
         user_data, user_data_getter, _ = get_user_data(func, func_name)
 
@@ -2828,7 +3181,40 @@ def gen_callback_func(func, func_name = None, user_data_argument = False):
 
     callback_metadata[func_name]['c_rtype'] = return_type
     callback_metadata[func_name]['py_rtype'] = get_py_type(return_type)
-    print("""
+    build_args = [build_callback_func_arg(arg, i, func, func_name=func_name) for i,arg in enumerate(args)]
+    group, slot = add_callback_slot(sanitize(func_name), slot_group or func_name)
+    if any('mp_borrow_ptr_' in build_arg for build_arg in build_args):
+        # Borrowed views must be released when the callback returns, and also
+        # when it raises, otherwise they would outlive the arguments they wrap.
+        callback_template = """
+/*
+ * Callback function {func_name}
+ * {func_prototype}
+ */
+
+GENMPY_UNUSED static {return_type} {func_name}_callback({func_args})
+{{
+    mp_obj_t mp_args[{num_args}];
+    size_t views_mark = mp_lv_borrowed_views_used;
+    _nesting++;
+    // building the arguments and looking up the callback can raise too
+    nlr_buf_t nlr;
+    if (nlr_push(&nlr) != 0) {{
+        mp_lv_release_views(views_mark);
+        _nesting--;
+        nlr_jump(nlr.ret_val);
+    }}
+    {build_args}
+    mp_obj_t callback = mp_lv_get_callback({user_data}, {group}, {slot}, MP_QSTR_{func_name});
+    {return_value_assignment}mp_call_function_n_kw(callback, {num_args}, 0, mp_args);
+    nlr_pop();
+    mp_lv_release_views(views_mark);
+    _nesting--;
+    return{return_value};
+}}
+"""
+    else:
+        callback_template = """
 /*
  * Callback function {func_name}
  * {func_prototype}
@@ -2838,20 +3224,23 @@ GENMPY_UNUSED static {return_type} {func_name}_callback({func_args})
 {{
     mp_obj_t mp_args[{num_args}];
     {build_args}
-    mp_obj_t callbacks = get_callback_dict_from_user_data({user_data});
+    mp_obj_t callback = mp_lv_get_callback({user_data}, {group}, {slot}, MP_QSTR_{func_name});
     _nesting++;
-    {return_value_assignment}mp_call_function_n_kw(mp_obj_dict_get(callbacks, MP_OBJ_NEW_QSTR(MP_QSTR_{func_name})) , {num_args}, 0, mp_args);
+    {return_value_assignment}mp_call_function_n_kw(callback, {num_args}, 0, mp_args);
     _nesting--;
     return{return_value};
 }}
-""".format(
+"""
+    print(callback_template.format(
         func_prototype = gen.visit(func),
         func_name = sanitize(func_name),
         return_type = return_type,
         func_args = ', '.join([(gen.visit(arg)) for arg in enumerated_args]),
         num_args=len(args),
-        build_args="\n    ".join([build_callback_func_arg(arg, i, func, func_name=func_name) for i,arg in enumerate(args)]),
+        build_args="\n    ".join(build_args),
         user_data=full_user_data,
+        group=group,
+        slot=slot,
         return_value_assignment = '' if return_type == 'void' else 'mp_obj_t callback_result = ',
         return_value='' if return_type == 'void' else ' %s(callback_result)' % mp_to_lv[return_type]))
     generated_callbacks[func_name] = True
@@ -2909,7 +3298,7 @@ def build_mp_func_arg(arg, index, func, obj_name):
                     if not full_user_data:
                         raise MissingConversionException("Callback function '%s' must receive a struct pointer with user_data member as its first argument!" % gen.visit(arg))
             # eprint("--> callback_metadata= %s_%s" % (struct_name, callback_name))
-            gen_callback_func(arg_type, '%s' % callback_name, user_data_argument)
+            gen_callback_func(arg_type, '%s' % callback_name, user_data_argument, slot_group = func.name if user_data_argument else struct_name)
 
             if (
                 isinstance(arg_type, c_ast.FuncDecl) and
@@ -3451,7 +3840,7 @@ if len(functions_not_generated) > 0:
 for (func_name, func, struct_name) in callbacks_used_on_structs:
     try:
         # print('/* --> gen_callback_func %s */' % func_name)
-        gen_callback_func(func, func_name = '%s_%s' % (struct_name, func_name))
+        gen_callback_func(func, func_name = '%s_%s' % (struct_name, func_name), slot_group = struct_name)
         # struct_metadata[struct_name]['methods'][func_name] = deepcopy(callback_metadata[func.name])
     except MissingConversionException as exp:
         gen_func_error(func, exp)
@@ -3459,6 +3848,56 @@ for (func_name, func, struct_name) in callbacks_used_on_structs:
         # lv_to_mp[func_name] = lv_to_mp['void *']
         # mp_to_lv[func_name] = mp_to_lv['void *']
 
+#
+# Emit callback slots
+#
+
+if callback_slots:
+    print("""
+/*
+ * Callback slots
+ */
+
+static const mp_lv_callback_slot_t mp_lv_callback_slots[] = {{
+    {slots}
+}};
+
+static const uint16_t mp_lv_callback_group_sizes[] = {{
+    {group_sizes}
+}};
+
+static const mp_lv_callback_slot_t *mp_lv_find_callback_slot(qstr callback_name)
+{{
+    for (size_t i = 0; i < MP_ARRAY_SIZE(mp_lv_callback_slots); i++) {{
+        if (mp_lv_callback_slots[i].name == callback_name) return &mp_lv_callback_slots[i];
+    }}
+    return NULL;
+}}
+
+static uint16_t mp_lv_callback_group_size(uint16_t group)
+{{
+    return mp_lv_callback_group_sizes[group];
+}}
+""".format(
+        slots=',\n    '.join('{MP_QSTR_%s, %d, %d}' % (name, group, slot) for name, (group, slot) in callback_slots.items()),
+        group_sizes=', '.join('%d' % len(names) for _, names in callback_slot_groups.values())))
+else:
+    print("""
+/*
+ * Callback slots
+ */
+
+static const mp_lv_callback_slot_t *mp_lv_find_callback_slot(qstr callback_name)
+{
+    return NULL;
+}
+
+static uint16_t mp_lv_callback_group_size(uint16_t group)
+{
+    return 0;
+}
+""")
+
 #
 # Emit Mpy Module definition
 #
@@ -3479,6 +3918,7 @@ static const mp_rom_map_elem_t {module_name}_globals_table[] = {{
     {struct_aliases}
     {blobs}
     {int_constants}
+    {{ MP_ROM_QSTR(MP_QSTR_C_Buffer), MP_ROM_PTR(&mp_lv_buffer_type) }},
 #ifdef LV_OBJ_T
     {{ MP_ROM_QSTR(MP_QSTR_LvReferenceError), MP_ROM_PTR(&mp_type_LvReferenceError) }},
 #endif // LV_OBJ_T
@@ -3604,3 +4044,5 @@ if args.metadata:
 
 stdout.close()
 
+if gen_cache is not None:
+    gen_cache.save_output(args.output, args.metadata)
@@ -1,4 +1,4 @@
-from typing import Any, Callable, Optional, Union, ClassVar, Final
+from typing import Any, Callable, Optional, Union, ClassVar, Final, Tuple
 import array
 import spi as _spi
 
@@ -39,6 +39,9 @@ class SPI3Wire:
     def tx_param(self, cmd: int, params: Optional[_BufferType] = None, /) -> None:
         ...
 
+    def tx_param_sequence(self, sequence: _BufferType, /) -> None:
+        ...
+
 
 class I2CBus:
 
@@ -71,9 +74,37 @@ class I2CBus:
     def register_callback(self, callback: Callable[[Any, Any], None], /) -> None:
         ...
 
+    def register_native_flush(
+        self,
+        disp: Any,
+        /,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        set_window: bool = True,
+        set_memory_location: Optional[Callable[[int, int, int, int], int]] = None,
+        write_continue: int = 0
+    ) -> None:
+        ...
+
+    def get_window_stats(self) -> Optional[Tuple[int, int, int]]:
+        """
+        (commands saved, bytes saved, continued transfers) of the native
+        flush, `None` when no display uses a native flush on this bus.
+        """
+        ...
+
+    def reset_window_stats(self) -> None:
+        """
+        Sets the counters of the native flush back to 0.
+        """
+        ...
+
     def tx_param(self, cmd: int, params: Optional[_BufferType] = None, /) -> None:
         ...
 
+    def tx_param_sequence(self, sequence: _BufferType, /) -> None:
+        ...
+
     def tx_color(self, cmd: int, data: _BufferType, start_x: int, start_y: int, end_x: int, end_y: int, /) -> None:
         ...
 
@@ -116,9 +147,37 @@ class SPIBus:
     def register_callback(self, callback: Callable[[Any, Any], None], /) -> None:
         ...
 
+    def register_native_flush(
+        self,
+        disp: Any,
+        /,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        set_window: bool = True,
+        set_memory_location: Optional[Callable[[int, int, int, int], int]] = None,
+        write_continue: int = 0
+    ) -> None:
+        ...
+
+    def get_window_stats(self) -> Optional[Tuple[int, int, int]]:
+        """
+        (commands saved, bytes saved, continued transfers) of the native
+        flush, `None` when no display uses a native flush on this bus.
+        """
+        ...
+
+    def reset_window_stats(self) -> None:
+        """
+        Sets the counters of the native flush back to 0.
+        """
+        ...
+
     def tx_param(self, cmd: int, params: Optional[_BufferType] = None, /) -> None:
         ...
 
+    def tx_param_sequence(self, sequence: _BufferType, /) -> None:
+        ...
+
     def tx_color(self, cmd: int, data: _BufferType, start_x: int, start_y: int, end_x: int, end_y: int, /) -> None:
         ...
 
@@ -206,6 +265,31 @@ class SDLBus:
     ) -> None:
         ...
 
+    def register_native_flush(
+        self,
+        disp: Any,
+        /,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        set_window: bool = True,
+        set_memory_location: Optional[Callable[[int, int, int, int], int]] = None,
+        write_continue: int = 0
+    ) -> None:
+        ...
+
+    def get_window_stats(self) -> Optional[Tuple[int, int, int]]:
+        """
+        (commands saved, bytes saved, continued transfers) of the native
+        flush, `None` when no display uses a native flush on this bus.
+        """
+        ...
+
+    def reset_window_stats(self) -> None:
+        """
+        Sets the counters of the native flush back to 0.
+        """
+        ...
+
     def tx_param(
         self,
         cmd: int,
@@ -214,6 +298,9 @@ class SDLBus:
     ) -> None:
         ...
 
+    def tx_param_sequence(self, sequence: _BufferType, /) -> None:
+        ...
+
     def tx_color(self, cmd: int, data: _BufferType, start_x: int, start_y: int, end_x: int, end_y: int, /) -> None:
         ...
 
@@ -226,6 +313,85 @@ class SDLBus:
     def allocate_framebuffer(self, size: int, caps: int, /) -> Union[None, memoryview]:
         ...
 
+class HeadlessBus:
+    DUMP_RAW: ClassVar[int] = ...
+    DUMP_PPM: ClassVar[int] = ...
+    DUMP_MMAP: ClassVar[int] = ...
+
+    def __init__(
+        self,
+        *,
+        dump_path: Optional[str] = None,
+        dump_format: int = DUMP_RAW,
+        dump_every: int = 1
+    ):
+        ...
+
+    def init(
+        self, width: int, height: int, bpp: int, buffer_size: int,
+        rgb565_byte_swap: bool, cmd_bits: int, param_bits: int, /
+    ) -> None:
+        ...
+
+    def deinit(self) -> None:
+        ...
+
+    def register_callback(self, callback: Callable[[Any, Any], None], /) -> None:
+        ...
+
+    def register_native_flush(
+        self,
+        disp: Any,
+        /,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        set_window: bool = True,
+        set_memory_location: Optional[Callable[[int, int, int, int], int]] = None,
+        write_continue: int = 0
+    ) -> None:
+        ...
+
+    def get_window_stats(self) -> Optional[Tuple[int, int, int]]:
+        """
+        (commands saved, bytes saved, continued transfers) of the native
+        flush, `None` when no display uses a native flush on this bus.
+        """
+        ...
+
+    def reset_window_stats(self) -> None:
+        """
+        Sets the counters of the native flush back to 0.
+        """
+        ...
+
+    def tx_param(self, cmd: int, params: Optional[_BufferType] = None, /) -> None:
+        ...
+
+    def tx_param_sequence(self, sequence: _BufferType, /) -> None:
+        ...
+
+    def tx_color(self, cmd: int, data: _BufferType, start_x: int, start_y: int, end_x: int, end_y: int, /) -> None:
+        ...
+
+    def rx_param(self, cmd: int, params: _BufferType, /) -> None:
+        ...
+
+    def get_lane_count(self) -> int:
+        ...
+
+    def allocate_framebuffer(self, size: int, caps: int, /) -> Union[None, memoryview]:
+        ...
+
+    def get_frame(self) -> Optional[memoryview]:
+        ...
+
+    def get_frame_count(self) -> int:
+        ...
+
+    def dump(self) -> None:
+        ...
+
+
 class RGBBus:
 
     def __init__(
@@ -281,9 +447,37 @@ class RGBBus:
     def register_callback(self, callback: Callable[[Any, Any], None], /) -> None:
         ...
 
+    def register_native_flush(
+        self,
+        disp: Any,
+        /,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        set_window: bool = True,
+        set_memory_location: Optional[Callable[[int, int, int, int], int]] = None,
+        write_continue: int = 0
+    ) -> None:
+        ...
+
+    def get_window_stats(self) -> Optional[Tuple[int, int, int]]:
+        """
+        (commands saved, bytes saved, continued transfers) of the native
+        flush, `None` when no display uses a native flush on this bus.
+        """
+        ...
+
+    def reset_window_stats(self) -> None:
+        """
+        Sets the counters of the native flush back to 0.
+        """
+        ...
+
     def tx_param(self, cmd: int, params: Optional[_BufferType] = None, /) -> None:
         ...
 
+    def tx_param_sequence(self, sequence: _BufferType, /) -> None:
+        ...
+
     def tx_color(self, cmd: int, data: _BufferType, start_x: int, start_y: int, end_x: int, end_y: int, /) -> None:
         ...
 
@@ -346,12 +540,40 @@ class I80Bus:
     def register_callback(self, callback: Callable[[Any, Any], None], /) -> None:
         ...
 
+    def register_native_flush(
+        self,
+        disp: Any,
+        /,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        set_window: bool = True,
+        set_memory_location: Optional[Callable[[int, int, int, int], int]] = None,
+        write_continue: int = 0
+    ) -> None:
+        ...
+
+    def get_window_stats(self) -> Optional[Tuple[int, int, int]]:
+        """
+        (commands saved, bytes saved, continued transfers) of the native
+        flush, `None` when no display uses a native flush on this bus.
+        """
+        ...
+
+    def reset_window_stats(self) -> None:
+        """
+        Sets the counters of the native flush back to 0.
+        """
+        ...
+
     def tx_color(self, cmd: int, data: _BufferType, start_x: int, start_y: int, end_x: int, end_y: int, /) -> None:
         ...
 
     def tx_param(self, cmd: int, data: _BufferType, /) -> None:
         ...
 
+    def tx_param_sequence(self, sequence: _BufferType, /) -> None:
+        ...
+
     def rx_param(self, cmd: int, params: _BufferType, /) -> None:
         ...
 
@@ -1,4 +1,7 @@
-from typing import Union
+from typing import Union, Tuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from array import array
 
 def remap(
     value: Union[float, int],
@@ -25,3 +28,89 @@ def remap(
 
 def int_float_converter(value: Union[float, int], /) -> Union[float, int]:
     ...
+
+
+def transform(matrix: Union[bytes, bytearray, memoryview, "array"], x: int, y: int, /) -> Tuple[int, int]:
+    """
+    Applies a precomputed 2D affine transform to a point
+
+    The matrix holds 6 signed 32 bit integers `(a, b, c, d, e, f)` in Q16.16
+    fixed point, usually an `array('i')`. The result is rounded to the
+    nearest integer.
+
+        x' = a * x + b * y + c
+        y' = d * x + e * y + f
+
+    :param matrix: buffer holding the 6 Q16.16 matrix values
+    :param x: x coordinate
+    :param y: y coordinate
+    :return: tuple of the transformed (x, y)
+
+    :raises: ValueError if the matrix buffer is too small
+    """
+    ...
+
+
+class TouchFilter(object):
+    """
+    Filters raw touch samples into a single point without allocating
+
+    Samples are kept in a preallocated ring of `size` entries. `get` takes the
+    median of the samples, drops the samples that are further than `margin`
+    from the median, averages the remaining ones and then runs the result
+    through a single pole IIR filter when `alpha` is less than 1.0.
+    """
+    margin: int = ...
+    alpha: float = ...
+
+    def __init__(self, size: int, /, *, margin: int = 50, alpha: Optional[float] = None):
+        """
+        :param size: number of samples the ring holds (1-32)
+        :param margin: maximum distance a sample is allowed to be from the
+                       median before it gets rejected
+        :param alpha: weight of a new point in the IIR filter (0.0-1.0],
+                      `None` or 1.0 disables the smoothing
+        """
+        ...
+
+    @property
+    def size(self) -> int:
+        ...
+
+    @property
+    def count(self) -> int:
+        """
+        Number of samples currently stored
+        """
+        ...
+
+    def add(self, x: int, y: int, /) -> int:
+        """
+        Adds a sample, replacing the oldest one once the ring is full
+
+        :return: number of samples stored
+        """
+        ...
+
+    def get(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns the filtered point
+
+        :return: `None` if there are no samples or if half or more of the
+                 samples were rejected, otherwise a tuple of (x, y)
+        """
+        ...
+
+    def clear(self) -> None:
+        """
+        Removes the samples, the smoothing history is kept
+        """
+        ...
+
+    def reset(self) -> None:
+        """
+        Removes the samples and the smoothing history
+
+        This should be called once the panel is released.
+        """
+        ...
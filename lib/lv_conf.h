@@ -34,9 +34,18 @@
 #ifndef MICROPY_FLOAT
     #define MICROPY_FLOAT  0
 #endif
+#ifndef MICROPY_RLE
+    #define MICROPY_RLE  0
+#endif
 #ifndef MICROPY_MEM_SIZE
     #define MICROPY_MEM_SIZE  256
 #endif
+#ifndef MICROPY_MEM_MONITOR
+    #define MICROPY_MEM_MONITOR  0
+#endif
+#ifndef MICROPY_TLSF
+    #define MICROPY_TLSF  0
+#endif
 
 #ifndef MICROPY_FAST_MEM
     #if (defined(ESP_IDF_VERSION) && !defined(PYCPARSER))
@@ -96,7 +105,12 @@ extern void *mp_lv_roots;
  * - LV_STDLIB_RTTHREAD:    RT-Thread implementation
  * - LV_STDLIB_CUSTOM:      Implement the functions externally
  */
-#define LV_USE_STDLIB_MALLOC    LV_STDLIB_MPY
+#if MICROPY_TLSF
+    /*LVGL gets a pool of MICROPY_MEM_SIZE kB managed by the builtin TLSF allocator*/
+    #define LV_USE_STDLIB_MALLOC    LV_STDLIB_BUILTIN
+#else
+    #define LV_USE_STDLIB_MALLOC    LV_STDLIB_MPY
+#endif
 #define LV_USE_STDLIB_STRING    LV_STDLIB_BUILTIN
 #define LV_USE_STDLIB_SPRINTF   LV_STDLIB_BUILTIN
 
@@ -120,6 +134,11 @@ extern void *mp_lv_roots;
     #if LV_MEM_ADR == 0
         #undef LV_MEM_POOL_INCLUDE
         #undef LV_MEM_POOL_ALLOC
+        /*The pool is a single block of the GC heap held by a root pointer so the
+         *Python objects the binding keeps in LVGL's user data stay alive*/
+        #include <stddef.h>
+        extern void * mp_lv_pool_alloc(size_t size);
+        #define LV_MEM_POOL_ALLOC mp_lv_pool_alloc
     #endif
 #endif  /*LV_USE_STDLIB_MALLOC == LV_STDLIB_BUILTIN*/
 
@@ -812,7 +831,7 @@ extern void *mp_lv_roots;
 #define LV_BIN_DECODER_RAM_LOAD 0
 
 /*RLE decompress library*/
-#define LV_USE_RLE 0
+#define LV_USE_RLE MICROPY_RLE
 
 /*QR code library*/
 #define LV_USE_QRCODE 1
@@ -0,0 +1,64 @@
+from typing import Union, List
+
+
+class Archive(object):
+    """
+    Read-only packed asset archive made by make.py using `--archive`.
+
+    Entries are never copied, they are views of the archive. A frozen
+    archive is read straight from flash and on unix an archive file is
+    mmap'd.
+
+    The views of an archive made from a buffer keep the buffer alive. The
+    views of an archive file point into the mapping and are only valid
+    until the archive is closed or collected, keep the archive around for
+    as long as they are used.
+    """
+
+    def __init__(self, source: Union[bytes, bytearray, memoryview, str], /):
+        """
+        :param source: the archive data, normally `lv_archive_data.DATA`.
+                       A path to an archive file is only supported on unix,
+                       on an MCU read the file into a bytearray instead.
+        """
+        ...
+
+    def get(self, name: str, /) -> Union[memoryview, None]:
+        """
+        Returns a memoryview of an entry or None if there is no entry using
+        that name. The view can be passed to LVGL as the data of an
+        `lv.image_dsc_t` or to `lv.binfont_create_from_buffer`.
+        """
+        ...
+
+    def names(self) -> List[str]:
+        """
+        Names of the entries, sorted.
+        """
+        ...
+
+    def register(self, letter: str, /) -> None:
+        """
+        Registers the archive as an LVGL filesystem drive so entries can be
+        loaded using paths like "A:icons/home.bin". Reads are done in C
+        without going through the MicroPython VFS.
+
+        A registered archive stays alive for the life of the program, LVGL
+        has no way to remove a drive. Up to 4 archives can be registered.
+
+        :param letter: drive letter, it must not be in use already
+        """
+        ...
+
+    def close(self) -> None:
+        """
+        Unmaps an archive file. Views of it must not be used afterwards.
+        Raises RuntimeError for a registered archive, LVGL keeps using it.
+        """
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def __contains__(self, name: str) -> bool:
+        ...
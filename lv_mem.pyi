@@ -0,0 +1,52 @@
+from typing import Tuple, Dict, Union, Optional
+
+
+# upper bound in bytes of each size class in info()["classes"], the last
+# class in info()["classes"] counts everything larger than the last bound
+SIZE_CLASSES: Tuple[int, ...] = ...
+
+# True when the firmware was built using --mem-monitor, without it only
+# the heap_* values of info() are filled in (and the pool values when
+# --lvgl-heap was used)
+ENABLED: bool = ...
+
+
+def info() -> Dict[str, Union[int, Tuple[int, ...]]]:
+    """
+    Memory held by LVGL compared with the GC heap it shares with Python.
+
+    pool: size of LVGL's pool when the firmware was built using
+          --lvgl-heap, 0 when LVGL allocates from the GC heap
+    used: bytes held by LVGL
+    peak: highest value of used since boot or the last `reset_peak`
+    count: live LVGL allocations
+    total: allocations LVGL made since boot
+    failed: allocations that could not be satisfied
+    classes: live LVGL allocations per size class, see `SIZE_CLASSES`
+    heap_total, heap_used, heap_free: state of the GC heap
+    heap_largest_free: largest block that can be allocated
+
+    With --lvgl-heap the used, peak and count values come from LVGL's allocator and
+    total, failed and classes are not counted.
+
+    A `count` or `used` that keeps growing while the same screens are
+    shown is a widget leak.
+    """
+    ...
+
+
+def reset_peak() -> None:
+    """
+    Sets the peak to the memory LVGL holds right now. LVGL's own allocator
+    keeps its peak itself, so this does nothing when --lvgl-heap is used.
+    """
+    ...
+
+
+def gc_allocated() -> Optional[int]:
+    """
+    Bytes allocated from the GC heap since the last collection. A value
+    lower than the one read before means a collection ran in between.
+    None when the port was built without MICROPY_GC_ALLOC_THRESHOLD.
+    """
+    ...
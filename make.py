@@ -135,9 +135,146 @@ argParser.add_argument(
     default=False
 )
 
+argParser.add_argument(
+    '-j', '--jobs',
+    dest='jobs',
+    help=(
+        'number of parallel jobs used by make/cmake, '
+        'defaults to the number of CPUs'
+    ),
+    action='store',
+    type=int,
+    default=os.cpu_count()
+)
+argParser.add_argument(
+    '--ccache',
+    dest='ccache',
+    help='compile using ccache (it needs to be installed)',
+    action='store_true',
+    default=False
+)
+
+argParser.add_argument(
+    '--image',
+    dest='images',
+    help=(
+        'image file or directory of images (PNG, JPG, BMP) to convert into '
+        'LVGL native image data at build time'
+    ),
+    action='append',
+    default=[]
+)
+argParser.add_argument(
+    '--image-cf',
+    dest='image_cf',
+    help=(
+        'LVGL color format the images are converted to, should match the '
+        'color format of the display'
+    ),
+    choices=['RGB565', 'RGB565A8', 'RGB888', 'ARGB8888', 'XRGB8888', 'L8', 'A8'],
+    action='store',
+    default='RGB565'
+)
+argParser.add_argument(
+    '--image-align',
+    dest='image_align',
+    help='row stride alignment of the images in bytes',
+    action='store',
+    type=int,
+    default=1
+)
+argParser.add_argument(
+    '--image-rle',
+    dest='image_rle',
+    help='RLE compress the images, this also turns on LV_USE_RLE',
+    action='store_true',
+    default=False
+)
+argParser.add_argument(
+    '--image-output',
+    dest='image_output',
+    help=(
+        '"frozen" freezes the images into the firmware as the lv_assets '
+        'module, "bin" writes LVGL .bin files to build/assets'
+    ),
+    choices=['frozen', 'bin'],
+    action='store',
+    default='frozen'
+)
+
+argParser.add_argument(
+    '--archive',
+    dest='archive',
+    help=(
+        'file or directory of files (fonts, LVGL .bin images) to pack into a '
+        'read-only asset archive for the lv_archive module'
+    ),
+    action='append',
+    default=[]
+)
+argParser.add_argument(
+    '--archive-output',
+    dest='archive_output',
+    help=(
+        '"frozen" freezes the archive into the firmware as the '
+        'lv_archive_data module, "file" writes it to build/assets.lvpk'
+    ),
+    choices=['frozen', 'file'],
+    action='store',
+    default='frozen'
+)
+
+argParser.add_argument(
+    '--mem-monitor',
+    dest='mem_monitor',
+    help=(
+        'keep count of the memory LVGL allocates, it is reported by the '
+        'lv_mem module and lv.mem_monitor()'
+    ),
+    action='store_true',
+    default=False
+)
+
+argParser.add_argument(
+    '--lvgl-heap',
+    dest='lvgl_heap',
+    help=(
+        'size in kB of a pool LVGL allocates from using its TLSF allocator '
+        'instead of the GC heap, 0 keeps LVGL in the GC heap'
+    ),
+    action='store',
+    type=int,
+    default=0
+)
+
 args3, extra_args = argParser.parse_known_args(extra_args)
 
 lvgl_api = args3.lvgl_api
+jobs = args3.jobs
+ccache = args3.ccache
+images = args3.images
+image_cf = args3.image_cf
+image_align = args3.image_align
+image_rle = args3.image_rle
+image_output = args3.image_output
+archive = args3.archive
+archive_output = args3.archive_output
+mem_monitor = args3.mem_monitor
+lvgl_heap = args3.lvgl_heap
+
+if images and image_rle:
+    lv_cflags = (lv_cflags + ' -DMICROPY_RLE=1').strip()
+
+if mem_monitor:
+    lv_cflags = (lv_cflags + ' -DMICROPY_MEM_MONITOR=1').strip()
+
+if lvgl_heap:
+    if lvgl_heap < 2:
+        raise RuntimeError('The LVGL heap has to be at least 2kB')
+
+    lv_cflags = (
+        lv_cflags + f' -DMICROPY_TLSF=1 -DMICROPY_MEM_SIZE={lvgl_heap}'
+    ).strip()
 
 extra_args.append(f'FROZEN_MANIFEST="{SCRIPT_DIR}/build/manifest.py"')
 
@@ -182,6 +319,11 @@ if __name__ == '__main__':
 
     from builder import set_mp_version
 
+    builder.set_jobs(jobs)
+
+    if ccache:
+        builder.setup_ccache(SCRIPT_DIR)
+
     if sys.platform.startswith('win'):
         from builder import setup_windows_build
 
@@ -231,5 +373,18 @@ if __name__ == '__main__':
     )
     create_lvgl_header()
 
+    if images:
+        from builder import images as image_compiler
+
+        image_compiler.build(
+            images, SCRIPT_DIR, image_cf, image_align,
+            image_rle, image_output
+        )
+
+    if archive:
+        from builder import archive as archive_packer
+
+        archive_packer.build(archive, SCRIPT_DIR, archive_output)
+
     print('Compiling....')
     mod.compile(*extra_args)
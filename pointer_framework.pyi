@@ -1,12 +1,14 @@
-from typing import Optional, Tuple, TYPE_CHECKING
+from typing import Optional, Tuple, Union, TYPE_CHECKING
 import _indev_base
 import lcd_utils as _lcd_utils
 import lvgl as _lv  # NOQA
+from array import array
 
 lv = _lv
 
 
 if TYPE_CHECKING:
+    import machine as _machine
     import touch_cal_data as _touch_cal_data
     import display_driver_framework as _display_driver_framework
 
@@ -22,6 +24,10 @@ class PointerDriver(_indev_base.IndevBase):
     _orig_width: int = ...
     _orig_height: int = ...
     _config: _touch_cal_data.TouchCalData = ...
+    _irq_pin: Optional[_machine.Pin] = ...
+    _data_ready: bool = ...
+    _polling: bool = ...
+    _matrix: Optional[array] = ...
 
     def __init__(self, touch_cal: Optional[_touch_cal_data.TouchCalData] = None, startup_rotation=lv.DISPLAY_ROTATION._0, debug: bool=False):
         ...
@@ -29,10 +35,50 @@ class PointerDriver(_indev_base.IndevBase):
     def calibrate(self) -> None:
         ...
 
+    def _set_interrupt(
+        self,
+        pin: Union[int, _machine.Pin],
+        trigger: Optional[int] = None
+    ) -> None:
+        """
+        Switches the driver to interrupt driven reads
+
+        The indev read timer is paused while the panel is not being touched
+        and a read is scheduled when the touch controller signals the
+        interrupt pin. The read timer runs again while a press is active so
+        the press keeps being reported until it is released.
+
+        :param pin: the pin connected to the touch controller's interrupt
+                    output
+        :param trigger: the pin irq trigger, defaults to `Pin.IRQ_FALLING`
+        """
+        ...
+
     @property
     def is_calibrated(self) -> bool:
         ...
 
+    def _invalidate_transform(self) -> None:
+        """
+        Drops the cached coordinate transform
+
+        This needs to be called after the calibration data has been changed
+        so the transform gets rebuilt on the next read.
+        """
+        ...
+
+    def _update_transform(self) -> None:
+        """
+        Builds the Q16.16 affine transform used by `lcd_utils.transform`
+
+        The calibration and the startup rotation are folded into a single
+        matrix so a read only has to apply it to the raw coordinates.
+        """
+        ...
+
+    def _calc_coords(self, x: int, y: int) -> Tuple[int, int]:
+        ...
+
     def _get_coords(self) -> Optional[Tuple[int, int, int]]:
         """
         Reads the coordinates from the touch panel
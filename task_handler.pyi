@@ -29,7 +29,7 @@
 # MIT license; Copyright (c) 2021 Amir Gonnen
 #
 ##############################################################################
-from typing import Callable, ClassVar, Optional
+from typing import Callable, ClassVar, Optional, Tuple
 from machine import Timer
 
 _default_timer_id: int = ...
@@ -51,6 +51,10 @@ class TaskHandler(object):
     exception_hook: Callable[[Exception], None] = ...
     max_scheduled: int = ...
     _scheduled: int = ...
+    _profile: Optional[object] = ...
+    _adaptive: Optional[Tuple[int, int]] = ...
+    _last_tick: int = ...
+    _gc_policy: Optional[object] = ...
 
     def __init__(
         self,
@@ -75,7 +79,121 @@ class TaskHandler(object):
     def is_running(cls) -> bool:
         ...
 
-    def _task_handler(self, _) -> None:
+    def enable_adaptive(
+        self,
+        min_period: Optional[int] = None,
+        max_period: int = 500
+    ) -> None:
+        """
+        Arm the timer for the time until the next LVGL timer is due instead
+        of firing every `duration` ms. The period is clamped to
+        `min_period` (defaults to `duration`) and `max_period`.
+
+        Call `wake` after changing the UI from outside of LVGL so the change
+        does not wait for `max_period`.
+        """
+        ...
+
+    def disable_adaptive(self) -> None:
+        ...
+
+    @classmethod
+    def wake(cls) -> None:
+        """
+        Run the task handler now instead of when the timer is due.
+        Does nothing unless adaptive scheduling is enabled.
+        """
+        ...
+
+    def _arm(self, period: int) -> None:
+        ...
+
+    def _tick_inc(self, ms: int) -> None:
+        ...
+
+    def enable_profiling(self, size: int = 64) -> None:
+        """
+        Start collecting frame statistics for the last `size` frames.
+        """
+        ...
+
+    def disable_profiling(self) -> None:
+        ...
+
+    def reset_profile(self) -> None:
+        ...
+
+    def get_profile(self) -> Optional[dict]:
+        """
+        Frame statistics, `None` when profiling is not enabled.
+
+        `callbacks`, `task_handler`, `tick_drift` and `latency` are dicts
+        holding min/avg/p95/max/count.
+
+        * callbacks: time spent in STARTED and FINISHED callbacks (us)
+        * task_handler: time spent in `lv.task_handler` (us)
+        * tick_drift: LVGL tick minus elapsed wall clock time (ms)
+        * latency: time from the timer firing to the task handler running (us)
+
+        `frames` is the number of frames profiled, `overruns` the number of
+        timer fires skipped because `max_scheduled` runs were pending and
+        `dropped` the number of fires `micropython.schedule` refused.
+        """
+        ...
+
+    def enable_gc_policy(
+        self,
+        headroom: Optional[int] = None,
+        min_idle: int = 5,
+        policy: Optional[Callable[[int, Optional[int], int], bool]] = None,
+        size: int = 64
+    ) -> None:
+        """
+        Run `gc.collect` in the idle time after a frame instead of letting
+        a failed allocation collect in the middle of a render or an event
+        callback.
+
+        A collection is run when less than `headroom` bytes of the heap are
+        free (defaults to a quarter of the heap) or when the allocations
+        since the last collection reach 3/4 of `gc.threshold()`. It only
+        runs when the time until the next frame is at least `min_idle` ms
+        and at least as long as the last collection took.
+
+        `policy` replaces that decision. It is called after every frame as
+        `policy(free, allocated, idle)` and returns `True` to collect.
+
+        * free: free heap in bytes
+        * allocated: bytes allocated since the last collection, `None` when
+          the port does not keep count
+        * idle: ms until the next frame
+
+        Collection times are kept for the last `size` collections.
+        """
+        ...
+
+    def disable_gc_policy(self) -> None:
+        ...
+
+    def get_gc_stats(self) -> Optional[dict]:
+        """
+        Collection statistics, `None` when the GC policy is not enabled.
+
+        * collect_time: min/avg/p95/max/count of the idle collections (us)
+        * collections: number of idle collections
+        * in_frame: frames a collection happened in, these are the hitches
+          the policy is meant to remove
+        * deferred: collections put off because the idle time was too short
+        * free: free heap in bytes
+        """
+        ...
+
+    def reset_gc_stats(self) -> None:
+        ...
+
+    def _collect_idle(self, gc_policy: object, idle: int) -> None:
+        ...
+
+    def _task_handler(self, fire_time: int) -> None:
         ...
 
     def _timer_cb(self, _) -> None:
@@ -0,0 +1,45 @@
+from typing import Callable, ClassVar, Optional
+
+
+class Timer(object):
+    """
+    machine.Timer compatible timer for the unix port on Linux.
+
+    Timers are timerfds waited on by a single dispatch thread. Callbacks
+    are run through the MicroPython scheduler in the main thread. When a
+    callback is scheduled the main thread is sent SIGRTMAX so a blocking
+    call it is waiting in returns EINTR and the callback runs before the
+    call is retried. Up to 16 timers can be active at the same time.
+    """
+    PERIODIC: ClassVar[int] = ...
+    ONE_SHOT: ClassVar[int] = ...
+
+    def __init__(
+        self,
+        id: int,
+        /,
+        mode: int = PERIODIC,
+        period: int = -1,
+        callback: Optional[Callable[["Timer"], None]] = None
+    ):
+        ...
+
+    def init(
+        self,
+        *,
+        mode: int = PERIODIC,
+        period: int = -1,
+        callback: Optional[Callable[["Timer"], None]] = None
+    ) -> None:
+        """
+        Arms the timer, calling it again re-arms the same timer.
+
+        :param mode: `PERIODIC` or `ONE_SHOT`
+        :param period: period in milliseconds, 0 or less leaves it disarmed
+        :param callback: called with the timer as the only argument. A
+                         callback that raises stops the timer.
+        """
+        ...
+
+    def deinit(self) -> None:
+        ...